@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Response size benchmark for DevTools AI Mock MCP Server
+
+Runs complete pipelines (initiate_session through get_session_status) for a
+set of representative questions, once with full responses and once with
+compact ones, and reports the bytes and tokens each tool returns. Tokens are
+counted with tiktoken's cl100k_base encoding when it is installed, and
+estimated as bytes / 4 otherwise.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from devtools_ai_mock_mcp.server import handle_call_tool  # noqa: E402
+
+QUESTIONS = (
+    "I need to create a new MATLAB sandbox from snapshot stable_build",
+    "build the project in release mode",
+    "run the unit tests with coverage",
+    "deploy a dry run to staging",
+    "debug the memory usage of my simulink model",
+    "push my branch to git",
+)
+
+MEASURED_TOOLS = ("get_workflow", "get_toolchain", "get_tool", "generate_command", "get_session_status")
+
+
+def token_counter():
+    """Return (count_tokens, label) using tiktoken if available."""
+    try:
+        import tiktoken
+    except ImportError:
+        return (lambda text: (len(text.encode("utf-8")) + 3) // 4), "estimated (bytes/4)"
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return (lambda text: len(encoding.encode(text))), "cl100k_base"
+
+
+async def call(name: str, arguments: dict) -> str:
+    return (await handle_call_tool(name, arguments))[0].text
+
+
+async def run_pipeline(question: str, verbosity: str) -> dict:
+    """Run one full pipeline; return {tool: response_text} for measured tools."""
+    text = await call("initiate_session", {"question": question, "verbosity": verbosity})
+    session_id = text.split("Session ID: ")[1].split("\n")[0]
+    responses = {}
+    responses["get_workflow"] = await call("get_workflow", {"session_id": session_id})
+    workflow = _field(responses["get_workflow"], "Workflow Selected: ", "workflow=")
+    responses["get_toolchain"] = await call("get_toolchain", {"session_id": session_id, "selected_workflow": workflow})
+    toolchain = _field(responses["get_toolchain"], "Toolchain Selected: ", "toolchain=")
+    responses["get_tool"] = await call("get_tool", {"session_id": session_id, "selected_toolchain": toolchain})
+    tool = _field(responses["get_tool"], "Tool Selected: ", "tool=")
+    responses["generate_command"] = await call("generate_command", {"session_id": session_id, "selected_tool": tool})
+    responses["get_session_status"] = await call("get_session_status", {"session_id": session_id})
+    await call("confirm_command", {"session_id": session_id, "user_response": "yes"})
+    return responses
+
+
+def _field(text: str, full_prefix: str, compact_prefix: str) -> str:
+    prefix = compact_prefix if text.startswith(compact_prefix) else full_prefix
+    return text.split(prefix)[1].split("\n")[0]
+
+
+async def measure(count_tokens):
+    totals = {mode: {tool: [0, 0] for tool in MEASURED_TOOLS} for mode in ("full", "compact")}
+    for question in QUESTIONS:
+        for mode in totals:
+            for tool, text in (await run_pipeline(question, mode)).items():
+                totals[mode][tool][0] += len(text.encode("utf-8"))
+                totals[mode][tool][1] += count_tokens(text)
+    return totals
+
+
+def main(argv=None) -> int:
+    argparse.ArgumentParser(description="Compare full and compact response sizes").parse_args(argv)
+    count_tokens, label = token_counter()
+    totals = asyncio.run(measure(count_tokens))
+    runs = len(QUESTIONS)
+
+    print(f"Per full pipeline, mean over {runs} questions; tokens {label}")
+    print(f"{'tool':<20}{'full B':>9}{'compact B':>11}{'full tok':>10}{'compact tok':>13}{'saved':>8}")
+    sums = {"full": [0, 0], "compact": [0, 0]}
+    for tool in MEASURED_TOOLS:
+        full_bytes, full_tokens = totals["full"][tool]
+        compact_bytes, compact_tokens = totals["compact"][tool]
+        for mode, (size, tokens) in (("full", (full_bytes, full_tokens)), ("compact", (compact_bytes, compact_tokens))):
+            sums[mode][0] += size
+            sums[mode][1] += tokens
+        saved = 1 - compact_tokens / full_tokens if full_tokens else 0.0
+        print(f"{tool:<20}{full_bytes / runs:>9.0f}{compact_bytes / runs:>11.0f}"
+              f"{full_tokens / runs:>10.0f}{compact_tokens / runs:>13.0f}{saved:>8.0%}")
+    (full_bytes, full_tokens), (compact_bytes, compact_tokens) = sums["full"], sums["compact"]
+    print(f"{'pipeline':<20}{full_bytes / runs:>9.0f}{compact_bytes / runs:>11.0f}"
+          f"{full_tokens / runs:>10.0f}{compact_tokens / runs:>13.0f}{1 - compact_tokens / full_tokens:>8.0%}")
+    print(f"Saved per pipeline: {(full_bytes - compact_bytes) / runs:.0f} bytes, "
+          f"{(full_tokens - compact_tokens) / runs:.0f} tokens")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for DevTools AI Mock MCP Server
+
+Measures the two numbers an agent feels when it spawns the stdio server:
+
+- import time of ``devtools_ai_mock_mcp.server`` (via ``python -X importtime``)
+- time to first response: process spawn until the ``initialize`` reply arrives
+
+Both are compared against a startup budget so the script can gate CI:
+it exits with status 1 when the median time to first response exceeds
+``--budget-ms`` (or ``DEVTOOLS_AI_MOCK_STARTUP_BUDGET_MS``).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = 1500.0
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "0"},
+    },
+}
+
+
+def measure_import_time(top: int):
+    """Return (total_us, [(cumulative_us, module), ...]) for importing the server."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import devtools_ai_mock_mcp.server"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line.split(":", 1)[1].split("|")
+        cumulative = int(cumulative_us)
+        name = module.strip()
+        entries[name] = max(cumulative, entries.get(name, 0))
+        if name == "devtools_ai_mock_mcp.server":
+            total_us = cumulative
+    slowest = sorted(((us, name) for name, us in entries.items()), reverse=True)
+    return total_us, slowest[:top]
+
+
+def measure_first_response() -> float:
+    """Spawn the stdio server once and return milliseconds until the initialize reply."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "devtools_ai_mock_mcp.server"],
+        cwd=REPO_ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        proc.stdin.write((json.dumps(INITIALIZE_REQUEST) + "\n").encode())
+        proc.stdin.flush()
+        line = proc.stdout.readline()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if b'"result"' not in line:
+            raise RuntimeError(f"Unexpected initialize response: {line!r}")
+        return elapsed_ms
+    finally:
+        proc.stdin.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts to time")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("DEVTOOLS_AI_MOCK_STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        help="fail if median time to first response exceeds this",
+    )
+    args = parser.parse_args()
+
+    total_us, slowest = measure_import_time(args.top)
+    print(f"Import time (devtools_ai_mock_mcp.server): {total_us / 1000:.1f} ms")
+    for cumulative, module in slowest:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    samples = [measure_first_response() for _ in range(args.runs)]
+    median = statistics.median(samples)
+    print(
+        f"Time to first response over {args.runs} runs: "
+        f"median {median:.1f} ms, min {min(samples):.1f} ms, max {max(samples):.1f} ms"
+    )
+    print(f"Budget: {args.budget_ms:.0f} ms")
+
+    if median > args.budget_ms:
+        print("FAIL: startup budget exceeded")
+        return 1
+    print("OK: within startup budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Admission control for DevTools AI Mock MCP Server
+
+Bounds the number of tool calls executing at once. Calls beyond the limit
+wait in a bounded queue with a deadline; when the queue is full or the
+deadline passes they are rejected immediately with a retry-after hint
+instead of piling up. Calls for sessions already in progress are admitted
+ahead of new initiate_session calls, and new sessions are the first to be
+turned away when the queue overflows, so tail latency for in-flight work
+stays bounded under a burst.
+
+A call's queue wait is also capped by its own deadline, if shorter.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque
+
+from .deadline import DeadlineExceeded, current_deadline
+
+
+class Overloaded(Exception):
+    """Raised when a call cannot be admitted; carries a retry-after hint."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limiter with a two-level priority wait queue."""
+
+    def __init__(self, max_concurrent: int, max_queued: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.rejected = 0
+        self._priority: Deque[asyncio.Future] = deque()
+        self._normal: Deque[asyncio.Future] = deque()
+        # Exponentially weighted mean service time, used for retry-after hints
+        self._service_time = 0.01
+
+    @property
+    def queued(self) -> int:
+        return len(self._priority) + len(self._normal)
+
+    def retry_after(self) -> float:
+        """Estimated seconds until a slot frees up for a new caller."""
+        backlog = self.queued + 1
+        return max(0.05, round(backlog * self._service_time / self.max_concurrent, 2))
+
+    @asynccontextmanager
+    async def admit(self, priority: bool):
+        """Hold an execution slot for the duration of the block."""
+        await self._acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self._service_time += 0.1 * (elapsed - self._service_time)
+            self._release()
+
+    async def _acquire(self, priority: bool) -> None:
+        if self.active < self.max_concurrent and not self.queued:
+            self.active += 1
+            return
+
+        if self.queued >= self.max_queued:
+            if priority and self._normal:
+                # Make room by turning away the newest waiting new-session call
+                self._normal.pop().set_exception(
+                    Overloaded("Server is overloaded", self.retry_after())
+                )
+            else:
+                self.rejected += 1
+                raise Overloaded("Server is overloaded", self.retry_after())
+
+        deadline = current_deadline()
+        timeout = self.queue_timeout
+        if deadline is not None:
+            deadline.check("admission")
+            timeout = min(timeout, deadline.remaining())
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._priority if priority else self._normal
+        queue.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter, queue)
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceeded("admission", deadline.budget) from None
+            self.rejected += 1
+            raise Overloaded("Timed out waiting for an execution slot", self.retry_after())
+        except Overloaded:
+            self.rejected += 1
+            raise
+        except asyncio.CancelledError:
+            self._abandon(waiter, queue)
+            raise
+
+    def _abandon(self, waiter: asyncio.Future, queue: Deque[asyncio.Future]) -> None:
+        if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+            # The slot was handed to us just as we gave up; pass it on
+            self._release()
+        else:
+            try:
+                queue.remove(waiter)
+            except ValueError:
+                pass
+            waiter.cancel()
+
+    def _release(self) -> None:
+        for queue in (self._priority, self._normal):
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    # Hand the slot straight to the next waiter
+                    waiter.set_result(None)
+                    return
+        self.active -= 1
@@ -0,0 +1,111 @@
+"""
+Streaming session analytics for DevTools AI Mock MCP Server
+
+Selection distributions and confirmation outcomes are counted as each step
+handler runs, so reading the aggregates never requires a scan of the
+session store. Low-cardinality fields (workflows, toolchains, tools,
+outcomes, rewind steps) use exact counters; high-cardinality free text such
+as snapshot names extracted from questions goes into a count-min sketch
+with a small heavy-hitters list alongside it.
+"""
+
+import time
+from collections import Counter
+from typing import Dict, Hashable, List, Optional
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates never undercount."""
+
+    def __init__(self, width: int = 2048, depth: int = 4, top_k: int = 20):
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.total = 0
+        self._rows: List[List[int]] = [[0] * width for _ in range(depth)]
+        # Candidate heavy hitters with their latest estimates
+        self._top: Dict[Hashable, int] = {}
+
+    def add(self, item: Hashable, count: int = 1) -> int:
+        """Count an item and return its updated estimate."""
+        self.total += count
+        estimate = None
+        for seed, row in enumerate(self._rows):
+            index = hash((seed, item)) % self.width
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        self._track(item, estimate)
+        return estimate
+
+    def estimate(self, item: Hashable) -> int:
+        """Upper-bound estimate of how often an item was added."""
+        return min(row[hash((seed, item)) % self.width] for seed, row in enumerate(self._rows))
+
+    def heavy_hitters(self) -> List[tuple]:
+        """Most frequent tracked items as (item, estimate), highest first."""
+        return sorted(self._top.items(), key=lambda entry: (-entry[1], str(entry[0])))
+
+    def _track(self, item: Hashable, estimate: int) -> None:
+        top = self._top
+        if item in top or len(top) < self.top_k:
+            top[item] = estimate
+            return
+        weakest = min(top, key=top.get)
+        if estimate > top[weakest]:
+            del top[weakest]
+            top[item] = estimate
+
+
+class SessionAnalytics:
+    """Incrementally maintained aggregates over session outcomes."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.sessions_started = 0
+        self.workflows = Counter()
+        self.toolchains = Counter()
+        self.tools = Counter()
+        self.confirmations = Counter()
+        self.rewind_steps = Counter()
+        self.snapshot_names = CountMinSketch()
+
+    def record_session(self) -> None:
+        self.sessions_started += 1
+
+    def record_workflow(self, workflow: str) -> None:
+        self.workflows[workflow] += 1
+
+    def record_toolchain(self, toolchain: str) -> None:
+        self.toolchains[toolchain] += 1
+
+    def record_tool(self, tool: str) -> None:
+        self.tools[tool] += 1
+
+    def record_snapshot(self, snapshot_name: str) -> None:
+        self.snapshot_names.add(snapshot_name)
+
+    def record_confirmation(self, outcome: str, rewind_step: Optional[str] = None) -> None:
+        """Count an approved/rejected/unclear response and any rewind target."""
+        self.confirmations[outcome] += 1
+        if rewind_step is not None:
+            self.rewind_steps[rewind_step] += 1
+
+    def summary(self) -> dict:
+        """Current aggregates, including approval and rejection rates."""
+        answered = sum(self.confirmations.values())
+        return {
+            "since": self.started_at,
+            "sessions_started": self.sessions_started,
+            "workflows": dict(self.workflows.most_common()),
+            "toolchains": dict(self.toolchains.most_common()),
+            "tools": dict(self.tools.most_common()),
+            "confirmations": dict(self.confirmations.most_common()),
+            "approval_rate": self.confirmations["approved"] / answered if answered else None,
+            "rejection_rate": self.confirmations["rejected"] / answered if answered else None,
+            "rewind_steps": dict(self.rewind_steps.most_common()),
+            "snapshot_names": {
+                "total": self.snapshot_names.total,
+                "top": dict(self.snapshot_names.heavy_hitters()),
+            },
+        }
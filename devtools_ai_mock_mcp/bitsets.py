@@ -0,0 +1,79 @@
+"""
+Tool bitsets for DevTools AI Mock MCP Server
+
+Every tool name in the catalog gets a dense number, and each toolchain,
+environment and keyword pattern is precomputed as a Python int with one bit
+per tool it contains. Restricting a toolchain's tools to an environment is
+then a single integer AND, and preferring tools that match the question's
+keyword patterns is one more, however large the catalog grows.
+
+A tool matches a keyword pattern when any of the pattern's keywords appears
+in the tool's name or description.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+class ToolBitsets:
+    """Dense tool numbering with toolchain, environment and pattern bitsets."""
+
+    def __init__(self, catalog):
+        names: Dict[str, int] = {}
+        for group in (catalog.toolchains, catalog.environments):
+            for entry in group.values():
+                for tool in entry.get("tools", []):
+                    names.setdefault(tool, len(names))
+        for tool in catalog.tools:
+            names.setdefault(tool, len(names))
+        self.index = names
+        self.names: List[str] = list(names)
+
+        self.toolchains = {name: self.mask(entry.get("tools", [])) for name, entry in catalog.toolchains.items()}
+        self.environments = {name: self.mask(entry.get("tools", [])) for name, entry in catalog.environments.items()}
+        self.patterns: Dict[str, Tuple[Sequence[str], int]] = {}
+        for pattern, keywords in catalog.common_patterns.items():
+            matching = [
+                tool for tool in self.names
+                if any(keyword in tool or keyword in catalog.tools.get(tool, {}).get("description", "").lower()
+                       for keyword in keywords)
+            ]
+            self.patterns[pattern] = (tuple(keywords), self.mask(matching))
+
+    def mask(self, tools: Iterable[str]) -> int:
+        """Bitset of the given tool names (unknown names are ignored)."""
+        bits = 0
+        for tool in tools:
+            index = self.index.get(tool)
+            if index is not None:
+                bits |= 1 << index
+        return bits
+
+    def decode(self, bits: int) -> List[str]:
+        """Tool names in a bitset, in catalog order."""
+        tools = []
+        while bits:
+            lowest = bits & -bits
+            tools.append(self.names[lowest.bit_length() - 1])
+            bits ^= lowest
+        return tools
+
+    def in_order(self, bits: int, tools: Iterable[str]) -> List[str]:
+        """Tools from an ordered list whose bit is set, in that list's order."""
+        ordered = []
+        for tool in tools:
+            index = self.index.get(tool)
+            if index is not None and bits >> index & 1:
+                ordered.append(tool)
+        return ordered
+
+    def pattern_mask(self, question: str) -> int:
+        """Union of the patterns whose keywords appear in a lowercased question."""
+        bits = 0
+        for keywords, pattern_bits in self.patterns.values():
+            if any(keyword in question for keyword in keywords):
+                bits |= pattern_bits
+        return bits
+
+    def available(self, toolchain: str, environment: str) -> int:
+        """Tools of a toolchain that are available in an environment."""
+        return self.toolchains.get(toolchain, 0) & self.environments.get(environment, 0)
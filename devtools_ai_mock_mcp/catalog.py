@@ -0,0 +1,385 @@
+"""
+Catalog access for DevTools AI Mock MCP Server
+
+Wraps the mock data dictionaries behind a single Catalog object. The catalog
+is built on first use rather than at import time, and any derived indexes or
+rendered response fragments are computed lazily the first time a handler
+asks for them, so server startup only pays for what the first request needs.
+
+Tenants layer a few custom workflows, toolchains, tools or command templates
+over the shared catalog. A tenant catalog stores only its diff and resolves
+lookups through ChainMaps (overlay -> base); fragments for entries the tenant
+does not override are served from the base catalog's cache, so a tenant
+costs the size of its diff rather than a copy of the catalog.
+
+A catalog can also be backed by a compiled, memory-mapped image (see
+image.py) shared by every server process on the host.
+"""
+
+import json
+import os
+import re
+from collections import ChainMap
+from typing import Dict, Optional, Set
+
+SECTIONS = ("workflows", "toolchains", "tools", "commands", "environments", "common_patterns")
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+class Catalog:
+    """Read-only view over the catalog sections."""
+
+    def __init__(self, workflows, toolchains, tools, commands, environments=None, common_patterns=None,
+                 parent: Optional["Catalog"] = None, overrides: Optional[Dict[str, dict]] = None):
+        self.workflows = workflows
+        self.toolchains = toolchains
+        self.tools = tools
+        self.commands = commands
+        self.environments = environments if environments is not None else {}
+        self.common_patterns = common_patterns if common_patterns is not None else {}
+        self.parent = parent
+        self.overrides = overrides or {}
+        # Bumped by each hot reload; names dropped by reloads stay listed in removed
+        self.version = 0
+        self.removed: Dict[str, Set[str]] = {section: set() for section in SECTIONS}
+        self._fragments: Dict[tuple, str] = {}
+        self._decision_table = None
+        self._variant_index = None
+        self._tool_bitsets = None
+        # Compiled image backing the sections and indexes, if any
+        self.image = None
+
+    @classmethod
+    def from_image(cls, image) -> "Catalog":
+        """Catalog whose sections, fragments and indexes are read from a mapped image."""
+        from .image import ImageSection
+        catalog = cls(*(ImageSection(image, section) for section in SECTIONS))
+        catalog.image = image
+        return catalog
+
+    @property
+    def root(self) -> "Catalog":
+        """The base catalog under any overlays."""
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        return root
+
+    def is_removed(self, section: str, name: str) -> bool:
+        """Whether a name was dropped from the catalog by a hot reload."""
+        if name in getattr(self, section):
+            return False
+        return name in self.root.removed[section]
+
+    def rebuilt(self, sections: Dict[str, dict], changed: Dict[str, Set[str]]) -> "Catalog":
+        """Build the next catalog version, reusing whatever the change left intact.
+
+        changed lists, per section, every name that was added, removed or
+        modified. Cached fragments for untouched entries carry over, and an
+        already-built decision table is patched for the changed workflows
+        and toolchains instead of being rebuilt from scratch.
+        """
+        catalog = Catalog(*(sections[section] for section in SECTIONS))
+        catalog.version = self.version + 1
+        for section in SECTIONS:
+            dropped = {name for name in changed[section] if name not in sections[section]}
+            catalog.removed[section] = (self.removed[section] | dropped) - set(sections[section])
+        catalog._fragments = {
+            key: fragment for key, fragment in dict(self._fragments).items()
+            if key[1] not in changed[key[0]]
+        }
+        if self._decision_table is not None:
+            from .decision import DecisionTable
+            catalog._decision_table = DecisionTable.build(
+                catalog,
+                base=_patchable(self._decision_table),
+                changed_workflows=changed["workflows"],
+                changed_toolchains=changed["toolchains"]
+            )
+        if self._variant_index is not None:
+            from .variants import VariantIndex
+            catalog._variant_index = VariantIndex.build(
+                catalog,
+                base=self._variant_index,
+                changed_tools=changed["commands"] | changed["tools"]
+            )
+        return catalog
+
+    @property
+    def decision_table(self):
+        """Precomputed selection outcomes, built on first use.
+
+        A tenant overlay reuses its parent's table and recomputes only the
+        workflows and toolchains it overrides.
+        """
+        if self._decision_table is None:
+            from .decision import DecisionTable
+            if self.image is not None:
+                from .image import MappedDecisionTable
+                self._decision_table = MappedDecisionTable(self.image)
+            elif self.parent is None:
+                self._decision_table = DecisionTable.build(self)
+            else:
+                self._decision_table = DecisionTable.build(
+                    self,
+                    base=_patchable(self.parent.decision_table),
+                    changed_workflows=self.overrides["workflows"],
+                    changed_toolchains=self.overrides["toolchains"]
+                )
+        return self._decision_table
+
+    @property
+    def variant_index(self):
+        """Embedded command variants for similarity matching, built on first use.
+
+        Like the decision table, an overlay re-embeds only the tools whose
+        templates or examples it overrides.
+        """
+        if self._variant_index is None:
+            from .variants import VariantIndex
+            if self.image is not None:
+                from .image import mapped_variant_index
+                self._variant_index = mapped_variant_index(self.image)
+            elif self.parent is None:
+                self._variant_index = VariantIndex.build(self)
+            else:
+                self._variant_index = VariantIndex.build(
+                    self,
+                    base=self.parent.variant_index,
+                    changed_tools=set(self.overrides["commands"]) | set(self.overrides["tools"])
+                )
+        return self._variant_index
+
+    @property
+    def tool_bitsets(self):
+        """Toolchain, environment and keyword-pattern bitsets, built on first use."""
+        if self._tool_bitsets is None:
+            from .bitsets import ToolBitsets
+            self._tool_bitsets = ToolBitsets(self)
+        return self._tool_bitsets
+
+    def overlay(self, diff: Dict[str, dict]) -> "Catalog":
+        """Return a copy-on-write catalog layering diff over this one."""
+        unknown = set(diff) - set(SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown catalog sections: {', '.join(sorted(unknown))}")
+        overrides = {section: dict(diff.get(section, {})) for section in SECTIONS}
+        # Command variants merge per tool so a tenant can add one template
+        commands = overrides["commands"]
+        for tool, variants in commands.items():
+            if tool in self.commands:
+                commands[tool] = ChainMap(variants, self.commands[tool])
+        return Catalog(
+            *(ChainMap(overrides[section], getattr(self, section)) for section in SECTIONS),
+            parent=self,
+            overrides=overrides
+        )
+
+    def _fragment(self, section: str, name: str, render) -> str:
+        if self.parent is not None and name not in self.overrides[section]:
+            return self.parent._fragment(section, name, render)
+        if self.image is not None:
+            # Decoded from the shared image on each use rather than copied into this process
+            fragment = getattr(self, section).fragment(name)
+            if fragment is not None:
+                return fragment
+        key = (section, name)
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            fragment = render(getattr(self, section).get(name, {}))
+            self._fragments[key] = fragment
+        return fragment
+
+    def workflow_fragment(self, name: str) -> str:
+        """Rendered description block for a workflow, built on first use."""
+        return self._fragment("workflows", name, lambda info: (
+            f"Description: {info.get('description', '')}\n"
+            f"Common tasks: {', '.join(info.get('common_tasks', []))}\n"
+        ))
+
+    def toolchain_fragment(self, name: str) -> str:
+        """Rendered description block for a toolchain, built on first use."""
+        return self._fragment("toolchains", name, lambda info: (
+            f"Description: {info.get('description', '')}\n"
+            f"Available tools: {', '.join(info.get('tools', []))}\n"
+        ))
+
+    def tool_fragment(self, name: str) -> str:
+        """Rendered description block for a tool, built on first use."""
+        return self._fragment("tools", name, lambda info: (
+            f"Description: {info.get('description', '')}\n"
+            f"Usage: {info.get('usage', '')}\n"
+            f"Documentation: {info.get('doc_url', 'N/A')}\n"
+        ))
+
+
+_catalog: Optional[Catalog] = None
+
+# Tenant name -> catalog diff, and the overlays built from them on demand
+_tenant_diffs: Optional[Dict[str, Dict[str, dict]]] = None
+_tenant_catalogs: Dict[str, Catalog] = {}
+
+
+def get_catalog(tenant: Optional[str] = None) -> Catalog:
+    """Return the shared catalog, or a tenant's overlay of it.
+
+    The base catalog is loaded on first call; tenant overlays are built the
+    first time that tenant is used. Raises KeyError for an unknown tenant.
+    """
+    global _catalog
+    if _catalog is None:
+        from .config import CATALOG_IMAGE_PATH, CATALOG_PATH
+        if CATALOG_IMAGE_PATH:
+            from .image import open_image
+            _catalog = Catalog.from_image(open_image(CATALOG_IMAGE_PATH, catalog_source_path()))
+        elif CATALOG_PATH:
+            sections = load_catalog_source(CATALOG_PATH)
+            validate_sections(sections)
+            _catalog = Catalog(*(sections[section] for section in SECTIONS))
+        else:
+            from .mock_data import WORKFLOWS, TOOLCHAINS, TOOLS, COMMANDS, ENVIRONMENTS, COMMON_PATTERNS
+            _catalog = Catalog(WORKFLOWS, TOOLCHAINS, TOOLS, COMMANDS, ENVIRONMENTS, COMMON_PATTERNS)
+    if not tenant:
+        return _catalog
+    overlay = _tenant_catalogs.get(tenant)
+    if overlay is None or overlay.parent is not _catalog:
+        overlay = _catalog.overlay(_load_tenants()[tenant])
+        _tenant_catalogs[tenant] = overlay
+    return overlay
+
+
+def _patchable(table):
+    """A decision table that can seed an incremental build, or None for a full one."""
+    from .decision import DecisionTable
+    return table if isinstance(table, DecisionTable) else None
+
+
+def set_catalog(catalog: Catalog) -> None:
+    """Publish a new base catalog.
+
+    This is a single reference swap: handlers that already fetched the
+    previous catalog finish on it, new calls see the new one, and tenant
+    overlays are rebuilt over it on their next use.
+    """
+    global _catalog
+    _catalog = catalog
+
+
+def catalog_source_path() -> str:
+    """File the base catalog is loaded from."""
+    from .config import CATALOG_PATH
+    return CATALOG_PATH or os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_data.py")
+
+
+def load_catalog_source(path: str) -> Dict[str, dict]:
+    """Read catalog sections from a mock_data-style .py file or a .json file."""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        return {section: data.get(section, {}) for section in SECTIONS}
+    # Execute in a throwaway namespace so the imported mock_data module is untouched
+    with open(path, "r", encoding="utf-8") as fh:
+        source = fh.read()
+    namespace: dict = {"__name__": "devtools_ai_mock_mcp._catalog_reload", "__file__": path}
+    exec(compile(source, path, "exec"), namespace)
+    return {section: namespace.get(section.upper(), {}) for section in SECTIONS}
+
+
+def validate_sections(sections: Dict[str, dict]) -> None:
+    """Check catalog shape and cross-references; raise ValueError if invalid."""
+    for section in SECTIONS:
+        if not isinstance(sections.get(section), dict):
+            raise ValueError(f"Catalog section {section} must be a dict")
+        # Keyword patterns are lists of keywords; every other entry is a dict
+        shape = list if section == "common_patterns" else dict
+        for name, entry in sections[section].items():
+            if not isinstance(name, str) or not isinstance(entry, shape):
+                raise ValueError(f"Invalid {section} entry: {name!r}")
+    for name, entry in sections["workflows"].items():
+        for toolchain in entry.get("toolchains", []):
+            if toolchain not in sections["toolchains"]:
+                raise ValueError(f"Workflow {name!r} references unknown toolchain {toolchain!r}")
+    for section in ("toolchains", "environments"):
+        for name, entry in sections[section].items():
+            if not all(isinstance(tool, str) for tool in entry.get("tools", [])):
+                raise ValueError(f"{section.capitalize()[:-1]} {name!r} has a non-string tool name")
+            for tool in entry.get("tools", []):
+                if tool not in sections["tools"]:
+                    raise ValueError(f"{section.capitalize()[:-1]} {name!r} references unknown tool {tool!r}")
+    for name, keywords in sections["common_patterns"].items():
+        if not all(isinstance(keyword, str) for keyword in keywords):
+            raise ValueError(f"Keyword pattern {name!r} has a non-string keyword")
+    for tool, variants in sections["commands"].items():
+        if tool not in sections["tools"]:
+            raise ValueError(f"Command templates for unknown tool {tool!r}")
+        if not all(isinstance(template, str) for template in variants.values()):
+            raise ValueError(f"Command templates for {tool!r} must be strings")
+
+
+def diff_sections(catalog: Catalog, sections: Dict[str, dict]) -> Dict[str, Set[str]]:
+    """Names added, removed or modified in each section relative to a catalog."""
+    changed = {}
+    for section in SECTIONS:
+        old, new = getattr(catalog, section), sections[section]
+        changed[section] = {
+            name for name in set(old) | set(new)
+            if name not in old or name not in new or old[name] != new[name]
+        }
+    return changed
+
+
+def match_variant(catalog: Catalog, tool: str, question: str, resolvable=()):
+    """Best command variant of a tool for a question (an executor stage)."""
+    return catalog.variant_index.match(tool, question, resolvable)
+
+
+def default_command(catalog: Catalog, tool: str, values: Dict[str, Optional[str]]) -> str:
+    """A tool's default template filled with values, or its first concrete
+    example if the default still has placeholders this session cannot fill."""
+    command = fill_placeholders(catalog.commands.get(tool, {}).get("default", tool), values)
+    if _PLACEHOLDER.search(command):
+        for example in catalog.tools.get(tool, {}).get("examples", []):
+            if not _PLACEHOLDER.search(example):
+                return example
+    return command
+
+
+def fill_placeholders(template: str, values: Dict[str, Optional[str]]) -> str:
+    """Substitute known {placeholder} values in a command template, leaving unknown ones visible."""
+    return _PLACEHOLDER.sub(lambda m: values.get(m.group(1)) or m.group(0), template)
+
+
+def register_tenant(tenant: str, diff: Dict[str, dict]) -> None:
+    """Add or replace a tenant's catalog diff."""
+    if set(diff) - set(SECTIONS):
+        raise ValueError(f"Unknown catalog sections for tenant {tenant}")
+    _load_tenants()[tenant] = diff
+    _tenant_catalogs.pop(tenant, None)
+
+
+def unregister_tenant(tenant: str) -> None:
+    """Drop a tenant's catalog diff and overlay, if configured."""
+    _load_tenants().pop(tenant, None)
+    _tenant_catalogs.pop(tenant, None)
+
+
+def tenant_diff(tenant: str) -> Optional[Dict[str, dict]]:
+    """A tenant's catalog diff, or None if it is not configured."""
+    return _load_tenants().get(tenant)
+
+
+def has_tenant(tenant: str) -> bool:
+    """Whether a tenant overlay is configured."""
+    return tenant in _load_tenants()
+
+
+def _load_tenants() -> Dict[str, Dict[str, dict]]:
+    global _tenant_diffs
+    if _tenant_diffs is None:
+        from .config import TENANTS_PATH
+        _tenant_diffs = {}
+        if TENANTS_PATH:
+            with open(TENANTS_PATH, "r", encoding="utf-8") as fh:
+                _tenant_diffs = json.load(fh)
+    return _tenant_diffs
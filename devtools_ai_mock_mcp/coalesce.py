@@ -0,0 +1,122 @@
+"""
+Duplicate tool call handling for DevTools AI Mock MCP Server
+
+MCP clients retry on timeouts and agents often re-issue the same step for a
+session. Calls are keyed on (tool, session_id, normalized arguments):
+
+- identical calls that arrive while one is still running share its result
+  (singleflight coalescing)
+- a retry of the most recent state-changing call for a session is answered
+  from a short-lived replay cache, so it neither recomputes nor re-mutates
+  the session (step and cursor stay where the first call left them)
+
+A call that runs out of its own deadline is abandoned like a cancelled one:
+waiting duplicates run the call themselves rather than inherit the timeout.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from .deadline import DeadlineExceeded, bounded
+
+logger = logging.getLogger("devtools-ai-mock-mcp")
+
+# Tools that change session state; only these are replayed from cache
+MUTATING_TOOLS = frozenset({
+    "get_workflow",
+    "get_toolchain",
+    "get_tool",
+    "generate_command",
+    "confirm_command",
+})
+
+CallKey = Tuple[str, str, str]
+
+
+def call_key(name: str, arguments: dict) -> CallKey:
+    """Build the coalescing key for a session-scoped tool call."""
+    session_id = arguments.get("session_id", "")
+    normalized = {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in arguments.items()
+        if key != "session_id"
+    }
+    return name, session_id, json.dumps(normalized, sort_keys=True, default=str)
+
+
+class CallCoalescer:
+    """Coalesces in-flight duplicates and replays recent results per session."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._inflight: Dict[CallKey, asyncio.Future] = {}
+        # session_id -> (key, result, expires_at), oldest expiry first
+        self._replays: "OrderedDict[str, Tuple[CallKey, Any, float]]" = OrderedDict()
+        self.coalesced = 0
+        self.replayed = 0
+
+    async def run(self, name: str, arguments: dict,
+                  call: Callable[[str, dict], Awaitable[Any]]) -> Any:
+        """Run call(name, arguments) unless an identical call can answer it."""
+        if not arguments.get("session_id"):
+            # initiate_session creates state rather than stepping it; never share
+            return await call(name, arguments)
+
+        key = call_key(name, arguments)
+        now = time.monotonic()
+        self._prune(now)
+
+        if name in MUTATING_TOOLS:
+            replay = self._replays.get(key[1])
+            if replay is not None and replay[0] == key:
+                self.replayed += 1
+                logger.debug(f"Replaying {name} for {key[1]} from idempotency cache")
+                return replay[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                result = await bounded(asyncio.shield(inflight), "coalesced call")
+                self.coalesced += 1
+                return result
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The original caller was abandoned; run the call ourselves
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await call(name, arguments)
+        except (asyncio.CancelledError, DeadlineExceeded):
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so unobserved failures don't log "never retrieved"
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.set_result(result)
+        if name in MUTATING_TOOLS:
+            self._replays.pop(key[1], None)
+            self._replays[key[1]] = (key, result, time.monotonic() + self.ttl)
+        return result
+
+    def forget(self, session_id: str) -> None:
+        """Drop any replayable result for a session that no longer exists."""
+        self._replays.pop(session_id, None)
+
+    def _prune(self, now: float) -> None:
+        while self._replays:
+            session_id, (_, _, expires_at) = next(iter(self._replays.items()))
+            if expires_at > now:
+                break
+            del self._replays[session_id]
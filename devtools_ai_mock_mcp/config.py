@@ -0,0 +1,82 @@
+"""
+Runtime configuration for DevTools AI Mock MCP Server
+
+Settings are read once from DEVTOOLS_AI_MOCK_* environment variables so the
+server can be tuned per deployment (or per agent spawn) without code changes.
+"""
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+# Seconds a completed tool call may be replayed to an identical retry
+IDEMPOTENCY_TTL_SECONDS = _env_float("DEVTOOLS_AI_MOCK_IDEMPOTENCY_TTL", 30.0)
+
+# Seconds a tool call may take when the client sends no timeout_ms (0 = no deadline)
+CALL_TIMEOUT_SECONDS = _env_float("DEVTOOLS_AI_MOCK_CALL_TIMEOUT", 30.0)
+
+# Admission control: concurrent calls, queued calls, queue wait and session cap
+MAX_CONCURRENT_CALLS = _env_int("DEVTOOLS_AI_MOCK_MAX_CONCURRENT", 64)
+MAX_QUEUED_CALLS = _env_int("DEVTOOLS_AI_MOCK_MAX_QUEUED", 256)
+QUEUE_TIMEOUT_SECONDS = _env_float("DEVTOOLS_AI_MOCK_QUEUE_TIMEOUT", 5.0)
+MAX_SESSIONS = _env_int("DEVTOOLS_AI_MOCK_MAX_SESSIONS", 100000)
+
+# Idle session expiry and background sweep pacing
+SESSION_TTL_SECONDS = _env_float("DEVTOOLS_AI_MOCK_SESSION_TTL", 3600.0)
+SWEEP_INTERVAL_SECONDS = _env_float("DEVTOOLS_AI_MOCK_SWEEP_INTERVAL", 1.0)
+SWEEP_BATCH_SIZE = _env_int("DEVTOOLS_AI_MOCK_SWEEP_BATCH", 1000)
+
+# History entries kept in memory per session, and the SQLite file overflow is
+# spilled to (unset: a private temp file removed at shutdown; ":memory:" keeps
+# spilled entries in process memory, so history is no longer bounded)
+HISTORY_CAPACITY = _env_int("DEVTOOLS_AI_MOCK_HISTORY_CAPACITY", 50)
+HISTORY_SPILL_PATH = os.environ.get("DEVTOOLS_AI_MOCK_HISTORY_SPILL")
+
+# JSON file of per-tenant catalog diffs ({tenant: {section: {name: entry}}})
+TENANTS_PATH = os.environ.get("DEVTOOLS_AI_MOCK_TENANTS")
+
+# Latency/fault injection profiles file, profile to activate, and RNG seed
+FAULT_PROFILES_PATH = os.environ.get("DEVTOOLS_AI_MOCK_FAULT_PROFILES")
+FAULT_PROFILE = os.environ.get("DEVTOOLS_AI_MOCK_FAULT_PROFILE")
+FAULT_SEED = os.environ.get("DEVTOOLS_AI_MOCK_FAULT_SEED")
+
+# Record/replay proxy: upstream backend URL, recording file, matching and pool size
+PROXY_UPSTREAM = os.environ.get("DEVTOOLS_AI_MOCK_PROXY_UPSTREAM")
+PROXY_STORE_PATH = os.environ.get("DEVTOOLS_AI_MOCK_PROXY_STORE")
+PROXY_MATCH = os.environ.get("DEVTOOLS_AI_MOCK_PROXY_MATCH", "normalized")
+PROXY_MAX_CONNECTIONS = _env_int("DEVTOOLS_AI_MOCK_PROXY_MAX_CONNECTIONS", 10)
+
+# Where CPU-bound handler stages run ("inline", "thread" or "process"), the
+# worker count (0 = executor default) and the input size below which they stay inline
+EXECUTOR_MODE = os.environ.get("DEVTOOLS_AI_MOCK_EXECUTOR", "inline")
+EXECUTOR_WORKERS = _env_int("DEVTOOLS_AI_MOCK_EXECUTOR_WORKERS", 0)
+OFFLOAD_MIN_SIZE = _env_int("DEVTOOLS_AI_MOCK_OFFLOAD_MIN_SIZE", 4096)
+
+# Default response verbosity for new sessions: "full" prose or "compact" key=value lines
+DEFAULT_VERBOSITY = os.environ.get("DEVTOOLS_AI_MOCK_VERBOSITY", "full")
+
+# Catalog source (.py in mock_data format or .json; default mock_data.py) and
+# how often to poll it for hot reload (0, the default, disables watching)
+CATALOG_PATH = os.environ.get("DEVTOOLS_AI_MOCK_CATALOG")
+CATALOG_WATCH_INTERVAL = _env_float("DEVTOOLS_AI_MOCK_CATALOG_WATCH_INTERVAL", 0.0)
+
+# Compiled catalog image memory-mapped read-only by every server process on
+# the host; compiled from the catalog source when missing or stale
+CATALOG_IMAGE_PATH = os.environ.get("DEVTOOLS_AI_MOCK_CATALOG_IMAGE")
+
+# Tracing: span file (unset disables), "chrome" or "otlp" format, fraction of
+# sessions sampled, and the batch size and interval for background export
+TRACE_PATH = os.environ.get("DEVTOOLS_AI_MOCK_TRACE_PATH")
+TRACE_FORMAT = os.environ.get("DEVTOOLS_AI_MOCK_TRACE_FORMAT", "chrome")
+TRACE_SAMPLE_RATE = _env_float("DEVTOOLS_AI_MOCK_TRACE_SAMPLE_RATE", 1.0)
+TRACE_BATCH_SIZE = _env_int("DEVTOOLS_AI_MOCK_TRACE_BATCH", 512)
+TRACE_FLUSH_INTERVAL = _env_float("DEVTOOLS_AI_MOCK_TRACE_FLUSH_INTERVAL", 1.0)
@@ -0,0 +1,111 @@
+"""
+Per-call deadlines for DevTools AI Mock MCP Server
+
+Clients give up on slow calls, but without a deadline the server would keep
+working on them and still step the session. Every tool call gets a time
+budget, either the client's "timeout_ms" argument or the server default.
+The budget starts when the call arrives, so time spent in the admission
+queue counts against it.
+
+The call's Deadline is held in a context variable, so the admission queue,
+fault-injected backend latency, executor stages and handlers can all reach
+it without threading it through their signatures. Pipeline stages call
+checkpoint() between steps, and waits that could outlast the budget go
+through bounded(). Either one raises DeadlineExceeded once the budget is
+spent. Handlers apply session mutations in one block after their last
+checkpoint, so a call that runs out of time or is cancelled by the client
+never leaves the session half-stepped.
+"""
+
+import asyncio
+import contextvars
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Iterator, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call's time budget runs out before a stage."""
+
+    def __init__(self, stage: str, budget: float):
+        super().__init__(f"Deadline of {budget * 1000:.0f} ms exceeded before {stage}")
+        self.stage = stage
+        self.budget = budget
+
+
+class Deadline:
+    """Absolute expiry for one tool call, on the monotonic clock."""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, stage: str) -> None:
+        """Raise DeadlineExceeded if the budget is spent."""
+        if self.expired:
+            raise DeadlineExceeded(stage, self.budget)
+
+    async def bound(self, awaitable: Awaitable, stage: str) -> Any:
+        """Await something, abandoning it when the budget runs out."""
+        self.check(stage)
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(stage, self.budget) from None
+
+
+_current: "contextvars.ContextVar[Optional[Deadline]]" = contextvars.ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The running call's deadline, if it has one."""
+    return _current.get()
+
+
+def checkpoint(stage: str) -> None:
+    """Stop the running call if its deadline has passed."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+async def bounded(awaitable: Awaitable, stage: str) -> Any:
+    """Await within the running call's deadline (unbounded without one)."""
+    deadline = _current.get()
+    if deadline is None:
+        return await awaitable
+    return await deadline.bound(awaitable, stage)
+
+
+def call_budget(timeout_ms: Any, default: float) -> Optional[float]:
+    """Seconds allowed for a call: the client's timeout_ms, else the default (0 = none)."""
+    if timeout_ms is None:
+        return default or None
+    if isinstance(timeout_ms, bool):
+        raise ValueError("timeout_ms must be a positive number")
+    try:
+        budget = float(timeout_ms) / 1000
+    except (TypeError, ValueError):
+        raise ValueError("timeout_ms must be a positive number") from None
+    if not (budget > 0 and math.isfinite(budget)):
+        raise ValueError("timeout_ms must be a positive number")
+    return budget
+
+
+@contextmanager
+def deadline_scope(budget: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Run the enclosed call under a fresh deadline (or none)."""
+    deadline = Deadline(budget) if budget else None
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
@@ -0,0 +1,220 @@
+"""
+Precomputed selection decision table for DevTools AI Mock MCP Server
+
+Every selection rule fires on "any keyword of a group appears in the
+question", so the outcome of workflow -> toolchain -> tool selection depends
+only on which keyword groups are present. A question is reduced once to a
+bitmask of present groups (its signature); the table maps each stage's
+slice of that signature, plus the selection it refines, to the result.
+
+Only reachable signatures are enumerated. A keyword implies every group of
+each keyword it contains ("testing" also matches "test"), and any union of
+keyword masks can be produced by a question listing those keywords.
+
+Run ``python -m devtools_ai_mock_mcp.decision --verify`` to check the table
+against the step-by-step rules in selection.py.
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from .selection import (
+    TOOL_KEYWORDS, TOOLCHAIN_KEYWORDS, WORKFLOW_RULES,
+    extract_snapshot_name, select_tool, select_toolchain, select_workflow
+)
+
+# Bit positions: workflow groups, then toolchain groups, then tool groups
+GROUPS: Tuple[Tuple[str, ...], ...] = (
+    tuple(keywords for keywords, _ in WORKFLOW_RULES) + TOOLCHAIN_KEYWORDS + TOOL_KEYWORDS
+)
+WORKFLOW_BITS = (1 << len(WORKFLOW_RULES)) - 1
+TOOLCHAIN_BITS = ((1 << len(TOOLCHAIN_KEYWORDS)) - 1) << len(WORKFLOW_RULES)
+TOOL_BITS = ((1 << len(TOOL_KEYWORDS)) - 1) << (len(WORKFLOW_RULES) + len(TOOLCHAIN_KEYWORDS))
+
+
+def _keyword_masks() -> Dict[str, int]:
+    vocabulary = sorted({keyword for group in GROUPS for keyword in group})
+    masks = {}
+    for keyword in vocabulary:
+        mask = 0
+        for bit, group in enumerate(GROUPS):
+            if any(member in keyword for member in group):
+                mask |= 1 << bit
+        masks[keyword] = mask
+    return masks
+
+
+KEYWORD_MASKS = _keyword_masks()
+
+
+def signature(question: str) -> int:
+    """Bitmask of keyword groups present in a lowercased question."""
+    mask = 0
+    for keyword, keyword_mask in KEYWORD_MASKS.items():
+        if keyword in question:
+            mask |= keyword_mask
+    return mask
+
+
+def matched_keywords(question: str) -> List[str]:
+    """Selection keywords present in a lowercased question."""
+    return [keyword for keyword in KEYWORD_MASKS if keyword in question]
+
+
+def classify_question(question: str) -> Tuple[int, Optional[str]]:
+    """Signature and snapshot name of a raw question (an executor stage)."""
+    return signature(question.lower()), extract_snapshot_name(question)
+
+
+def reachable_signatures() -> Dict[int, Tuple[str, ...]]:
+    """Every reachable signature with a witness keyword list producing it."""
+    witnesses: Dict[int, Tuple[str, ...]] = {0: ()}
+    for keyword, keyword_mask in KEYWORD_MASKS.items():
+        for mask, words in list(witnesses.items()):
+            combined = mask | keyword_mask
+            if combined not in witnesses:
+                witnesses[combined] = words + (keyword,)
+    return witnesses
+
+
+# Table key standing in for any workflow/toolchain name missing from the catalog
+UNKNOWN = ""
+
+
+class DecisionTable:
+    """Selection outcomes keyed by (refined selection, signature slice)."""
+
+    def __init__(self, workflows: Dict[int, str],
+                 toolchains: Dict[Tuple[str, int], str],
+                 tools: Dict[Tuple[str, int], str],
+                 chains: Dict[int, Tuple[str, str, str]]):
+        self.workflows = workflows
+        self.toolchains = toolchains
+        self.tools = tools
+        self.chains = chains
+
+    @classmethod
+    def build(cls, catalog, base: Optional["DecisionTable"] = None,
+              changed_workflows=(), changed_toolchains=()) -> "DecisionTable":
+        """Build the table for a catalog.
+
+        With a base table, entries for workflows and toolchains not listed as
+        changed are reused and only the changed ones are recomputed.
+        """
+        witnesses = reachable_signatures()
+        toolchain_slices = _slices(witnesses, TOOLCHAIN_BITS)
+        tool_slices = _slices(witnesses, TOOL_BITS)
+        workflows = {mask: select_workflow(question)
+                     for mask, question in _slices(witnesses, WORKFLOW_BITS).items()}
+
+        if base is not None:
+            toolchains = {key: value for key, value in base.toolchains.items()
+                          if key[0] not in changed_workflows
+                          and (key[0] == UNKNOWN or key[0] in catalog.workflows)}
+            tools = {key: value for key, value in base.tools.items()
+                     if key[0] not in changed_toolchains
+                     and (key[0] == UNKNOWN or key[0] in catalog.toolchains)}
+            workflow_names, toolchain_names = changed_workflows, changed_toolchains
+        else:
+            toolchains, tools = {}, {}
+            workflow_names = [UNKNOWN, *catalog.workflows]
+            toolchain_names = [UNKNOWN, *catalog.toolchains]
+
+        for name in workflow_names:
+            if name != UNKNOWN and name not in catalog.workflows:
+                continue
+            options = catalog.workflows[name].get("toolchains", []) if name else []
+            for mask, question in toolchain_slices.items():
+                toolchains[(name, mask)] = select_toolchain(question, options)
+        for name in toolchain_names:
+            if name != UNKNOWN and name not in catalog.toolchains:
+                continue
+            options = catalog.toolchains[name].get("tools", []) if name else []
+            for mask, question in tool_slices.items():
+                tools[(name, mask)] = select_tool(question, options)
+
+        table = cls(workflows, toolchains, tools, {})
+        for mask in witnesses:
+            workflow = table.workflow(mask)
+            toolchain = table.toolchain(workflow, mask)
+            table.chains[mask] = (workflow, toolchain, table.tool(toolchain, mask))
+        return table
+
+    def workflow(self, mask: int) -> str:
+        return self.workflows[mask & WORKFLOW_BITS]
+
+    def toolchain(self, workflow: str, mask: int) -> str:
+        sliced = mask & TOOLCHAIN_BITS
+        found = self.toolchains.get((workflow, sliced))
+        return found if found is not None else self.toolchains[(UNKNOWN, sliced)]
+
+    def tool(self, toolchain: str, mask: int) -> str:
+        sliced = mask & TOOL_BITS
+        found = self.tools.get((toolchain, sliced))
+        return found if found is not None else self.tools[(UNKNOWN, sliced)]
+
+    def pipeline(self, question: str) -> Tuple[str, str, str]:
+        """Resolve workflow, toolchain and tool with one extraction and one lookup."""
+        return self.chains[signature(question)]
+
+
+def _slices(witnesses: Dict[int, Tuple[str, ...]], bits: int) -> Dict[int, str]:
+    """One witness question per distinct stage slice of the signatures."""
+    slices: Dict[int, str] = {}
+    for mask, words in witnesses.items():
+        slices.setdefault(mask & bits, " ".join(words))
+    return slices
+
+
+def verify(catalog, table: DecisionTable) -> List[str]:
+    """Compare the table with the step-by-step rules; return mismatches."""
+    mismatches = []
+    for mask, words in reachable_signatures().items():
+        question = " ".join(words)
+        if signature(question) != mask:
+            mismatches.append(f"witness {question!r} has signature {signature(question)}, expected {mask}")
+            continue
+        expected = select_workflow(question)
+        if table.workflow(mask) != expected:
+            mismatches.append(f"workflow for {question!r}: table {table.workflow(mask)!r}, rules {expected!r}")
+        for name in [UNKNOWN, *catalog.workflows]:
+            options = catalog.workflows[name].get("toolchains", []) if name else []
+            expected = select_toolchain(question, options)
+            if table.toolchain(name, mask) != expected:
+                mismatches.append(f"toolchain for {name!r}/{question!r}: table {table.toolchain(name, mask)!r}, rules {expected!r}")
+        for name in [UNKNOWN, *catalog.toolchains]:
+            options = catalog.toolchains[name].get("tools", []) if name else []
+            expected = select_tool(question, options)
+            if table.tool(name, mask) != expected:
+                mismatches.append(f"tool for {name!r}/{question!r}: table {table.tool(name, mask)!r}, rules {expected!r}")
+        workflow = select_workflow(question)
+        toolchain = select_toolchain(question, catalog.workflows.get(workflow, {}).get("toolchains", []))
+        tool = select_tool(question, catalog.toolchains.get(toolchain, {}).get("tools", []))
+        if table.pipeline(question) != (workflow, toolchain, tool):
+            mismatches.append(f"pipeline for {question!r}: table {table.pipeline(question)!r}, rules {(workflow, toolchain, tool)!r}")
+    return mismatches
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or verify the selection decision table")
+    parser.add_argument("--verify", action="store_true", help="check the table against the step-by-step rules")
+    parser.add_argument("--tenant", help="use a tenant's catalog overlay")
+    args = parser.parse_args(argv)
+
+    from .catalog import get_catalog
+    catalog = get_catalog(args.tenant)
+    table = catalog.decision_table
+    print(f"Reachable signatures: {len(reachable_signatures())}")
+    print(f"Entries: {len(table.workflows)} workflow, {len(table.toolchains)} toolchain, {len(table.tools)} tool")
+    if not args.verify:
+        return 0
+    mismatches = verify(catalog, table)
+    for mismatch in mismatches[:20]:
+        print(f"MISMATCH {mismatch}")
+    print("OK: table matches step-by-step rules" if not mismatches else f"FAIL: {len(mismatches)} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Latency and fault injection for DevTools AI Mock MCP Server
+
+The mock answers instantly, which never exercises client timeout, retry or
+concurrency logic. A fault profile gives each tool a latency distribution,
+an error rate and a stall rate so the server can emulate the real backend.
+Delays use asyncio.sleep, so an injected stall on one session never blocks
+another.
+
+Profiles live in a JSON file holding one or more named profiles:
+
+    {
+      "active": "realistic",
+      "profiles": {
+        "realistic": {
+          "default": {"latency": {"type": "lognormal", "mu": -2.5, "sigma": 0.6}},
+          "tools": {
+            "generate_command": {
+              "latency": {"type": "histogram", "buckets": [[0.1, 70], [0.5, 25], [2.0, 5]]},
+              "error_rate": 0.02,
+              "stall_rate": 0.001,
+              "stall_seconds": 30
+            }
+          }
+        }
+      }
+    }
+
+Latency types are "fixed" (seconds), "normal" (mean, stddev), "lognormal"
+(mu, sigma of the underlying normal, in seconds) and "histogram" (buckets of
+[upper_bound_seconds, count] replayed from recorded timings; samples are
+uniform within the chosen bucket).
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import random
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("devtools-ai-mock-mcp")
+
+LATENCY_TYPES = ("fixed", "normal", "lognormal", "histogram")
+
+
+class InjectedFault(RuntimeError):
+    """Error raised on purpose to emulate a failing backend call."""
+
+
+class LatencyDistribution:
+    """Samples delays in seconds from one configured distribution."""
+
+    def __init__(self, spec: dict):
+        kind = spec.get("type", "fixed")
+        if kind not in LATENCY_TYPES:
+            raise ValueError(f"Unknown latency type: {kind}")
+        self.kind = kind
+        self.spec = spec
+        if kind == "histogram":
+            buckets = sorted(spec["buckets"])
+            if not buckets:
+                raise ValueError("Histogram latency needs at least one bucket")
+            self._bounds = [float(upper) for upper, _ in buckets]
+            self._cumulative: List[float] = []
+            total = 0.0
+            for _, count in buckets:
+                total += float(count)
+                self._cumulative.append(total)
+
+    def sample(self, rng: random.Random) -> float:
+        spec = self.spec
+        if self.kind == "fixed":
+            return float(spec.get("seconds", 0.0))
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(float(spec["mean"]), float(spec.get("stddev", 0.0))))
+        if self.kind == "lognormal":
+            return rng.lognormvariate(float(spec["mu"]), float(spec["sigma"]))
+        index = bisect.bisect_left(self._cumulative, rng.random() * self._cumulative[-1])
+        index = min(index, len(self._bounds) - 1)
+        lower = self._bounds[index - 1] if index else 0.0
+        return rng.uniform(lower, self._bounds[index])
+
+
+class ToolFaults:
+    """Latency, error and stall settings for one tool."""
+
+    def __init__(self, spec: dict):
+        latency = spec.get("latency")
+        self.latency = LatencyDistribution(latency) if latency else None
+        self.error_rate = float(spec.get("error_rate", 0.0))
+        self.stall_rate = float(spec.get("stall_rate", 0.0))
+        self.stall_seconds = float(spec.get("stall_seconds", 30.0))
+
+
+class FaultProfile:
+    """Per-tool fault settings with a default for unlisted tools."""
+
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.default = ToolFaults(spec.get("default", {}))
+        self.tools: Dict[str, ToolFaults] = {
+            tool: ToolFaults(tool_spec) for tool, tool_spec in spec.get("tools", {}).items()
+        }
+
+    def for_tool(self, tool: str) -> ToolFaults:
+        return self.tools.get(tool, self.default)
+
+
+class FaultInjector:
+    """Applies the active fault profile to tool calls."""
+
+    def __init__(self, path: Optional[str] = None, profile: Optional[str] = None,
+                 seed: Optional[int] = None):
+        self.path = path
+        self.rng = random.Random(seed)
+        self.profiles: Dict[str, FaultProfile] = {}
+        self.active: Optional[FaultProfile] = None
+        if path:
+            self.load(path, profile)
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.path)
+
+    def load(self, path: str, profile: Optional[str] = None) -> None:
+        """(Re)load profiles from a file and activate one of them."""
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        # Parse everything before swapping so a bad file leaves the old profiles active
+        try:
+            profiles = {name: FaultProfile(name, spec) for name, spec in data.get("profiles", {}).items()}
+        except KeyError as exc:
+            raise ValueError(f"Missing field {exc} in fault profiles") from exc
+        name = profile or data.get("active")
+        if name not in (None, "", "off") and name not in profiles:
+            raise KeyError(name)
+        self.path = path
+        self.profiles = profiles
+        self.select(name)
+
+    def select(self, name: Optional[str]) -> None:
+        """Switch to a named profile; None or "off" disables injection."""
+        if name in (None, "", "off"):
+            self.active = None
+        elif name not in self.profiles:
+            raise KeyError(name)
+        else:
+            self.active = self.profiles[name]
+        logger.info(f"Fault profile: {self.active.name if self.active else 'off'}")
+
+    async def inject(self, tool: str) -> None:
+        """Delay, stall or fail a call according to the active profile."""
+        profile = self.active
+        if profile is None:
+            return
+        faults = profile.for_tool(tool)
+        roll = self.rng.random()
+        if roll < faults.stall_rate:
+            await asyncio.sleep(faults.stall_seconds)
+        elif faults.latency is not None:
+            await asyncio.sleep(faults.latency.sample(self.rng))
+        if self.rng.random() < faults.error_rate:
+            raise InjectedFault(f"Injected backend error for {tool} (profile {profile.name})")
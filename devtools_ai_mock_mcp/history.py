@@ -0,0 +1,130 @@
+"""
+Bounded session history for DevTools AI Mock MCP Server
+
+Each session keeps only its most recent history entries in memory, in a
+capped ring buffer. When the buffer fills, the oldest half is spilled in one
+batch to a SQLite-backed store shared by all sessions, so long refinement
+conversations cost a bounded amount of process memory. Entries carry an
+absolute sequence number, which makes a page of history addressable by a
+cursor regardless of whether it is still in memory or has been spilled.
+
+By default the store is a private SQLite file in the temp directory, so
+spilled entries live on disk rather than in process memory. Session IDs are
+only unique within a process, so processes never share that file.
+"""
+
+import os
+import sqlite3
+import tempfile
+from collections import deque
+from typing import List, Optional, Tuple
+
+
+class HistorySpillStore:
+    """SQLite store for history entries evicted from in-memory buffers."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        # Temp file created for a store without a path; removed by close()
+        self._temp_path: Optional[str] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # Connect on first spill so idle servers never touch the database
+        if self._conn is None:
+            path = self.path
+            if path is None:
+                fd, path = tempfile.mkstemp(prefix="devtools-ai-mock-history-", suffix=".sqlite3")
+                os.close(fd)
+                self._temp_path = path
+            self._conn = sqlite3.connect(path, isolation_level=None)
+            # Spilled history is scratch data; it need not survive a crash
+            self._conn.execute("PRAGMA journal_mode=MEMORY")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                " session_id TEXT NOT NULL, seq INTEGER NOT NULL, entry TEXT NOT NULL,"
+                " PRIMARY KEY (session_id, seq)) WITHOUT ROWID"
+            )
+        return self._conn
+
+    def spill(self, session_id: str, entries: List[Tuple[int, str]]) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO history (session_id, seq, entry) VALUES (?, ?, ?)",
+            [(session_id, seq, entry) for seq, entry in entries]
+        )
+
+    def load(self, session_id: str, start: int, stop: int) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT entry FROM history WHERE session_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+            (session_id, start, stop)
+        )
+        return [row[0] for row in rows]
+
+    def drop(self, session_id: str) -> None:
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM history WHERE session_id = ?", (session_id,))
+
+    def close(self) -> None:
+        """Close the database, removing it if it was a private temp file."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._temp_path is not None:
+            os.unlink(self._temp_path)
+            self._temp_path = None
+
+
+def render_history(entries: List[str], cursor: int, total: int, next_cursor: Optional[int]) -> str:
+    """Text block for one page of history (an executor stage)."""
+    if not entries:
+        parts = [f"\nHistory: no entries from cursor {cursor} ({total} total)\n"]
+    else:
+        parts = [f"\nHistory (entries {cursor}-{cursor + len(entries) - 1} of {total}):\n"]
+        parts.extend(f"  [{cursor + i}] {entry}\n" for i, entry in enumerate(entries))
+    if next_cursor is not None:
+        parts.append(f"Next cursor: {next_cursor}\n")
+    return "".join(parts)
+
+
+class HistoryBuffer:
+    """Ring buffer of recent entries with overflow spilled to a store."""
+
+    def __init__(self, session_id: str, store: HistorySpillStore, capacity: int):
+        self.session_id = session_id
+        self.store = store
+        self.capacity = max(2, capacity)
+        self.total = 0
+        self._recent: deque = deque()
+
+    @property
+    def first_in_memory(self) -> int:
+        """Sequence number of the oldest entry still held in memory."""
+        return self.total - len(self._recent)
+
+    def append(self, entry: str) -> None:
+        if len(self._recent) >= self.capacity:
+            count = self.capacity // 2
+            start = self.first_in_memory
+            evicted = [(start + i, self._recent.popleft()) for i in range(count)]
+            self.store.spill(self.session_id, evicted)
+        self._recent.append(entry)
+        self.total += 1
+
+    def page(self, cursor: int, limit: int) -> Tuple[List[str], Optional[int]]:
+        """Return entries [cursor, cursor + limit) and the next cursor, if any."""
+        cursor = max(0, cursor)
+        stop = min(self.total, cursor + max(0, limit))
+        if cursor >= stop:
+            return [], None
+        first = self.first_in_memory
+        entries: List[str] = []
+        if cursor < first:
+            entries.extend(self.store.load(self.session_id, cursor, min(stop, first)))
+        for seq in range(max(cursor, first), stop):
+            entries.append(self._recent[seq - first])
+        return entries, stop if stop < self.total else None
+
+    def __len__(self) -> int:
+        return self.total
@@ -0,0 +1,417 @@
+"""
+Shared compiled catalog image for DevTools AI Mock MCP Server
+
+Every server process (one per stdio client, plus any process-pool workers)
+would otherwise hold its own catalog dicts, rendered fragments, decision
+table and variant matrix. When DEVTOOLS_AI_MOCK_CATALOG_IMAGE names a file,
+the catalog is compiled once into that file and every process on the host
+maps it read-only with mmap, so the pages are shared through the OS page
+cache and the memory is paid once per machine.
+
+Layout: an 8-byte magic, an 8-byte header length, a JSON header padded to
+a 64-byte boundary, then 64-byte aligned blocks. The header describes each
+block as an array (offset from the end of the header, dtype, shape). Strings (names, catalog entries as JSON, fragments,
+command templates) live in one UTF-8 blob indexed by an offsets array; index
+arrays refer to strings by id. Arrays are numpy views straight onto the
+mapping, and strings are decoded from it on access, so nothing is copied
+into the process up front.
+
+The image records a digest of the catalog source file, the package version
+and the source of the modules whose output is compiled into it (fragment
+rendering, selection rules, the decision table and variant embeddings), so
+upgrading or editing any of them invalidates old images. A process that finds
+a stale or missing image compiles a new one and atomically renames it into
+place. A hot reload swaps in an ordinary in-process catalog; the next
+process to start picks up the change by recompiling.
+
+Run ``python -m devtools_ai_mock_mcp.image PATH --verify`` to compile an
+image ahead of time and check its decision table against the rules.
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import mmap
+import os
+import sys
+import tempfile
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .decision import (
+    TOOL_BITS, TOOLCHAIN_BITS, UNKNOWN, WORKFLOW_BITS, reachable_signatures, signature
+)
+
+logger = logging.getLogger("devtools-ai-mock-mcp")
+
+MAGIC = b"DTAICAT1"
+# Bump when the layout changes
+FORMAT = 2
+ALIGNMENT = 64
+
+# Modules whose code shapes the compiled contents, hashed into the digest
+COMPILED_FROM = ("catalog.py", "selection.py", "decision.py", "variants.py")
+
+FRAGMENT_SECTIONS = ("workflows", "toolchains", "tools")
+
+
+def _shift(bits: int) -> int:
+    return (bits & -bits).bit_length() - 1
+
+
+def _slices(bits: int) -> int:
+    return (bits >> _shift(bits)) + 1
+
+
+def source_digest(path: str) -> str:
+    """Digest of a catalog source file, the image format and the compiling code."""
+    from . import __version__
+    digest = hashlib.sha256(f"format={FORMAT}\nversion={__version__}\n".encode("utf-8"))
+    package = os.path.dirname(os.path.abspath(__file__))
+    for name in COMPILED_FROM:
+        with open(os.path.join(package, name), "rb") as fh:
+            digest.update(hashlib.sha256(fh.read()).digest())
+    with open(path, "rb") as fh:
+        digest.update(fh.read())
+    return digest.hexdigest()
+
+
+class _Writer:
+    """Accumulates strings and aligned array blocks for an image."""
+
+    def __init__(self):
+        self._strings: Dict[str, int] = {}
+        self._blocks: List[Tuple[str, np.ndarray]] = []
+
+    def string(self, text: str) -> int:
+        index = self._strings.get(text)
+        if index is None:
+            index = self._strings[text] = len(self._strings)
+        return index
+
+    def strings(self, texts) -> np.ndarray:
+        return np.array([self.string(text) for text in texts], dtype=np.int32)
+
+    def array(self, name: str, values: np.ndarray) -> None:
+        self._blocks.append((name, np.ascontiguousarray(values)))
+
+    def write(self, path: str, header: dict) -> None:
+        encoded = [text.encode("utf-8") for text in self._strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+        self.array("string_offsets", offsets)
+        self.array("string_data", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+        # Offsets are relative to the data section, so the header is
+        # serialized once and its size cannot move the blocks
+        arrays, position = {}, 0
+        for name, values in self._blocks:
+            arrays[name] = [position, values.dtype.str, list(values.shape)]
+            position += -(-values.nbytes // ALIGNMENT) * ALIGNMENT
+        body = json.dumps(dict(header, arrays=arrays), separators=(",", ":")).encode("utf-8")
+        start = -(-(16 + len(body)) // ALIGNMENT) * ALIGNMENT
+        assert len(body) <= start - 16
+        body = body.ljust(start - 16)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".catalog-image-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(MAGIC + len(body).to_bytes(8, "little") + body)
+                for name, values in self._blocks:
+                    data = values.tobytes()
+                    fh.write(data + b"\0" * (-len(data) % ALIGNMENT))
+            # Concurrent compilers race harmlessly: each rename is atomic
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def compile_image(catalog, path: str, digest: str) -> None:
+    """Compile a base catalog and its derived indexes into an image file."""
+    from .catalog import SECTIONS
+    writer = _Writer()
+    header = {"format": FORMAT, "digest": digest, "sections": list(SECTIONS)}
+
+    positions = {}
+    for section in SECTIONS:
+        names = list(getattr(catalog, section))
+        positions[section] = {name: i for i, name in enumerate(names)}
+        writer.array(f"{section}.names", writer.strings(names))
+        writer.array(f"{section}.sorted", np.array(sorted(range(len(names)), key=names.__getitem__), dtype=np.int32))
+        writer.array(f"{section}.entries", writer.strings(
+            json.dumps(getattr(catalog, section)[name], separators=(",", ":")) for name in names
+        ))
+    for section in FRAGMENT_SECTIONS:
+        render = getattr(catalog, f"{section[:-1]}_fragment")
+        writer.array(f"{section}.fragments", writer.strings(render(name) for name in getattr(catalog, section)))
+
+    # Rows are indexed by catalog position + 1 (row 0 is UNKNOWN) and columns
+    # by signature slice; -1 marks slices no question can produce
+    table = catalog.decision_table
+    workflows = np.full(_slices(WORKFLOW_BITS), -1, dtype=np.int32)
+    for mask, name in table.workflows.items():
+        workflows[mask] = writer.string(name)
+    writer.array("decision.workflows", workflows)
+    for stage, refined, bits, parents in (("toolchains", table.toolchains, TOOLCHAIN_BITS, catalog.workflows),
+                                          ("tools", table.tools, TOOL_BITS, catalog.toolchains)):
+        rows = {name: row for row, name in enumerate([UNKNOWN, *parents])}
+        values = np.full((len(rows), _slices(bits)), -1, dtype=np.int32)
+        for (name, mask), selected in refined.items():
+            values[rows[name], mask >> _shift(bits)] = writer.string(selected)
+        writer.array(f"decision.{stage}", values)
+    reachable = reachable_signatures()
+    chains = np.full((max(reachable) + 1, 3), -1, dtype=np.int32)
+    for mask in reachable:
+        chains[mask] = writer.strings(table.chains[mask])
+    writer.array("decision.chains", chains)
+
+    index = catalog.variant_index
+    tools = list(index.spans)
+    writer.array("variants.tools", writer.strings(tools))
+    writer.array("variants.sorted", np.array(sorted(range(len(tools)), key=tools.__getitem__), dtype=np.int32))
+    writer.array("variants.spans", np.array([index.spans[tool] for tool in tools], dtype=np.int64).reshape(-1, 2))
+    candidates = [candidate for tool in tools for candidate in index.candidates[tool]]
+    writer.array("variants.labels", writer.strings(label for label, _ in candidates))
+    writer.array("variants.commands", writer.strings(command for _, command in candidates))
+    writer.array("variants.matrix", index.matrix)
+
+    writer.write(path, header)
+
+
+class CatalogImage:
+    """Read-only mapping of a compiled catalog image."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:8] != MAGIC:
+            raise ValueError(f"{path} is not a catalog image")
+        length = int.from_bytes(self._map[8:16], "little")
+        self.header = json.loads(bytes(self._map[16:16 + length]))
+        if self.header.get("format") != FORMAT:
+            raise ValueError(f"{path} has image format {self.header.get('format')}, expected {FORMAT}")
+        self.digest = self.header["digest"]
+        # Block offsets count from the end of the padded header
+        self._start = 16 + length
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._offsets = self.array("string_offsets")
+        self._data = memoryview(self._map)
+
+    def array(self, name: str) -> np.ndarray:
+        """Zero-copy, read-only numpy view of an array block."""
+        view = self._arrays.get(name)
+        if view is None:
+            offset, dtype, shape = self.header["arrays"][name]
+            count = int(np.prod(shape)) if shape else 1
+            view = np.frombuffer(self._map, dtype=np.dtype(dtype), count=count, offset=self._start + offset).reshape(shape)
+            self._arrays[name] = view
+        return view
+
+    def string(self, index: int) -> str:
+        """Decode one string from the shared string table."""
+        base = self._start + self.header["arrays"]["string_data"][0]
+        start, stop = int(self._offsets[index]), int(self._offsets[index + 1])
+        return str(self._data[base + start:base + stop], "utf-8")
+
+    def names(self, ids: str, order: str) -> "ImageNames":
+        return ImageNames(self, self.array(ids), self.array(order))
+
+
+class ImageNames:
+    """Names of one section in catalog order, with binary-search lookup."""
+
+    def __init__(self, image: CatalogImage, ids: np.ndarray, order: np.ndarray):
+        self.image = image
+        self.ids = ids
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, position: int) -> str:
+        return self.image.string(int(self.ids[position]))
+
+    def position(self, name: str) -> Optional[int]:
+        """Catalog-order position of a name, or None."""
+        sorted_names = _SortedView(self)
+        i = bisect.bisect_left(sorted_names, name)
+        if i < len(self) and sorted_names[i] == name:
+            return int(self.order[i])
+        return None
+
+
+class _SortedView:
+    def __init__(self, names: ImageNames):
+        self.names = names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, i: int) -> str:
+        return self.names[int(self.names.order[i])]
+
+
+class ImageSection(Mapping):
+    """One catalog section; entries are decoded from the image on access."""
+
+    def __init__(self, image: CatalogImage, section: str):
+        self.image = image
+        self.section = section
+        self.names = image.names(f"{section}.names", f"{section}.sorted")
+        self._entries = image.array(f"{section}.entries")
+
+    def __getitem__(self, name: str):
+        position = self.names.position(name)
+        if position is None:
+            raise KeyError(name)
+        return json.loads(self.image.string(int(self._entries[position])))
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and self.names.position(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.names[i] for i in range(len(self.names)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def fragment(self, name: str) -> Optional[str]:
+        position = self.names.position(name)
+        if position is None:
+            return None
+        return self.image.string(int(self.image.array(f"{self.section}.fragments")[position]))
+
+
+class MappedDecisionTable:
+    """DecisionTable lookups answered from image arrays."""
+
+    def __init__(self, image: CatalogImage):
+        self.image = image
+        self._workflow_names = image.names("workflows.names", "workflows.sorted")
+        self._toolchain_names = image.names("toolchains.names", "toolchains.sorted")
+        self._workflows = image.array("decision.workflows")
+        self._toolchains = image.array("decision.toolchains")
+        self._tools = image.array("decision.tools")
+        self._chains = image.array("decision.chains")
+
+    def _string(self, index, key) -> str:
+        if index < 0:
+            raise KeyError(key)
+        return self.image.string(int(index))
+
+    def workflow(self, mask: int) -> str:
+        return self._string(self._workflows[mask & WORKFLOW_BITS], mask)
+
+    def toolchain(self, workflow: str, mask: int) -> str:
+        position = self._workflow_names.position(workflow)
+        row = 0 if position is None else position + 1
+        return self._string(self._toolchains[row, (mask & TOOLCHAIN_BITS) >> _shift(TOOLCHAIN_BITS)], mask)
+
+    def tool(self, toolchain: str, mask: int) -> str:
+        position = self._toolchain_names.position(toolchain)
+        row = 0 if position is None else position + 1
+        return self._string(self._tools[row, (mask & TOOL_BITS) >> _shift(TOOL_BITS)], mask)
+
+    def pipeline(self, question: str) -> Tuple[str, str, str]:
+        """Resolve workflow, toolchain and tool with one extraction and one lookup."""
+        mask = signature(question)
+        return tuple(self._string(index, mask) for index in self._chains[mask])
+
+
+class _ImageSpans(Mapping):
+    def __init__(self, image: CatalogImage):
+        self.names = image.names("variants.tools", "variants.sorted")
+        self._spans = image.array("variants.spans")
+
+    def __getitem__(self, tool: str) -> Tuple[int, int]:
+        position = self.names.position(tool)
+        if position is None:
+            raise KeyError(tool)
+        start, stop = self._spans[position]
+        return int(start), int(stop)
+
+    def __contains__(self, tool) -> bool:
+        return isinstance(tool, str) and self.names.position(tool) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.names[i] for i in range(len(self.names)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class _ImageCandidates(Mapping):
+    def __init__(self, image: CatalogImage, spans: _ImageSpans):
+        self.image = image
+        self.spans = spans
+        self._labels = image.array("variants.labels")
+        self._commands = image.array("variants.commands")
+
+    def __getitem__(self, tool: str) -> List[Tuple[str, str]]:
+        start, stop = self.spans[tool]
+        return [(self.image.string(int(self._labels[i])), self.image.string(int(self._commands[i])))
+                for i in range(start, stop)]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.spans)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+
+def mapped_variant_index(image: CatalogImage):
+    """VariantIndex whose matrix, spans and candidates live in the image."""
+    from .variants import VariantIndex
+    spans = _ImageSpans(image)
+    return VariantIndex(image.array("variants.matrix"), spans, _ImageCandidates(image, spans))
+
+
+def open_image(path: str, source_path: str):
+    """Map the image at path, compiling it first if missing or stale."""
+    from .catalog import Catalog, SECTIONS, load_catalog_source, validate_sections
+    digest = source_digest(source_path)
+    image = None
+    if os.path.exists(path):
+        try:
+            image = CatalogImage(path)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning(f"Ignoring unreadable catalog image {path}: {exc}")
+    if image is None or image.digest != digest:
+        sections = load_catalog_source(source_path)
+        validate_sections(sections)
+        compile_image(Catalog(*(sections[section] for section in SECTIONS)), path, digest)
+        logger.info(f"Compiled catalog image {path}")
+        image = CatalogImage(path)
+    return image
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compile or inspect the shared catalog image")
+    parser.add_argument("path", help="image file to create or refresh")
+    parser.add_argument("--verify", action="store_true", help="check the mapped decision table against the step-by-step rules")
+    args = parser.parse_args(argv)
+
+    from .catalog import Catalog, catalog_source_path
+    from .decision import verify
+    image = open_image(args.path, catalog_source_path())
+    catalog = Catalog.from_image(image)
+    print(f"Image: {args.path} ({os.path.getsize(args.path)} bytes, digest {image.digest[:12]})")
+    print(f"Entries: {', '.join(f'{len(getattr(catalog, section))} {section}' for section in image.header['sections'])}")
+    if not args.verify:
+        return 0
+    mismatches = verify(catalog, catalog.decision_table)
+    for mismatch in mismatches[:20]:
+        print(f"MISMATCH {mismatch}")
+    print("OK: mapped table matches step-by-step rules" if not mismatches else f"FAIL: {len(mismatches)} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -401,6 +401,312 @@ TOOLS = {
             "mw_test_report --format html",
             "mw_test_report --output reports/"
         ]
+    },
+    "mw_lint": {
+        "description": "Check MATLAB code for style and correctness issues",
+        "usage": "mw_lint [path] [options]",
+        "doc_url": "https://example.com/help/mw_lint",
+        "examples": [
+            "mw_lint",
+            "mw_lint src/ --fix"
+        ]
+    },
+    "mw_quality_check": {
+        "description": "Run code quality gates on a project",
+        "usage": "mw_quality_check [options]",
+        "doc_url": "https://example.com/help/mw_quality_check",
+        "examples": [
+            "mw_quality_check",
+            "mw_quality_check --strict"
+        ]
+    },
+    "mw_code_review": {
+        "description": "Prepare changes for code review",
+        "usage": "mw_code_review [options]",
+        "doc_url": "https://example.com/help/mw_code_review",
+        "examples": [
+            "mw_code_review",
+            "mw_code_review --against main"
+        ]
+    },
+    "mw_matlab_test": {
+        "description": "Run MATLAB unit test suites",
+        "usage": "mw_matlab_test [test_suite] [options]",
+        "doc_url": "https://example.com/help/mw_matlab_test",
+        "examples": [
+            "mw_matlab_test",
+            "mw_matlab_test --suite unit"
+        ]
+    },
+    "mw_simulink_test": {
+        "description": "Run Simulink model tests",
+        "usage": "mw_simulink_test [model] [options]",
+        "doc_url": "https://example.com/help/mw_simulink_test",
+        "examples": [
+            "mw_simulink_test",
+            "mw_simulink_test --model controller"
+        ]
+    },
+    "mw_test_coverage": {
+        "description": "Measure test coverage",
+        "usage": "mw_test_coverage [options]",
+        "doc_url": "https://example.com/help/mw_test_coverage",
+        "examples": [
+            "mw_test_coverage",
+            "mw_test_coverage --format html"
+        ]
+    },
+    "mw_test_harness": {
+        "description": "Create and run test harnesses",
+        "usage": "mw_test_harness [model] [options]",
+        "doc_url": "https://example.com/help/mw_test_harness",
+        "examples": [
+            "mw_test_harness",
+            "mw_test_harness --create controller"
+        ]
+    },
+    "mw_distribute": {
+        "description": "Distribute build artifacts to targets",
+        "usage": "mw_distribute [target] [options]",
+        "doc_url": "https://example.com/help/mw_distribute",
+        "examples": [
+            "mw_distribute",
+            "mw_distribute --target mirror"
+        ]
+    },
+    "mw_publish": {
+        "description": "Publish packages and artifacts",
+        "usage": "mw_publish [artifact] [options]",
+        "doc_url": "https://example.com/help/mw_publish",
+        "examples": [
+            "mw_publish",
+            "mw_publish --channel stable"
+        ]
+    },
+    "mw_stage": {
+        "description": "Stage a build for deployment",
+        "usage": "mw_stage [environment] [options]",
+        "doc_url": "https://example.com/help/mw_stage",
+        "examples": [
+            "mw_stage",
+            "mw_stage staging"
+        ]
+    },
+    "mw_release": {
+        "description": "Create and manage releases",
+        "usage": "mw_release [version] [options]",
+        "doc_url": "https://example.com/help/mw_release",
+        "examples": [
+            "mw_release",
+            "mw_release --notes"
+        ]
+    },
+    "mw_version": {
+        "description": "Show or bump the project version",
+        "usage": "mw_version [options]",
+        "doc_url": "https://example.com/help/mw_version",
+        "examples": [
+            "mw_version",
+            "mw_version --bump minor"
+        ]
+    },
+    "mw_tag": {
+        "description": "Tag a release in source control",
+        "usage": "mw_tag [name] [options]",
+        "doc_url": "https://example.com/help/mw_tag",
+        "examples": [
+            "mw_tag",
+            "mw_tag --push"
+        ]
+    },
+    "mw_package_release": {
+        "description": "Package a release for distribution",
+        "usage": "mw_package_release [options]",
+        "doc_url": "https://example.com/help/mw_package_release",
+        "examples": [
+            "mw_package_release",
+            "mw_package_release --format zip"
+        ]
+    },
+    "mw_create_package": {
+        "description": "Create a new package",
+        "usage": "mw_create_package [name] [options]",
+        "doc_url": "https://example.com/help/mw_create_package",
+        "examples": [
+            "mw_create_package",
+            "mw_create_package --template toolbox"
+        ]
+    },
+    "mw_install_package": {
+        "description": "Install a package",
+        "usage": "mw_install_package [package] [options]",
+        "doc_url": "https://example.com/help/mw_install_package",
+        "examples": [
+            "mw_install_package",
+            "mw_install_package --all"
+        ]
+    },
+    "mw_update_package": {
+        "description": "Update installed packages",
+        "usage": "mw_update_package [package] [options]",
+        "doc_url": "https://example.com/help/mw_update_package",
+        "examples": [
+            "mw_update_package",
+            "mw_update_package --all"
+        ]
+    },
+    "mw_list_packages": {
+        "description": "List installed packages",
+        "usage": "mw_list_packages [options]",
+        "doc_url": "https://example.com/help/mw_list_packages",
+        "examples": [
+            "mw_list_packages",
+            "mw_list_packages --outdated"
+        ]
+    },
+    "mw_debug": {
+        "description": "Start a debugging session",
+        "usage": "mw_debug [target] [options]",
+        "doc_url": "https://example.com/help/mw_debug",
+        "examples": [
+            "mw_debug",
+            "mw_debug --stop-on-error"
+        ]
+    },
+    "mw_trace": {
+        "description": "Trace function calls during execution",
+        "usage": "mw_trace [target] [options]",
+        "doc_url": "https://example.com/help/mw_trace",
+        "examples": [
+            "mw_trace",
+            "mw_trace --depth 3"
+        ]
+    },
+    "mw_breakpoint": {
+        "description": "Manage breakpoints",
+        "usage": "mw_breakpoint [location] [options]",
+        "doc_url": "https://example.com/help/mw_breakpoint",
+        "examples": [
+            "mw_breakpoint --list",
+            "mw_breakpoint --clear-all"
+        ]
+    },
+    "mw_inspect": {
+        "description": "Inspect variables and workspace state",
+        "usage": "mw_inspect [variable] [options]",
+        "doc_url": "https://example.com/help/mw_inspect",
+        "examples": [
+            "mw_inspect",
+            "mw_inspect --workspace"
+        ]
+    },
+    "mw_metrics": {
+        "description": "Report code metrics",
+        "usage": "mw_metrics [path] [options]",
+        "doc_url": "https://example.com/help/mw_metrics",
+        "examples": [
+            "mw_metrics",
+            "mw_metrics --complexity"
+        ]
+    },
+    "mw_dependency_check": {
+        "description": "Check project dependencies",
+        "usage": "mw_dependency_check [options]",
+        "doc_url": "https://example.com/help/mw_dependency_check",
+        "examples": [
+            "mw_dependency_check",
+            "mw_dependency_check --missing"
+        ]
+    },
+    "mw_benchmark": {
+        "description": "Run performance benchmarks",
+        "usage": "mw_benchmark [suite] [options]",
+        "doc_url": "https://example.com/help/mw_benchmark",
+        "examples": [
+            "mw_benchmark",
+            "mw_benchmark --iterations 10"
+        ]
+    },
+    "mw_memory_check": {
+        "description": "Check memory usage and leaks",
+        "usage": "mw_memory_check [target] [options]",
+        "doc_url": "https://example.com/help/mw_memory_check",
+        "examples": [
+            "mw_memory_check",
+            "mw_memory_check --leaks"
+        ]
+    },
+    "mw_performance_test": {
+        "description": "Run performance regression tests",
+        "usage": "mw_performance_test [options]",
+        "doc_url": "https://example.com/help/mw_performance_test",
+        "examples": [
+            "mw_performance_test",
+            "mw_performance_test --baseline main"
+        ]
+    },
+    "mw_info": {
+        "description": "Show environment and project information",
+        "usage": "mw_info [options]",
+        "doc_url": "https://example.com/help/mw_info",
+        "examples": [
+            "mw_info",
+            "mw_info --verbose"
+        ]
+    },
+    "mw_clean": {
+        "description": "Remove build outputs and caches",
+        "usage": "mw_clean [options]",
+        "doc_url": "https://example.com/help/mw_clean",
+        "examples": [
+            "mw_clean",
+            "mw_clean --all"
+        ]
+    },
+    "mw_utilities": {
+        "description": "Miscellaneous development utilities",
+        "usage": "mw_utilities [command] [options]",
+        "doc_url": "https://example.com/help/mw_utilities",
+        "examples": [
+            "mw_utilities",
+            "mw_utilities --list"
+        ]
+    },
+    "mw_doc_gen": {
+        "description": "Generate project documentation",
+        "usage": "mw_doc_gen [options]",
+        "doc_url": "https://example.com/help/mw_doc_gen",
+        "examples": [
+            "mw_doc_gen",
+            "mw_doc_gen --format html"
+        ]
+    },
+    "mw_help_gen": {
+        "description": "Generate help text from source comments",
+        "usage": "mw_help_gen [path] [options]",
+        "doc_url": "https://example.com/help/mw_help_gen",
+        "examples": [
+            "mw_help_gen",
+            "mw_help_gen src/"
+        ]
+    },
+    "mw_api_doc": {
+        "description": "Generate API reference documentation",
+        "usage": "mw_api_doc [options]",
+        "doc_url": "https://example.com/help/mw_api_doc",
+        "examples": [
+            "mw_api_doc",
+            "mw_api_doc --output docs/api"
+        ]
+    },
+    "mw_user_guide": {
+        "description": "Build the user guide",
+        "usage": "mw_user_guide [options]",
+        "doc_url": "https://example.com/help/mw_user_guide",
+        "examples": [
+            "mw_user_guide",
+            "mw_user_guide --format pdf"
+        ]
     }
 }
 
@@ -0,0 +1,185 @@
+"""
+Executor offload for DevTools AI Mock MCP Server
+
+Handlers run on the asyncio loop, so one CPU-heavy call (a very long
+question to classify, a large catalog to rank, a big history page to render)
+stalls every other client. Handlers route such stages through a
+StageExecutor, which runs them inline when the input is small and otherwise
+hands them to a thread pool or a process pool.
+
+Process workers load the catalog and its derived indexes once, when they
+start, instead of receiving it with every task. Each task carries the
+catalog version, the tenant and that tenant's diff (small, and possibly
+added with register_tenant() after the worker started). A worker that is
+behind a hot reload reloads and validates the source before running the
+task. If the source no longer validates, the stage runs inline on the
+server's catalog instead.
+
+Time spent waiting for a worker and time spent executing are recorded
+separately per stage. Each stage is a deadline checkpoint, and the wait for
+an offloaded stage is cut short when the call's deadline passes (the worker
+finishes the task, but its result is discarded).
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .deadline import bounded, checkpoint
+from .tracing import span
+
+logger = logging.getLogger("devtools-ai-mock-mcp")
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+
+class StageStats:
+    """Call counts and queue-wait/execution timings for one stage."""
+
+    def __init__(self):
+        self.calls = 0
+        self.offloaded = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.exec_total = 0.0
+        self.exec_max = 0.0
+
+    def record(self, wait: float, execution: float, offloaded: bool) -> None:
+        self.calls += 1
+        self.offloaded += offloaded
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        self.exec_total += execution
+        self.exec_max = max(self.exec_max, execution)
+
+    def summary(self) -> Dict[str, Any]:
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "offloaded": self.offloaded,
+            "queue_wait_ms": {"mean": round(self.wait_total / calls * 1000, 3), "max": round(self.wait_max * 1000, 3)},
+            "execution_ms": {"mean": round(self.exec_total / calls * 1000, 3), "max": round(self.exec_max * 1000, 3)},
+        }
+
+
+def _timed(func: Callable, args: tuple):
+    # time.monotonic is system-wide, so worker timestamps compare with the loop's
+    started = time.monotonic()
+    result = func(*args)
+    return result, started, time.monotonic()
+
+
+def _init_worker() -> None:
+    """Process pool initializer: load the catalog and its indexes up front."""
+    from .catalog import get_catalog
+    catalog = get_catalog()
+    catalog.decision_table
+    catalog.variant_index
+
+
+class WorkerCatalogError(Exception):
+    """Raised in a worker that cannot rebuild the catalog version a task needs."""
+
+
+def _worker_catalog(tenant: Optional[str], diff: Optional[dict], version: int):
+    from .catalog import (
+        catalog_source_path, diff_sections, get_catalog, load_catalog_source,
+        register_tenant, set_catalog, tenant_diff, validate_sections
+    )
+    base = get_catalog()
+    if version > base.version:
+        # The server hot-reloaded since this worker started; catch up
+        try:
+            sections = load_catalog_source(catalog_source_path())
+            validate_sections(sections)
+        except Exception as exc:
+            raise WorkerCatalogError(f"Cannot load catalog version {version}: {exc}") from None
+        rebuilt = base.rebuilt(sections, diff_sections(base, sections))
+        rebuilt.version = version
+        set_catalog(rebuilt)
+    if tenant and tenant_diff(tenant) != diff:
+        register_tenant(tenant, diff)
+    return get_catalog(tenant)
+
+
+def _in_worker(func: Callable, tenant: Optional[str], diff: Optional[dict], version: int, args: tuple):
+    return _timed(func, (_worker_catalog(tenant, diff, version), *args))
+
+
+class StageExecutor:
+    """Runs CPU-bound handler stages inline or on a worker pool."""
+
+    def __init__(self, mode: str = "inline", workers: int = 0, min_size: int = 4096):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode: {mode}")
+        self.mode = mode
+        self.workers = workers or None
+        self.min_size = min_size
+        self.stages: Dict[str, StageStats] = {}
+        self._pool: Optional[Executor] = None
+
+    @property
+    def pool(self) -> Executor:
+        # Created on first offload so inline-only servers never start workers
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="devtools-stage")
+        return self._pool
+
+    async def run(self, stage: str, func: Callable, *args, size: int = 0,
+                  catalog=None, tenant: Optional[str] = None) -> Any:
+        """Run func(*args), or func(catalog, *args) when a catalog is given.
+
+        Inputs smaller than min_size run inline. Offloaded calls to a process
+        pool resolve the catalog in the worker from tenant and version.
+        """
+        checkpoint(stage)
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats()
+        call_args = args if catalog is None else (catalog, *args)
+
+        with span(stage, size=size) as stage_span:
+            if self.mode == "inline" or size < self.min_size:
+                result, started, finished = _timed(func, call_args)
+                stats.record(0.0, finished - started, offloaded=False)
+                stage_span.set_attribute("offloaded", False)
+                return result
+
+            loop = asyncio.get_running_loop()
+            submitted = time.monotonic()
+            if self.mode == "process" and catalog is not None:
+                from .catalog import tenant_diff
+                diff = tenant_diff(tenant) if tenant else None
+                task = (_in_worker, func, tenant, diff, catalog.root.version, args)
+            else:
+                task = (_timed, func, call_args)
+            try:
+                result, started, finished = await bounded(loop.run_in_executor(self.pool, *task), stage)
+            except WorkerCatalogError as exc:
+                logger.warning(f"Running stage {stage} inline: {exc}")
+                result, started, finished = _timed(func, call_args)
+                stats.record(0.0, finished - started, offloaded=False)
+                stage_span.set_attribute("offloaded", False)
+                return result
+            wait = max(0.0, started - submitted)
+            stats.record(wait, finished - started, offloaded=True)
+            stage_span.set_attribute("offloaded", True)
+            stage_span.set_attribute("queue_wait_ms", round(wait * 1000, 3))
+            return result
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "min_size": self.min_size,
+            "stages": {stage: stats.summary() for stage, stats in sorted(self.stages.items())},
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
@@ -0,0 +1,324 @@
+"""
+Record/replay proxy mode for DevTools AI Mock MCP Server
+
+Instead of answering from mock_data.py, the server can sit in front of a
+real dev-tools-ai backend: tool calls are forwarded upstream, each
+request/response pair is appended to a compact on-disk store, and repeat
+calls are answered from that store without touching the backend. Pointing
+the proxy at a store with no upstream turns recorded traffic into a fast,
+deterministic mock.
+
+Upstream protocol: POST {upstream}/tools/{tool_name} with the tool
+arguments as a JSON body; the reply is {"content": [{"type": "text",
+"text": ...}]} and may carry "session_id" for initiate_session (otherwise
+it is read from a "Session ID: ..." line).
+
+Sessions stay local. A proxy session records its question and, once a call
+actually has to go upstream, the backend's session ID. Cache keys use the
+session's question instead of the session ID, so a recording replays for
+any session that asks the same thing, and backend session IDs in recorded
+text are swapped for the local ID. With "normalized" matching, questions
+and user responses are case-folded with punctuation and extra whitespace
+removed before keying.
+
+Replies depend on how far the session has got, so each key also includes a
+running hash of the session's earlier state-changing calls. A replayed
+session keeps the list of those calls. When it first misses, the calls are
+sent upstream before the missed one, so the backend session reaches the
+same state. Error replies are passed through but never recorded. Calls on
+one session take the session's lock, so concurrent misses open a single
+backend session and replay each earlier call to it once. A session whose
+command is approved is released, as local sessions are.
+
+Recordings are appended to the store file in the default executor, so disk
+writes never block the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger("devtools-ai-mock-mcp")
+
+MATCH_MODES = ("exact", "normalized")
+
+SESSION_PLACEHOLDER = "\x00session_id\x00"
+
+_SESSION_ID_LINE = re.compile(r"Session ID: (\S+)")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+# Tools answered by the proxy; anything else is handled locally
+PROXIED_TOOLS = frozenset({
+    "initiate_session",
+    "get_workflow",
+    "get_toolchain",
+    "get_tool",
+    "generate_command",
+    "confirm_command",
+    "get_session_status",
+})
+
+# Proxied tools that read session state without changing it
+READ_ONLY_TOOLS = frozenset({"get_session_status"})
+
+# Start of a confirm_command reply that finishes the session
+APPROVED_PREFIX = "Command approved"
+
+# Free-text arguments that normalized matching folds
+FREE_TEXT_ARGUMENTS = ("question", "user_response")
+
+
+class ProxyError(RuntimeError):
+    """Raised when a call can be neither replayed nor forwarded."""
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold and strip punctuation and redundant whitespace."""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", text.casefold())).strip()
+
+
+class RecordingStore:
+    """Append-only JSON-lines file of recorded responses keyed by hash.
+
+    put() records in memory at once and queues the line; flush() appends
+    queued lines to the file off the event loop, one flush at a time.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._entries: Dict[str, str] = {}
+        self._pending: List[str] = []
+        self._flush_lock: Optional[asyncio.Lock] = None
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._entries[record["k"]] = record["t"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._entries.get(key)
+
+    def put(self, key: str, tool: str, text: str) -> None:
+        if key in self._entries:
+            return
+        self._entries[key] = text
+        if self.path:
+            self._pending.append(json.dumps({"k": key, "tool": tool, "t": text}, separators=(",", ":")) + "\n")
+
+    async def flush(self) -> None:
+        """Append queued recordings to the store file."""
+        if not self._pending:
+            return
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            lines, self._pending = self._pending, []
+            if lines:
+                await asyncio.get_running_loop().run_in_executor(None, self._append, lines)
+
+    def _append(self, lines: List[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write("".join(lines))
+
+
+class RecordReplayProxy:
+    """Forwards tool calls upstream, recording and replaying responses."""
+
+    def __init__(self, sessions: Dict[str, dict], new_session_id: Callable[[], str],
+                 upstream: Optional[str], store_path: Optional[str],
+                 match: str = "normalized", max_connections: int = 10,
+                 timeout: float = 30.0,
+                 on_session_created: Optional[Callable[[str], None]] = None,
+                 on_session_finished: Optional[Callable[[str], None]] = None):
+        if match not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {match}")
+        self.sessions = sessions
+        self.new_session_id = new_session_id
+        self.on_session_created = on_session_created
+        self.on_session_finished = on_session_finished
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.store = RecordingStore(store_path)
+        self.match = match
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._client = None
+
+    @property
+    def client(self):
+        # Created on first forward; keeps connections to the upstream alive
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                base_url=self.upstream,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        await self.store.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def cache_key(self, name: str, arguments: dict, question: str, state: str = "") -> str:
+        """Hash a call by tool, session question, session state and remaining arguments."""
+        normalized = self.match == "normalized"
+        keyed = {}
+        for key, value in arguments.items():
+            if key == "session_id":
+                continue
+            if normalized and key in FREE_TEXT_ARGUMENTS and isinstance(value, str):
+                value = normalize_text(value)
+            keyed[key] = value
+        context = normalize_text(question) if normalized else question
+        payload = json.dumps([name, context, keyed, state], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    async def call(self, name: str, arguments: dict) -> List[str]:
+        """Answer a tool call from the recording store or the upstream."""
+        if name == "initiate_session":
+            return [await self._initiate_session(arguments)]
+
+        session_id = arguments.get("session_id", "")
+        session = self.sessions.get(session_id)
+        if session is None:
+            return ["Error: Invalid session ID"]
+
+        async with session["lock"]:
+            key = self.cache_key(name, arguments, session["question"], session["state"])
+            recorded = self.store.get(key)
+            if recorded is not None:
+                self.hits += 1
+                self._advance(session, name, arguments, key)
+            else:
+                self.misses += 1
+                await self._sync(session)
+                upstream_id = session["upstream_id"]
+                reply = await self._forward(name, dict(arguments, session_id=upstream_id))
+                recorded = self._mask_session(self._reply_text(reply), upstream_id)
+                if recorded.startswith("Error:"):
+                    return [recorded.replace(SESSION_PLACEHOLDER, session_id)]
+                self.store.put(key, name, recorded)
+                self._advance(session, name, arguments, key)
+                # The backend session has seen this call as well
+                session["synced"] = len(session["calls"])
+            if name == "confirm_command" and recorded.startswith(APPROVED_PREFIX):
+                self._finish(session_id)
+        await self.store.flush()
+        return [recorded.replace(SESSION_PLACEHOLDER, session_id)]
+
+    def _advance(self, session: dict, name: str, arguments: dict, key: str) -> None:
+        """Fold a completed state-changing call into the session's key state."""
+        if name in READ_ONLY_TOOLS:
+            return
+        session["calls"].append((name, {k: v for k, v in arguments.items() if k != "session_id"}))
+        session["state"] = hashlib.blake2b(f"{session['state']}:{key}".encode("utf-8"), digest_size=16).hexdigest()
+
+    async def _sync(self, session: dict) -> None:
+        """Bring the backend session to the state the local session replayed to."""
+        if session["upstream_id"] is None:
+            # Replayed sessions only get a backend session once they need one
+            reply = await self._forward("initiate_session", self._initiate_arguments(session))
+            session["upstream_id"] = self._upstream_session_id(reply)
+        # Count each call as it lands, so an interrupted sync resumes after it
+        while session["synced"] < len(session["calls"]):
+            name, arguments = session["calls"][session["synced"]]
+            await self._forward(name, dict(arguments, session_id=session["upstream_id"]))
+            session["synced"] += 1
+
+    async def _initiate_session(self, arguments: dict) -> str:
+        question = arguments.get("question", "")
+        session_id = self.new_session_id()
+        session = {
+            "question": question,
+            "tenant": arguments.get("tenant"),
+            "upstream_id": None,
+            # State-changing calls so far, how many the backend has seen, and their key hash
+            "calls": [],
+            "synced": 0,
+            "state": "",
+            "lock": asyncio.Lock()
+        }
+
+        key = self.cache_key("initiate_session", arguments, question)
+        recorded = self.store.get(key)
+        if recorded is not None:
+            self.hits += 1
+            self._add_session(session_id, session)
+            return recorded.replace(SESSION_PLACEHOLDER, session_id)
+
+        self.misses += 1
+        reply = await self._forward("initiate_session", self._initiate_arguments(session))
+        text = self._reply_text(reply)
+        if text.startswith("Error:"):
+            return text
+        upstream_id = self._upstream_session_id(reply)
+        session["upstream_id"] = upstream_id
+        self._add_session(session_id, session)
+        masked = self._mask_session(text, upstream_id)
+        self.store.put(key, "initiate_session", masked)
+        await self.store.flush()
+        return masked.replace(SESSION_PLACEHOLDER, session_id)
+
+    def _add_session(self, session_id: str, session: dict) -> None:
+        self.sessions[session_id] = session
+        if self.on_session_created is not None:
+            self.on_session_created(session_id)
+
+    def _finish(self, session_id: str) -> None:
+        if self.on_session_finished is not None:
+            self.on_session_finished(session_id)
+        else:
+            self.sessions.pop(session_id, None)
+
+    def _initiate_arguments(self, session: dict) -> dict:
+        arguments = {"question": session["question"]}
+        if session.get("tenant"):
+            arguments["tenant"] = session["tenant"]
+        return arguments
+
+    async def _forward(self, name: str, arguments: dict) -> dict:
+        if not self.upstream:
+            raise ProxyError(f"No recorded response for {name} and no upstream configured")
+        import httpx
+        try:
+            response = await self.client.post(f"/tools/{name}", json=arguments)
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            raise ProxyError(f"Upstream call {name} failed: {exc}") from exc
+
+    @staticmethod
+    def _reply_text(reply: dict) -> str:
+        return "".join(
+            item.get("text", "") for item in reply.get("content", []) if item.get("type") == "text"
+        )
+
+    def _upstream_session_id(self, reply: dict) -> str:
+        session_id = reply.get("session_id")
+        if not session_id:
+            match = _SESSION_ID_LINE.search(self._reply_text(reply))
+            if match is None:
+                raise ProxyError("Upstream initiate_session reply carried no session ID")
+            session_id = match.group(1)
+        return session_id
+
+    @staticmethod
+    def _mask_session(text: str, upstream_id: str) -> str:
+        pattern = r"(?<!\w)" + re.escape(upstream_id) + r"(?!\w)"
+        return re.sub(pattern, lambda _: SESSION_PLACEHOLDER, text)
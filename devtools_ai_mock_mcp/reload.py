@@ -0,0 +1,87 @@
+"""
+Hot catalog reload for DevTools AI Mock MCP Server
+
+Changing a tool or template used to mean editing mock_data.py and
+restarting, which dropped every session. The watcher polls the catalog
+source file and, when it changes, loads, validates and diffs it against the
+live catalog in a worker thread. Only entries that changed lose their cached
+fragments and decision-table rows; everything else carries over. The result
+is published with a single reference swap (catalog.set_catalog), so a call
+that already fetched the old catalog finishes on that consistent snapshot.
+
+A source that fails to load or validate is logged and ignored; the previous
+catalog stays live until a valid version is saved.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Optional, Tuple
+
+from .catalog import (
+    Catalog, diff_sections, get_catalog, load_catalog_source, set_catalog, validate_sections
+)
+
+logger = logging.getLogger("devtools-ai-mock-mcp")
+
+
+def prepare_reload(current: Catalog, path: str) -> Optional[Catalog]:
+    """Load, validate and diff a catalog source; return the rebuilt catalog.
+
+    Returns None when nothing changed. Raises on an invalid source.
+    """
+    sections = load_catalog_source(path)
+    validate_sections(sections)
+    changed = diff_sections(current, sections)
+    if not any(changed.values()):
+        return None
+    return current.rebuilt(sections, changed)
+
+
+class CatalogWatcher:
+    """Polls the catalog source and swaps in a rebuilt catalog on change."""
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self.reloads = 0
+        self.failures = 0
+        self._stamp = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def check(self) -> bool:
+        """Reload if the source changed since the last check; return whether it did."""
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        current = get_catalog()
+        loop = asyncio.get_running_loop()
+        try:
+            rebuilt = await loop.run_in_executor(None, prepare_reload, current, self.path)
+        except Exception as exc:
+            self.failures += 1
+            logger.error(f"Catalog reload from {self.path} rejected: {exc}")
+            return False
+        if rebuilt is None:
+            return False
+        if get_catalog() is not current:
+            # Another reload won the race; diff again against what is live now
+            self._stamp = None
+            return False
+        set_catalog(rebuilt)
+        self.reloads += 1
+        logger.info(f"Catalog reloaded from {self.path} (version {rebuilt.version})")
+        return True
+
+    async def run(self) -> None:
+        """Poll until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
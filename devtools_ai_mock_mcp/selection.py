@@ -0,0 +1,79 @@
+"""
+Selection rules for DevTools AI Mock MCP Server
+
+The keyword rules that pick a workflow, toolchain and tool from the user's
+question. Each rule fires when any keyword in its group appears in the
+lowercased question, and the first matching rule wins. These functions are
+the reference behaviour; the decision table in decision.py precomputes their
+outcomes and is verified against them.
+"""
+
+from typing import Optional, Sequence
+
+# (keywords, workflow) in priority order
+WORKFLOW_RULES = (
+    (("sandbox", "build", "environment"), "Development Environment Setup"),
+    (("test", "testing", "verify"), "Testing and Validation"),
+    (("deploy", "release", "publish"), "Deployment and Release"),
+    (("debug", "troubleshoot", "fix", "error"), "Debugging and Troubleshooting"),
+)
+DEFAULT_WORKFLOW = "General Development"
+
+# Keyword groups for toolchain and tool selection, in priority order
+TOOLCHAIN_KEYWORDS = (
+    ("matlab", "simulink"),
+    ("git", "version", "source"),
+    ("test", "unit", "integration"),
+)
+TOOL_KEYWORDS = (
+    ("create", "new", "setup"),
+    ("build", "compile"),
+    ("test", "run"),
+)
+
+
+def _mentions(question: str, keywords: Sequence[str]) -> bool:
+    return any(keyword in question for keyword in keywords)
+
+
+def select_workflow(question: str) -> str:
+    """Pick a workflow for a lowercased question."""
+    for keywords, workflow in WORKFLOW_RULES:
+        if _mentions(question, keywords):
+            return workflow
+    return DEFAULT_WORKFLOW
+
+
+def select_toolchain(question: str, workflow_toolchains: Sequence[str]) -> str:
+    """Pick a toolchain from a workflow's toolchains for a lowercased question."""
+    matlab, source, testing = TOOLCHAIN_KEYWORDS
+    if _mentions(question, matlab):
+        return next((tc for tc in workflow_toolchains if "MATLAB" in tc), workflow_toolchains[0] if workflow_toolchains else "MATLAB Build Tools")
+    elif _mentions(question, source):
+        return next((tc for tc in workflow_toolchains if "Source" in tc), "Source Control Tools")
+    elif _mentions(question, testing):
+        return next((tc for tc in workflow_toolchains if "Test" in tc), "Testing Framework")
+    return workflow_toolchains[0] if workflow_toolchains else "General Development Tools"
+
+
+def select_tool(question: str, toolchain_tools: Sequence[str]) -> str:
+    """Pick a tool from a toolchain's tools for a lowercased question."""
+    create, build, test = TOOL_KEYWORDS
+    if _mentions(question, create):
+        return next((tool for tool in toolchain_tools if "create" in tool.lower() or "new" in tool.lower()), toolchain_tools[0] if toolchain_tools else "mw_create_sandbox")
+    elif _mentions(question, build):
+        return next((tool for tool in toolchain_tools if "build" in tool.lower()), "mw_build")
+    elif _mentions(question, test):
+        return next((tool for tool in toolchain_tools if "test" in tool.lower() or "run" in tool.lower()), "mw_test")
+    return toolchain_tools[0] if toolchain_tools else "mw_help"
+
+
+def extract_snapshot_name(question: str) -> Optional[str]:
+    """Snapshot name following "snapshot" or "named" in the question, if any."""
+    if "snapshot" not in question.lower():
+        return None
+    words = question.split()
+    for i, word in enumerate(words):
+        if word.lower() in ["snapshot", "named"] and i + 1 < len(words):
+            return words[i + 1].replace(",", "").replace(".", "")
+    return None
@@ -8,17 +8,39 @@ and command generation for MathWorks development tools.
 """
 
 import asyncio
+import itertools
 import json
 import logging
+import time
 from typing import Any, Dict, List, Optional, Sequence
-from mcp.server.models import InitializationOptions
 import mcp.types as types
-from mcp.server import NotificationOptions, Server
-import mcp.server.stdio
-from .mock_data import WORKFLOWS, TOOLCHAINS, TOOLS, COMMANDS
+from mcp.server import Server
+from .admission import AdmissionController, Overloaded
+from .analytics import SessionAnalytics
+from .catalog import (
+    Catalog, catalog_source_path, default_command, fill_placeholders, get_catalog, has_tenant, match_variant
+)
+from .coalesce import CallCoalescer
+from .deadline import DeadlineExceeded, bounded, call_budget, checkpoint, deadline_scope
+from .decision import classify_question, matched_keywords
+from .config import (
+    CALL_TIMEOUT_SECONDS, DEFAULT_VERBOSITY, EXECUTOR_MODE, EXECUTOR_WORKERS, OFFLOAD_MIN_SIZE, FAULT_PROFILE, FAULT_PROFILES_PATH, FAULT_SEED,
+    HISTORY_CAPACITY, HISTORY_SPILL_PATH, IDEMPOTENCY_TTL_SECONDS, MAX_CONCURRENT_CALLS, MAX_QUEUED_CALLS,
+    MAX_SESSIONS, PROXY_MATCH, PROXY_MAX_CONNECTIONS, PROXY_STORE_PATH,
+    PROXY_UPSTREAM, QUEUE_TIMEOUT_SECONDS, SESSION_TTL_SECONDS,
+    SWEEP_BATCH_SIZE, SWEEP_INTERVAL_SECONDS, CATALOG_WATCH_INTERVAL,
+    TRACE_BATCH_SIZE, TRACE_FLUSH_INTERVAL, TRACE_FORMAT, TRACE_PATH, TRACE_SAMPLE_RATE
+)
+from .faults import FaultInjector
+from .history import HistoryBuffer, HistorySpillStore, render_history
+from .offload import StageExecutor
+from .proxy import PROXIED_TOOLS, RecordReplayProxy
+from .reload import CatalogWatcher
+from .selection import select_tool
+from .sweeper import SessionSweeper
+from .tracing import Tracer, current_span, span
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by main_cli() so importing this module has no side effects
 logger = logging.getLogger("devtools-ai-mock-mcp")
 
 # Create server instance
@@ -27,10 +49,118 @@ server = Server("devtools-ai-mock-mcp")
 # Global session storage (in production, this would be a database)
 sessions = {}
 
+# Session IDs are never reused, even after sessions expire
+session_counter = itertools.count(1)
+
+# Shares results between duplicate/retried tool calls
+coalescer = CallCoalescer(ttl=IDEMPOTENCY_TTL_SECONDS)
+
+# Bounds concurrent work and queueing under bursts
+admission = AdmissionController(
+    max_concurrent=MAX_CONCURRENT_CALLS,
+    max_queued=MAX_QUEUED_CALLS,
+    queue_timeout=QUEUE_TIMEOUT_SECONDS
+)
+
+# Emulated backend latency and failures (inactive unless profiles are configured)
+faults = FaultInjector(
+    FAULT_PROFILES_PATH,
+    profile=FAULT_PROFILE,
+    seed=int(FAULT_SEED) if FAULT_SEED else None
+)
+
+def new_session_id() -> str:
+    """Allocate a fresh session ID."""
+    return f"session_{next(session_counter)}"
+
+# Overflow store for session history beyond the in-memory ring buffer
+history_store = HistorySpillStore(HISTORY_SPILL_PATH)
+
+# Default and maximum page size for get_session_status history
+STATUS_PAGE_SIZE = 20
+STATUS_MAX_PAGE_SIZE = 100
+
+# "compact" responses drop prose and descriptions for token-sensitive clients
+VERBOSITY_MODES = ("full", "compact")
+
+def response_verbosity(session: dict, arguments: dict) -> Optional[str]:
+    """Verbosity for this call: the per-call override, else the session's."""
+    verbosity = arguments.get("verbosity") or session["verbosity"]
+    return verbosity if verbosity in VERBOSITY_MODES else None
+
+def compact_response(*fields) -> List[types.TextContent]:
+    """One key=value line per set field, in the order given (newlines in values flattened)."""
+    lines = [f"{key}={value}".replace("\n", " ") for key, value in fields if value is not None]
+    return [types.TextContent(type="text", text="\n".join(lines))]
+
+VERBOSITY_ERROR = [types.TextContent(type="text", text="Error: verbosity must be 'full' or 'compact'")]
+
+# Selection and outcome counters, updated as each step runs
+analytics = SessionAnalytics()
+
+ANALYTICS_URI = "devtools://analytics/session-outcomes"
+
+# Runs CPU-bound stages off the event loop once their input is large enough
+executor = StageExecutor(EXECUTOR_MODE, workers=EXECUTOR_WORKERS, min_size=OFFLOAD_MIN_SIZE)
+
+EXECUTOR_URI = "devtools://metrics/executor"
+
+# Per-call spans exported to a local trace file (inactive unless a path is configured)
+tracer = Tracer(
+    TRACE_PATH,
+    fmt=TRACE_FORMAT,
+    sample_rate=TRACE_SAMPLE_RATE,
+    batch_size=TRACE_BATCH_SIZE,
+    interval=TRACE_FLUSH_INTERVAL
+)
+
+TRACING_URI = "devtools://metrics/tracing"
+
+def forget_session(session_id: str) -> None:
+    """Drop per-session state held outside the session dict."""
+    coalescer.forget(session_id)
+    history_store.drop(session_id)
+
+# Reclaims idle sessions in the background
+sweeper = SessionSweeper(
+    sessions,
+    ttl=SESSION_TTL_SECONDS,
+    interval=SWEEP_INTERVAL_SECONDS,
+    batch_size=SWEEP_BATCH_SIZE,
+    on_expire=forget_session
+)
+
+# Picks up edits to the catalog source without a restart (0 disables)
+catalog_watcher = CatalogWatcher(catalog_source_path(), CATALOG_WATCH_INTERVAL) if CATALOG_WATCH_INTERVAL > 0 else None
+
+def proxy_session_created(session_id: str) -> None:
+    """Track a session the proxy created and link it to the traced call."""
+    sweeper.touch(session_id)
+    current_span().link_session(session_id)
+
+# Record/replay proxy in front of a real backend, when configured
+proxy = RecordReplayProxy(
+    sessions,
+    new_session_id,
+    upstream=PROXY_UPSTREAM,
+    store_path=PROXY_STORE_PATH,
+    match=PROXY_MATCH,
+    max_connections=PROXY_MAX_CONNECTIONS,
+    on_session_created=proxy_session_created,
+    on_session_finished=sweeper.release
+) if PROXY_UPSTREAM or PROXY_STORE_PATH else None
+
+def removed_entry(catalog: Catalog, section: str, name: Optional[str]) -> Optional[List[types.TextContent]]:
+    """Error response if a selection names an entry dropped by a catalog reload."""
+    if name and catalog.is_removed(section, name):
+        kind = section[:-1]
+        return [types.TextContent(type="text", text=f"Error: {kind.capitalize()} '{name}' was removed from the catalog; restart the session")]
+    return None
+
 @server.list_tools()
 async def handle_list_tools() -> List[types.Tool]:
     """List available tools for the DevTools AI workflow."""
-    return [
+    tools = [
         types.Tool(
             name="initiate_session",
             description="Start a new DevTools AI session with a user question",
@@ -40,6 +170,15 @@ async def handle_list_tools() -> List[types.Tool]:
                     "question": {
                         "type": "string",
                         "description": "The user's development question or request"
+                    },
+                    "tenant": {
+                        "type": "string",
+                        "description": "Optional tenant whose catalog overlay this session uses"
+                    },
+                    "verbosity": {
+                        "type": "string",
+                        "enum": ["full", "compact"],
+                        "description": "'compact' returns minimal key=value responses for this session (default 'full')"
                     }
                 },
                 "required": ["question"]
@@ -54,6 +193,11 @@ async def handle_list_tools() -> List[types.Tool]:
                     "session_id": {
                         "type": "string",
                         "description": "Session ID from initiate_session"
+                    },
+                    "verbosity": {
+                        "type": "string",
+                        "enum": ["full", "compact"],
+                        "description": "Override the session's response verbosity for this call"
                     }
                 },
                 "required": ["session_id"]
@@ -72,6 +216,11 @@ async def handle_list_tools() -> List[types.Tool]:
                     "selected_workflow": {
                         "type": "string",
                         "description": "The selected workflow name"
+                    },
+                    "verbosity": {
+                        "type": "string",
+                        "enum": ["full", "compact"],
+                        "description": "Override the session's response verbosity for this call"
                     }
                 },
                 "required": ["session_id", "selected_workflow"]
@@ -90,6 +239,15 @@ async def handle_list_tools() -> List[types.Tool]:
                     "selected_toolchain": {
                         "type": "string",
                         "description": "The selected toolchain name"
+                    },
+                    "environment": {
+                        "type": "string",
+                        "description": "Only pick tools available in this environment (development, testing, staging, production)"
+                    },
+                    "verbosity": {
+                        "type": "string",
+                        "enum": ["full", "compact"],
+                        "description": "Override the session's response verbosity for this call"
                     }
                 },
                 "required": ["session_id", "selected_toolchain"]
@@ -108,6 +266,11 @@ async def handle_list_tools() -> List[types.Tool]:
                     "selected_tool": {
                         "type": "string",
                         "description": "The selected tool name"
+                    },
+                    "verbosity": {
+                        "type": "string",
+                        "enum": ["full", "compact"],
+                        "description": "Override the session's response verbosity for this call"
                     }
                 },
                 "required": ["session_id", "selected_tool"]
@@ -133,24 +296,95 @@ async def handle_list_tools() -> List[types.Tool]:
         ),
         types.Tool(
             name="get_session_status",
-            description="Get the current status and history of a session",
+            description="Get the current status and a page of the history of a session",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "session_id": {
                         "type": "string",
                         "description": "Session ID"
+                    },
+                    "cursor": {
+                        "type": "integer",
+                        "description": "History entry to start from (use the next cursor from a previous page)"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": f"Maximum history entries to return (default {STATUS_PAGE_SIZE}, max {STATUS_MAX_PAGE_SIZE})"
+                    },
+                    "verbosity": {
+                        "type": "string",
+                        "enum": ["full", "compact"],
+                        "description": "Override the session's response verbosity for this call"
                     }
                 },
                 "required": ["session_id"]
             }
         )
     ]
+    
+    # Fault profile switching is only offered when profiles are configured
+    if faults.configured:
+        tools.append(
+            types.Tool(
+                name="set_fault_profile",
+                description="Switch the latency/fault injection profile (reloads the profiles file)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "profile": {
+                            "type": "string",
+                            "description": "Profile name from the profiles file, or 'off'"
+                        }
+                    },
+                    "required": ["profile"]
+                }
+            )
+        )
+
+    # Every call accepts a time budget; handle_call_tool applies it
+    default_budget = f"{CALL_TIMEOUT_SECONDS * 1000:.0f} ms" if CALL_TIMEOUT_SECONDS else "none"
+    for tool in tools:
+        tool.inputSchema["properties"]["timeout_ms"] = {
+            "type": "integer",
+            "description": f"Milliseconds the call may run before it is abandoned (server default: {default_budget})"
+        }
+    return tools
 
 @server.list_resources()
 async def handle_list_resources() -> List[types.Resource]:
     """List available resources."""
-    return []
+    return [
+        types.Resource(
+            uri=ANALYTICS_URI,
+            name="Session analytics",
+            description="Workflow/toolchain/tool selection counts, confirmation outcomes and rewind steps",
+            mimeType="application/json"
+        ),
+        types.Resource(
+            uri=EXECUTOR_URI,
+            name="Executor metrics",
+            description="Per-stage call counts, offload counts, queue wait and execution time",
+            mimeType="application/json"
+        ),
+        types.Resource(
+            uri=TRACING_URI,
+            name="Tracing status",
+            description="Trace export format, sample rate and buffered, exported and dropped call counts",
+            mimeType="application/json"
+        )
+    ]
+
+@server.read_resource()
+async def handle_read_resource(uri) -> str:
+    """Read a resource by URI."""
+    if str(uri) == ANALYTICS_URI:
+        return json.dumps(analytics.summary(), indent=2)
+    if str(uri) == EXECUTOR_URI:
+        return json.dumps(executor.summary(), indent=2)
+    if str(uri) == TRACING_URI:
+        return json.dumps(tracer.summary(), indent=2)
+    raise ValueError(f"Unknown resource: {uri}")
 
 @server.list_prompts()
 async def handle_list_prompts() -> List[types.Prompt]:
@@ -160,7 +394,65 @@ async def handle_list_prompts() -> List[types.Prompt]:
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> List[types.TextContent]:
     """Handle tool calls for DevTools AI functionality."""
-    
+    # The time budget is not part of the call itself, so it never splits coalescing keys
+    arguments = dict(arguments or {})
+    try:
+        budget = call_budget(arguments.pop("timeout_ms", None), CALL_TIMEOUT_SECONDS)
+    except ValueError as exc:
+        return [types.TextContent(type="text", text=f"Error: {exc}")]
+    with deadline_scope(budget), tracer.call_span(name, arguments.get("session_id"), mcp_tool=name):
+        try:
+            return await coalescer.run(name, arguments, admit_tool)
+        except Overloaded as exc:
+            logger.warning(f"Rejected {name}: {exc.reason}")
+            current_span().set_attribute("rejected", exc.reason)
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"Error: {exc.reason}. Retry after {exc.retry_after:.2f} seconds."
+                )
+            ]
+        except DeadlineExceeded as exc:
+            logger.warning(f"Abandoned {name}: {exc}")
+            current_span().set_attribute("deadline_exceeded", exc.stage)
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"Error: {exc}; no session state was changed. Retry with a larger timeout_ms."
+                )
+            ]
+        except asyncio.CancelledError:
+            logger.info(f"Cancelled {name} for {arguments.get('session_id') or 'a new session'}")
+            raise
+
+async def admit_tool(name: str, arguments: dict) -> List[types.TextContent]:
+    """Run a tool call once admission control grants it a slot."""
+    new_session = name == "initiate_session"
+    if new_session and len(sessions) >= MAX_SESSIONS:
+        raise Overloaded("Session limit reached", admission.retry_after())
+    # Sessions already in progress are admitted ahead of new ones
+    queued = time.monotonic()
+    async with admission.admit(priority=not new_session):
+        current_span().set_attribute("admission_wait_ms", round((time.monotonic() - queued) * 1000, 3))
+        return await dispatch_tool(name, arguments)
+
+async def dispatch_tool(name: str, arguments: dict) -> List[types.TextContent]:
+    """Route a tool call to its step handler."""
+    session_id = arguments.get("session_id")
+    if session_id in sessions:
+        sweeper.touch(session_id)
+    if name != "set_fault_profile" and faults.active is not None:
+        with span("backend", profile=faults.active.name):
+            await bounded(faults.inject(name), "backend")
+    if proxy is not None and name in PROXIED_TOOLS:
+        with span("upstream"):
+            texts = await bounded(proxy.call(name, arguments), "upstream")
+        return [types.TextContent(type="text", text=text) for text in texts]
+    with span(name):
+        return await route_tool(name, arguments)
+
+async def route_tool(name: str, arguments: dict) -> List[types.TextContent]:
+    """Call the step handler for a tool name."""
     if name == "initiate_session":
         return await initiate_session(arguments)
     elif name == "get_workflow":
@@ -175,23 +467,50 @@ async def handle_call_tool(name: str, arguments: dict) -> List[types.TextContent
         return await confirm_command(arguments)
     elif name == "get_session_status":
         return await get_session_status(arguments)
+    elif name == "set_fault_profile" and faults.configured:
+        return await set_fault_profile(arguments)
     else:
         raise ValueError(f"Unknown tool: {name}")
 
 async def initiate_session(arguments: dict) -> List[types.TextContent]:
     """Start a new session with the user's question."""
     question = arguments.get("question", "")
+    tenant = arguments.get("tenant") or None
+    verbosity = arguments.get("verbosity") or DEFAULT_VERBOSITY
+    
+    if tenant is not None and not has_tenant(tenant):
+        return [types.TextContent(type="text", text=f"Error: Unknown tenant '{tenant}'")]
+    if verbosity not in VERBOSITY_MODES:
+        return VERBOSITY_ERROR
+    
+    # Keyword-group signature and snapshot name, extracted once per session
+    question_signature, snapshot_name = await executor.run(
+        "classify", classify_question, question, size=len(question)
+    )
+    step_span = current_span()
+    if step_span.recording:
+        step_span.set_attribute("signature", question_signature)
+        step_span.set_attribute("keywords", matched_keywords(question.lower()))
+    
+    checkpoint("commit")
     
     # Generate a simple session ID
-    session_id = f"session_{len(sessions) + 1}"
+    session_id = new_session_id()
+    
+    # Bounded history of the question, selections and user feedback
+    history = HistoryBuffer(session_id, history_store, HISTORY_CAPACITY)
+    history.append(f"Question: {question}")
     
     # Initialize session data
     sessions[session_id] = {
         "question": question,
+        "tenant": tenant,
+        "verbosity": verbosity,
+        "signature": question_signature,
+        "snapshot_name": snapshot_name,
         "step": 0,
         "cursor": 0,
-        "history": [question],
-        "conversation_history": [],
+        "history": history,
         "selected_workflow": None,
         "selected_toolchain": None,
         "selected_tool": None,
@@ -199,6 +518,10 @@ async def initiate_session(arguments: dict) -> List[types.TextContent]:
         "processed_references": []
     }
     
+    sweeper.touch(session_id)
+    analytics.record_session()
+    step_span.link_session(session_id)
+    
     logger.info(f"Created new session {session_id} with question: {question}")
     
     return [
@@ -219,42 +542,34 @@ async def get_workflow(arguments: dict) -> List[types.TextContent]:
         return [types.TextContent(type="text", text="Error: Invalid session ID")]
     
     session = sessions[session_id]
-    question = session["question"].lower()
-    
-    # Simple keyword-based workflow selection logic
-    selected_workflow = None
-    
-    if any(keyword in question for keyword in ["sandbox", "build", "environment"]):
-        selected_workflow = "Development Environment Setup"
-    elif any(keyword in question for keyword in ["test", "testing", "verify"]):
-        selected_workflow = "Testing and Validation"
-    elif any(keyword in question for keyword in ["deploy", "release", "publish"]):
-        selected_workflow = "Deployment and Release"
-    elif any(keyword in question for keyword in ["debug", "troubleshoot", "fix", "error"]):
-        selected_workflow = "Debugging and Troubleshooting"
-    else:
-        selected_workflow = "General Development"
+    catalog = get_catalog(session["tenant"])
+    verbosity = response_verbosity(session, arguments)
+    if verbosity is None:
+        return VERBOSITY_ERROR
+    
+    # Keyword-based workflow selection, precomputed per question signature
+    with span("lookup") as lookup:
+        selected_workflow = catalog.decision_table.workflow(session["signature"])
+        lookup.set_attribute("workflow", selected_workflow)
+    removed = removed_entry(catalog, "workflows", selected_workflow)
+    if removed:
+        return removed
     
     # Update session
+    checkpoint("commit")
     session["selected_workflow"] = selected_workflow
     session["step"] = 1
     session["cursor"] = 1
+    session["history"].append(f"Workflow selected: {selected_workflow}")
+    analytics.record_workflow(selected_workflow)
     
-    workflow_info = WORKFLOWS.get(selected_workflow, {})
-    
-    response = {
-        "workflow": selected_workflow,
-        "description": workflow_info.get("description", ""),
-        "common_tasks": workflow_info.get("common_tasks", []),
-        "next_step": "toolchain_selection"
-    }
-    
+    if verbosity == "compact":
+        return compact_response(("workflow", selected_workflow))
     return [
         types.TextContent(
             type="text",
             text=f"Workflow Selected: {selected_workflow}\n"
-                 f"Description: {workflow_info.get('description', '')}\n"
-                 f"Common tasks: {', '.join(workflow_info.get('common_tasks', []))}\n"
+                 f"{catalog.workflow_fragment(selected_workflow)}"
                  f"Ready to proceed with toolchain selection."
         )
     ]
@@ -268,36 +583,37 @@ async def get_toolchain(arguments: dict) -> List[types.TextContent]:
         return [types.TextContent(type="text", text="Error: Invalid session ID")]
     
     session = sessions[session_id]
-    question = session["question"].lower()
-    
-    # Get toolchains for the workflow
-    workflow_toolchains = WORKFLOWS.get(selected_workflow, {}).get("toolchains", [])
-    
-    # Simple keyword-based toolchain selection
-    selected_toolchain = None
-    
-    if any(keyword in question for keyword in ["matlab", "simulink"]):
-        selected_toolchain = next((tc for tc in workflow_toolchains if "MATLAB" in tc), workflow_toolchains[0] if workflow_toolchains else "MATLAB Build Tools")
-    elif any(keyword in question for keyword in ["git", "version", "source"]):
-        selected_toolchain = next((tc for tc in workflow_toolchains if "Source" in tc), "Source Control Tools")
-    elif any(keyword in question for keyword in ["test", "unit", "integration"]):
-        selected_toolchain = next((tc for tc in workflow_toolchains if "Test" in tc), "Testing Framework")
-    else:
-        selected_toolchain = workflow_toolchains[0] if workflow_toolchains else "General Development Tools"
+    catalog = get_catalog(session["tenant"])
+    verbosity = response_verbosity(session, arguments)
+    if verbosity is None:
+        return VERBOSITY_ERROR
+    removed = removed_entry(catalog, "workflows", selected_workflow)
+    if removed:
+        return removed
+    
+    # Keyword-based selection among the workflow's toolchains, precomputed per signature
+    with span("lookup", workflow=selected_workflow) as lookup:
+        selected_toolchain = catalog.decision_table.toolchain(selected_workflow, session["signature"])
+        lookup.set_attribute("toolchain", selected_toolchain)
+    removed = removed_entry(catalog, "toolchains", selected_toolchain)
+    if removed:
+        return removed
     
     # Update session
+    checkpoint("commit")
     session["selected_toolchain"] = selected_toolchain
     session["step"] = 2
     session["cursor"] = 2
+    session["history"].append(f"Toolchain selected: {selected_toolchain}")
+    analytics.record_toolchain(selected_toolchain)
     
-    toolchain_info = TOOLCHAINS.get(selected_toolchain, {})
-    
+    if verbosity == "compact":
+        return compact_response(("toolchain", selected_toolchain))
     return [
         types.TextContent(
             type="text",
             text=f"Toolchain Selected: {selected_toolchain}\n"
-                 f"Description: {toolchain_info.get('description', '')}\n"
-                 f"Available tools: {', '.join(toolchain_info.get('tools', []))}\n"
+                 f"{catalog.toolchain_fragment(selected_toolchain)}"
                  f"Ready to proceed with tool selection."
         )
     ]
@@ -311,41 +627,70 @@ async def get_tool(arguments: dict) -> List[types.TextContent]:
         return [types.TextContent(type="text", text="Error: Invalid session ID")]
     
     session = sessions[session_id]
-    question = session["question"].lower()
-    
-    # Get tools for the toolchain
-    toolchain_tools = TOOLCHAINS.get(selected_toolchain, {}).get("tools", [])
-    
-    # Simple keyword-based tool selection
-    selected_tool = None
-    
-    if any(keyword in question for keyword in ["create", "new", "setup"]):
-        selected_tool = next((tool for tool in toolchain_tools if "create" in tool.lower() or "new" in tool.lower()), toolchain_tools[0] if toolchain_tools else "mw_create_sandbox")
-    elif any(keyword in question for keyword in ["build", "compile"]):
-        selected_tool = next((tool for tool in toolchain_tools if "build" in tool.lower()), "mw_build")
-    elif any(keyword in question for keyword in ["test", "run"]):
-        selected_tool = next((tool for tool in toolchain_tools if "test" in tool.lower() or "run" in tool.lower()), "mw_test")
+    catalog = get_catalog(session["tenant"])
+    verbosity = response_verbosity(session, arguments)
+    if verbosity is None:
+        return VERBOSITY_ERROR
+    removed = removed_entry(catalog, "toolchains", selected_toolchain)
+    if removed:
+        return removed
+    
+    environment = arguments.get("environment") or None
+    if environment is None:
+        # Keyword-based selection among the toolchain's tools, precomputed per signature
+        with span("lookup", toolchain=selected_toolchain) as lookup:
+            selected_tool = catalog.decision_table.tool(selected_toolchain, session["signature"])
+            lookup.set_attribute("tool", selected_tool)
     else:
-        selected_tool = toolchain_tools[0] if toolchain_tools else "mw_help"
+        if environment not in catalog.environments:
+            available = ", ".join(catalog.environments) or "none"
+            return [types.TextContent(type="text", text=f"Error: Unknown environment '{environment}' (available: {available})")]
+        with span("lookup", toolchain=selected_toolchain, environment=environment) as lookup:
+            selected_tool = select_environment_tool(catalog, selected_toolchain, environment, session["question"].lower())
+            lookup.set_attribute("tool", selected_tool)
+        if selected_tool is None:
+            return [types.TextContent(type="text", text=f"Error: No tools in {selected_toolchain} are available in the {environment} environment")]
+    removed = removed_entry(catalog, "tools", selected_tool)
+    if removed:
+        return removed
     
     # Update session
+    checkpoint("commit")
     session["selected_tool"] = selected_tool
     session["step"] = 3
     session["cursor"] = 3
+    session["history"].append(
+        f"Tool selected: {selected_tool}" + (f" (environment: {environment})" if environment else "")
+    )
+    analytics.record_tool(selected_tool)
     
-    tool_info = TOOLS.get(selected_tool, {})
-    
+    if verbosity == "compact":
+        return compact_response(("tool", selected_tool))
     return [
         types.TextContent(
             type="text",
             text=f"Tool Selected: {selected_tool}\n"
-                 f"Description: {tool_info.get('description', '')}\n"
-                 f"Usage: {tool_info.get('usage', '')}\n"
-                 f"Documentation: {tool_info.get('doc_url', 'N/A')}\n"
+                 f"{catalog.tool_fragment(selected_tool)}"
                  f"Ready to generate command."
         )
     ]
 
+def select_environment_tool(catalog: Catalog, toolchain: str, environment: str, question: str) -> Optional[str]:
+    """Pick a tool among a toolchain's tools that the environment provides."""
+    bitsets = catalog.tool_bitsets
+    available = bitsets.available(toolchain, environment)
+    if not available:
+        return None
+    # Keep the toolchain's listed order so defaults agree with select_tool
+    listed = catalog.toolchains[toolchain].get("tools", [])
+    selected = select_tool(question, bitsets.in_order(available, listed))
+    if bitsets.mask([selected]) & available:
+        return selected
+    # The keyword rule fell back to a tool outside the environment; prefer
+    # available tools matching the question's keyword patterns instead
+    preferred = available & bitsets.pattern_mask(question)
+    return bitsets.in_order(preferred or available, listed)[0]
+
 async def generate_command(arguments: dict) -> List[types.TextContent]:
     """Generate a CLI command for the selected tool."""
     session_id = arguments.get("session_id", "")
@@ -356,41 +701,70 @@ async def generate_command(arguments: dict) -> List[types.TextContent]:
     
     session = sessions[session_id]
     question = session["question"]
+    catalog = get_catalog(session["tenant"])
+    verbosity = response_verbosity(session, arguments)
+    if verbosity is None:
+        return VERBOSITY_ERROR
+    removed = removed_entry(catalog, "tools", selected_tool)
+    if removed:
+        return removed
     
     # Get command templates for the tool
-    tool_commands = COMMANDS.get(selected_tool, {})
+    tool_commands = catalog.commands.get(selected_tool, {})
     
     # Simple logic to generate command based on question
+    values = {"snapshot_name": session["snapshot_name"]}
     command = None
     justification = ""
+    variant = "default"
     
     if "snapshot" in question.lower():
-        # Extract snapshot name if mentioned
-        words = question.split()
-        snapshot_name = None
-        for i, word in enumerate(words):
-            if word.lower() in ["snapshot", "named"] and i + 1 < len(words):
-                snapshot_name = words[i + 1].replace(",", "").replace(".", "")
-                break
+        # Snapshot name was extracted when the session started
+        snapshot_name = session["snapshot_name"]
         
         if snapshot_name:
-            command = tool_commands.get("with_snapshot", f"{selected_tool} --snapshot {snapshot_name}")
+            variant = "with_snapshot"
+            command = fill_placeholders(
+                tool_commands.get("with_snapshot", f"{selected_tool} --snapshot {snapshot_name}"),
+                {"snapshot_name": snapshot_name}
+            )
             justification = f"Creating a sandbox from the specified snapshot '{snapshot_name}' as requested."
         else:
-            command = tool_commands.get("default", f"{selected_tool}")
+            command = default_command(catalog, selected_tool, values)
             justification = "Creating a standard sandbox environment."
     else:
-        command = tool_commands.get("default", f"{selected_tool}")
-        justification = f"Using the standard {selected_tool} command based on your request."
+        # Closest named variant or documented example, if any is close enough
+        resolvable = tuple(name for name, value in values.items() if value)
+        match = await executor.run(
+            "match_variant", match_variant, selected_tool, question, resolvable,
+            size=len(question), catalog=catalog, tenant=session["tenant"]
+        )
+        if match.command is not None:
+            variant = match.label
+            command = fill_placeholders(match.command, values)
+            if match.label == "example":
+                justification = f"Your request most closely matches the documented {selected_tool} example (similarity {match.score:.2f})."
+            else:
+                justification = f"Your request most closely matches the '{match.label}' variant of {selected_tool} (similarity {match.score:.2f})."
+        else:
+            command = default_command(catalog, selected_tool, values)
+            justification = f"Using the standard {selected_tool} command based on your request."
     
     # Update session
+    checkpoint("commit")
+    if variant == "with_snapshot":
+        analytics.record_snapshot(session["snapshot_name"])
+    current_span().set_attribute("variant", variant)
     session["generated_command"] = {
         "command": command,
         "justification": justification
     }
     session["step"] = 4
     session["cursor"] = 4
+    session["history"].append(f"Command generated: {command}")
     
+    if verbosity == "compact":
+        return compact_response(("command", command), ("variant", variant))
     return [
         types.TextContent(
             type="text",
@@ -414,9 +788,20 @@ async def confirm_command(arguments: dict) -> List[types.TextContent]:
     if not generated_command:
         return [types.TextContent(type="text", text="Error: No command generated yet")]
     
+    # A command for a tool dropped by a catalog reload is stale; don't approve it
+    removed = removed_entry(get_catalog(session["tenant"]), "tools", session.get("selected_tool"))
+    if removed:
+        return removed
+    
+    checkpoint("commit")
+    session["history"].append(f"User response: {arguments.get('user_response', '')}")
+    
     # Simple confirmation logic
     if any(word in user_response for word in ["yes", "ok", "correct", "good", "approve", "confirm"]):
-        # Command approved
+        # Command approved; the session is finished so release it now
+        sweeper.release(session_id)
+        history_store.drop(session_id)
+        analytics.record_confirmation("approved")
         return [
             types.TextContent(
                 type="text",
@@ -442,6 +827,8 @@ async def confirm_command(arguments: dict) -> List[types.TextContent]:
             session["cursor"] = 2
         else:
             session["cursor"] = 3  # Regenerate command
+        session["history"].append(f"Rewinding to {error_type} selection")
+        analytics.record_confirmation("rejected", rewind_step=error_type)
         
         return [
             types.TextContent(
@@ -452,6 +839,7 @@ async def confirm_command(arguments: dict) -> List[types.TextContent]:
         ]
     else:
         # Unclear response, ask for clarification
+        analytics.record_confirmation("unclear")
         return [
             types.TextContent(
                 type="text",
@@ -470,27 +858,105 @@ async def get_session_status(arguments: dict) -> List[types.TextContent]:
         return [types.TextContent(type="text", text="Error: Invalid session ID")]
     
     session = sessions[session_id]
+    history = session["history"]
+    verbosity = response_verbosity(session, arguments)
+    if verbosity is None:
+        return VERBOSITY_ERROR
+    
+    try:
+        cursor = int(arguments.get("cursor") or 0)
+        limit = int(arguments.get("limit") or STATUS_PAGE_SIZE)
+    except (TypeError, ValueError):
+        return [types.TextContent(type="text", text="Error: cursor and limit must be integers")]
+    cursor = max(0, cursor)
+    limit = max(1, min(limit, STATUS_MAX_PAGE_SIZE))
+    
+    if verbosity == "compact":
+        entries, next_cursor = history.page(cursor, limit)
+        generated = session.get("generated_command") or {}
+        return compact_response(
+            ("session", session_id),
+            ("step", session["step"]),
+            ("cursor", session["cursor"]),
+            ("workflow", session.get("selected_workflow")),
+            ("toolchain", session.get("selected_toolchain")),
+            ("tool", session.get("selected_tool")),
+            ("command", generated.get("command")),
+            *((f"history.{cursor + i}", entry) for i, entry in enumerate(entries)),
+            ("next_cursor", next_cursor)
+        )
     
-    status_text = f"Session Status for {session_id}:\n"
-    status_text += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-    status_text += f"Original Question: {session['question']}\n"
-    status_text += f"Current Step: {session['step']}/4\n"
-    status_text += f"Current Cursor: {session['cursor']}\n"
-    status_text += f"\nSelections Made:\n"
-    status_text += f"  Workflow: {session.get('selected_workflow', 'Not selected')}\n"
-    status_text += f"  Toolchain: {session.get('selected_toolchain', 'Not selected')}\n"
-    status_text += f"  Tool: {session.get('selected_tool', 'Not selected')}\n"
+    # Fixed-size summary header; only the requested history page scales
+    parts = [
+        f"Session Status for {session_id}:\n"
+        f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+        f"Original Question: {session['question']}\n"
+        f"Current Step: {session['step']}/4\n"
+        f"Current Cursor: {session['cursor']}\n"
+        f"\nSelections Made:\n"
+        f"  Workflow: {session.get('selected_workflow') or 'Not selected'}\n"
+        f"  Toolchain: {session.get('selected_toolchain') or 'Not selected'}\n"
+        f"  Tool: {session.get('selected_tool') or 'Not selected'}\n"
+    ]
     
     if session.get('generated_command'):
-        status_text += f"\nGenerated Command:\n"
-        status_text += f"  Command: {session['generated_command']['command']}\n"
-        status_text += f"  Justification: {session['generated_command']['justification']}\n"
+        parts.append(
+            f"\nGenerated Command:\n"
+            f"  Command: {session['generated_command']['command']}\n"
+            f"  Justification: {session['generated_command']['justification']}\n"
+        )
     
-    return [types.TextContent(type="text", text=status_text)]
+    entries, next_cursor = history.page(cursor, limit)
+    parts.append(await executor.run(
+        "render_history", render_history, entries, cursor, len(history), next_cursor,
+        size=sum(len(entry) for entry in entries)
+    ))
+    
+    return [types.TextContent(type="text", text="".join(parts))]
+
+async def set_fault_profile(arguments: dict) -> List[types.TextContent]:
+    """Reload fault profiles and switch the active one."""
+    profile = arguments.get("profile", "")
+    
+    try:
+        faults.load(faults.path, profile)
+    except KeyError:
+        available = ", ".join(sorted(faults.profiles)) or "none"
+        return [types.TextContent(type="text", text=f"Error: Unknown fault profile '{profile}' (available: {available})")]
+    except (OSError, ValueError, TypeError) as exc:
+        return [types.TextContent(type="text", text=f"Error: Could not load fault profiles: {exc}")]
+    
+    active = faults.active.name if faults.active else "off"
+    return [types.TextContent(type="text", text=f"Fault profile set to: {active}")]
 
 async def main():
     """Main function to run the MCP server."""
+    # Expire idle sessions in the background while serving
+    sweep_task = asyncio.create_task(sweeper.run())
+    watch_task = asyncio.create_task(catalog_watcher.run()) if catalog_watcher is not None else None
+    trace_task = asyncio.create_task(tracer.run()) if tracer.enabled else None
+    
     # Run the server using stdio
+    try:
+        await serve_stdio()
+    finally:
+        sweep_task.cancel()
+        if watch_task is not None:
+            watch_task.cancel()
+        if trace_task is not None:
+            trace_task.cancel()
+            tracer.flush()
+        executor.shutdown()
+        history_store.close()
+        if proxy is not None:
+            await proxy.aclose()
+
+async def serve_stdio():
+    """Serve MCP over stdio until the client disconnects."""
+    from mcp.server.models import InitializationOptions
+    from mcp.server import NotificationOptions
+    import mcp.server.stdio
+
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -507,6 +973,7 @@ async def main():
 
 def main_cli():
     """CLI entry point for the package."""
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+"""
+Background session expiry for DevTools AI Mock MCP Server
+
+Sessions expire after a period of inactivity. Rather than scanning the whole
+session dict, expiry deadlines live in a min-heap with one entry per session.
+Touching a session only updates its deadline in a dict; when a stale heap
+entry reaches the top it is pushed back with the current deadline. Each
+sweep therefore does work proportional to the sessions that actually
+expired, and it is sliced into small batches that yield to the event loop
+so a large expiry wave never stalls in-flight requests.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("devtools-ai-mock-mcp")
+
+
+class SessionSweeper:
+    """Expires idle sessions from a session dict in time-sliced batches."""
+
+    def __init__(self, sessions: Dict[str, dict], ttl: float, interval: float,
+                 batch_size: int, slice_seconds: float = 0.002,
+                 on_expire: Optional[Callable[[str], None]] = None):
+        self.sessions = sessions
+        self.ttl = ttl
+        self.interval = interval
+        self.batch_size = batch_size
+        self.slice_seconds = slice_seconds
+        self.on_expire = on_expire
+        self.expired = 0
+        self.released = 0
+        self._deadlines: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def touch(self, session_id: str, now: Optional[float] = None) -> None:
+        """Record activity on a session, pushing back its expiry."""
+        deadline = (time.monotonic() if now is None else now) + self.ttl
+        if session_id not in self._deadlines:
+            heapq.heappush(self._heap, (deadline, session_id))
+        self._deadlines[session_id] = deadline
+
+    def release(self, session_id: str) -> None:
+        """Drop a finished session immediately."""
+        self._deadlines.pop(session_id, None)
+        if self.sessions.pop(session_id, None) is not None:
+            self.released += 1
+
+    def sweep(self, now: Optional[float] = None) -> Tuple[int, bool]:
+        """Expire one batch of due sessions; return (expired, more_pending)."""
+        now = time.monotonic() if now is None else now
+        started = time.perf_counter()
+        expired = 0
+        processed = 0
+        if len(self._heap) > 2 * len(self._deadlines) + self.batch_size:
+            self.compact()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            if processed >= self.batch_size or time.perf_counter() - started > self.slice_seconds:
+                return expired, True
+            processed += 1
+            _, session_id = heapq.heappop(heap)
+            deadline = self._deadlines.get(session_id)
+            if deadline is None:
+                # Released or already expired since this entry was pushed
+                continue
+            if deadline > now:
+                heapq.heappush(heap, (deadline, session_id))
+                continue
+            del self._deadlines[session_id]
+            self.sessions.pop(session_id, None)
+            if self.on_expire is not None:
+                self.on_expire(session_id)
+            expired += 1
+            self.expired += 1
+        return expired, False
+
+    def compact(self) -> None:
+        """Rebuild the heap from live deadlines.
+
+        Released sessions leave their heap entry behind until its deadline
+        comes up, so with fast-finishing sessions stale entries can pile up
+        for a whole TTL. Sweeps compact once they outnumber live ones.
+        """
+        self._heap = [(deadline, session_id) for session_id, deadline in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+    async def run(self) -> None:
+        """Sweep forever, yielding to the event loop between batches."""
+        while True:
+            total = 0
+            more = True
+            while more:
+                expired, more = self.sweep()
+                total += expired
+                await asyncio.sleep(0)
+            if total:
+                logger.info(f"Expired {total} idle sessions")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,298 @@
+"""
+Local tracing for DevTools AI Mock MCP Server
+
+Each tool call is a root span, and the pipeline stages under it are child
+spans: the step handler, catalog lookups, executor stages, and injected
+backend latency or the upstream proxy. So a slow session can be broken down
+into classification, catalog lookup, rendering and queueing. Any time the
+client sees that is not covered by the root span was spent in transport.
+
+The active span is held in a context variable, so the stages that open
+child spans don't have to pass spans around. Outside a recorded call,
+span() returns a shared no-op span, which keeps tracing nearly free when it
+is off or a call is not sampled.
+
+Sampling is per session: the session ID is hashed against the sample rate,
+so all of a session's calls are kept or dropped together. A call that
+creates a session is sampled by the session it links, and a call that ends
+up with no session is sampled by its own span ID. A call's spans are
+buffered in memory until its root span ends, then exported in batches by a
+background task. Writes to the trace file are serialized, so the final
+flush at shutdown cannot interleave with a batch still being exported. Two
+file formats are supported:
+
+- "chrome": Chrome trace event format (open in chrome://tracing or
+  ui.perfetto.dev), one row per session
+- "otlp": OTLP/JSON, one ExportTraceServiceRequest per line, with the trace
+  ID derived from the session ID
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("devtools-ai-mock-mcp")
+
+TRACE_FORMATS = ("chrome", "otlp")
+
+
+class NoopSpan:
+    """Stand-in for spans that are not recorded."""
+
+    recording = False
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def link_session(self, session_id: str) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("span", default=None)
+
+
+class Span:
+    """A timed, attributed stage of one tool call."""
+
+    recording = True
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.parent = parent
+        self.root: Span = parent.root if parent is not None else self
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+        self.start_ns = 0
+        self.end_ns = 0
+        self._token = None
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self._finish()
+
+    def _finish(self) -> None:
+        self.root.children.append(self)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def link_session(self, session_id: str) -> None:
+        """Attach the call to a session created while it ran."""
+        self.root.session_id = session_id
+
+
+class CallSpan(Span):
+    """Root span of one tool call; collects its children until it ends."""
+
+    def __init__(self, tracer: "Tracer", name: str, session_id: Optional[str], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.session_id = session_id
+        self.children: List[Span] = []
+        super().__init__(name, attributes=attributes)
+
+    def _finish(self) -> None:
+        self.tracer._collect(self)
+
+
+def span(name: str, **attributes) -> Any:
+    """Child span of the active span, or a no-op when nothing is recording."""
+    parent = _current.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(name, parent, attributes)
+
+
+def current_span() -> Any:
+    """The innermost active span (a no-op span when nothing is recording)."""
+    active = _current.get()
+    return active if active is not None else NOOP_SPAN
+
+
+def trace_id(session_id: Optional[str], fallback: str) -> str:
+    """32-hex-digit trace ID shared by every call of a session."""
+    return hashlib.md5((session_id or fallback).encode("utf-8")).hexdigest()
+
+
+class Tracer:
+    """Samples tool calls, buffers their spans and exports them to a file."""
+
+    def __init__(self, path: Optional[str] = None, fmt: str = "chrome", sample_rate: float = 1.0,
+                 batch_size: int = 512, interval: float = 1.0):
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format: {fmt}")
+        self.path = path
+        self.format = fmt
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.interval = interval
+        # Calls buffered beyond this many are dropped rather than growing without bound
+        self.max_buffered = batch_size * 8
+        self.enabled = bool(path) and sample_rate > 0
+        self.exported = 0
+        self.dropped = 0
+        self._buffer: List[CallSpan] = []
+        self._wake: Optional[asyncio.Event] = None
+        # Held by background exports in the executor and by the shutdown flush
+        self._write_lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def sampled(self, session_id: str) -> bool:
+        if self.sample_rate >= 1.0:
+            return True
+        return zlib.crc32(session_id.encode("utf-8")) < self.sample_rate * 2 ** 32
+
+    def call_span(self, name: str, session_id: Optional[str] = None, **attributes) -> Any:
+        """Root span for a tool call, or a no-op span if it is not sampled.
+
+        Calls that create a session are recorded tentatively and kept only
+        if the new session turns out to be sampled; calls that never link a
+        session are sampled by their span ID.
+        """
+        if not self.enabled or (session_id and not self.sampled(session_id)):
+            return NOOP_SPAN
+        return CallSpan(self, name, session_id, attributes)
+
+    def _collect(self, root: CallSpan) -> None:
+        if not self.sampled(root.session_id or root.span_id):
+            return
+        if len(self._buffer) >= self.max_buffered:
+            self.dropped += 1
+            return
+        self._buffer.append(root)
+        if len(self._buffer) >= self.batch_size and self._wake is not None:
+            self._wake.set()
+
+    async def run(self) -> None:
+        """Export buffered spans every interval, or sooner when a batch fills."""
+        self._wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            batch = self._take()
+            if batch:
+                await loop.run_in_executor(None, self._write, batch)
+
+    def flush(self) -> None:
+        """Export whatever is buffered now (used at shutdown)."""
+        batch = self._take()
+        if batch:
+            self._write(batch)
+
+    def _take(self) -> List[CallSpan]:
+        batch, self._buffer = self._buffer, []
+        return batch
+
+    def _write(self, batch: List[CallSpan]) -> None:
+        try:
+            with self._write_lock:
+                if self.format == "chrome":
+                    self._write_chrome(batch)
+                else:
+                    self._write_otlp(batch)
+                self.exported += len(batch)
+        except OSError as exc:
+            self.dropped += len(batch)
+            logger.warning(f"Could not export {len(batch)} traced calls to {self.path}: {exc}")
+
+    def _write_chrome(self, batch: List[CallSpan]) -> None:
+        # The JSON array is left unterminated so batches can be appended;
+        # trace viewers accept a missing closing bracket
+        lines = []
+        for root in batch:
+            tid = zlib.crc32((root.session_id or root.span_id).encode("utf-8"))
+            for item in (root, *root.children):
+                args = dict(item.attributes, session_id=root.session_id)
+                if item.error:
+                    args["error"] = item.error
+                lines.append(json.dumps({
+                    "name": item.name,
+                    "cat": "mcp",
+                    "ph": "X",
+                    "ts": item.start_ns / 1000,
+                    "dur": (item.end_ns - item.start_ns) / 1000,
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": args,
+                }, default=str) + ",\n")
+        with open(self.path, "a", encoding="utf-8") as fh:
+            if fh.tell() == 0:
+                fh.write("[\n")
+            fh.write("".join(lines))
+
+    def _write_otlp(self, batch: List[CallSpan]) -> None:
+        spans = []
+        for root in batch:
+            trace = trace_id(root.session_id, root.span_id)
+            for item in (root, *root.children):
+                attributes = dict(item.attributes)
+                if root.session_id:
+                    attributes["session.id"] = root.session_id
+                spans.append({
+                    "traceId": trace,
+                    "spanId": item.span_id,
+                    "parentSpanId": item.parent.span_id if item.parent is not None else "",
+                    "name": item.name,
+                    # SERVER for the tool call, INTERNAL for its stages
+                    "kind": 2 if item is root else 1,
+                    "startTimeUnixNano": str(item.start_ns),
+                    "endTimeUnixNano": str(item.end_ns),
+                    "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()],
+                    "status": {"code": 2, "message": item.error} if item.error else {},
+                })
+        request = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "devtools-ai-mock-mcp"}}]},
+            "scopeSpans": [{"scope": {"name": "devtools_ai_mock_mcp.tracing"}, "spans": spans}],
+        }]}
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(request, default=str) + "\n")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "format": self.format,
+            "sample_rate": self.sample_rate,
+            "buffered": len(self._buffer),
+            "exported": self.exported,
+            "dropped": self.dropped,
+        }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
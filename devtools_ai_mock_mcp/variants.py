@@ -0,0 +1,129 @@
+"""
+Command variant matching for DevTools AI Mock MCP Server
+
+Each tool has several command templates (release, debug, coverage, dry_run,
+...) plus the worked examples listed in TOOLS. Every candidate is embedded
+once into a hashed character-trigram vector, and all candidates are stored
+as rows of one contiguous float32 matrix, grouped by tool. Matching a
+question against a tool's candidates is then a single matrix-vector product
+over that tool's row slice, however many templates the tool grows.
+
+The tool name itself is left out of each embedding, since every candidate
+for a tool shares it. The "default" template is never a candidate; it is
+the fallback when no candidate scores at least MIN_SIMILARITY. Candidates
+with placeholders the session cannot fill (a {branch} nobody named) are
+skipped, so the user is never handed a command they cannot run as-is.
+"""
+
+import re
+import zlib
+from typing import Collection, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DIMENSIONS = 1 << 12
+NGRAM = 3
+
+# Cosine similarity a candidate needs to beat the default template
+MIN_SIMILARITY = 0.2
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def embed(text: str) -> np.ndarray:
+    """Unit-length hashed character-trigram vector for a piece of text."""
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    for token in _TOKEN.findall(text.lower()):
+        padded = f" {token} "
+        for i in range(len(padded) - NGRAM + 1):
+            vector[zlib.crc32(padded[i:i + NGRAM].encode("utf-8")) % DIMENSIONS] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _candidate_text(tool: str, label: str, command: str) -> str:
+    # Placeholder names and the shared tool name carry no signal
+    body = _PLACEHOLDER.sub(" ", command).replace(tool, " ")
+    return body if label == "example" else f"{label.replace('_', ' ')} {body}"
+
+
+def _candidates(catalog, tool: str) -> List[Tuple[str, str]]:
+    """(label, command) pairs for a tool: named templates, then unseen examples."""
+    templates = catalog.commands.get(tool, {})
+    candidates = [(name, command) for name, command in templates.items() if name != "default"]
+    seen = set(templates.values())
+    for example in catalog.tools.get(tool, {}).get("examples", []):
+        if example not in seen:
+            seen.add(example)
+            candidates.append(("example", example))
+    return candidates
+
+
+class VariantMatch:
+    """The best candidate for a question, or the default when nothing matched."""
+
+    def __init__(self, label: str, command: Optional[str], score: float):
+        self.label = label
+        self.command = command
+        self.score = score
+
+
+class VariantIndex:
+    """Candidate command embeddings for every tool in one contiguous matrix."""
+
+    def __init__(self, matrix: np.ndarray, spans: Dict[str, Tuple[int, int]],
+                 candidates: Dict[str, List[Tuple[str, str]]]):
+        self.matrix = matrix
+        self.spans = spans
+        self.candidates = candidates
+
+    @classmethod
+    def build(cls, catalog, base: Optional["VariantIndex"] = None, changed_tools=()) -> "VariantIndex":
+        """Embed every tool's candidates.
+
+        With a base index, rows for tools not listed as changed are copied
+        from it and only the changed tools are re-embedded.
+        """
+        names = list(dict.fromkeys([*catalog.commands, *catalog.tools]))
+        blocks, spans, candidates = [], {}, {}
+        offset = 0
+        for tool in names:
+            if base is not None and tool not in changed_tools and tool in base.spans:
+                start, stop = base.spans[tool]
+                block = base.matrix[start:stop]
+                candidates[tool] = base.candidates[tool]
+            else:
+                candidates[tool] = _candidates(catalog, tool)
+                block = np.array(
+                    [embed(_candidate_text(tool, label, command)) for label, command in candidates[tool]],
+                    dtype=np.float32
+                ).reshape(-1, DIMENSIONS)
+            spans[tool] = (offset, offset + len(block))
+            offset += len(block)
+            blocks.append(block)
+        matrix = np.ascontiguousarray(
+            np.concatenate(blocks) if blocks else np.zeros((0, DIMENSIONS), dtype=np.float32)
+        )
+        return cls(matrix, spans, candidates)
+
+    def match(self, tool: str, question: str, resolvable: Collection[str] = ()) -> VariantMatch:
+        """Score all of a tool's candidates with one product; pick the best.
+
+        Only candidates whose placeholders are all in resolvable qualify.
+        """
+        start, stop = self.spans.get(tool, (0, 0))
+        if stop == start:
+            return VariantMatch("default", None, 0.0)
+        scores = self.matrix[start:stop] @ embed(question)
+        candidates = self.candidates[tool]
+        best_score = float(scores.max())
+        for best in np.argsort(-scores, kind="stable"):
+            score = float(scores[best])
+            if score < MIN_SIMILARITY:
+                break
+            label, command = candidates[int(best)]
+            if all(name in resolvable for name in _PLACEHOLDER.findall(command)):
+                return VariantMatch(label, command, score)
+        return VariantMatch("default", None, best_score)
+
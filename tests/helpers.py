@@ -0,0 +1,51 @@
+"""
+Shared helpers for tests that drive the server through its tool calls
+"""
+import asyncio
+import re
+from typing import List, Tuple, Union
+
+from mcp import types
+
+from devtools_ai_mock_mcp import server
+
+_RETRY_AFTER = re.compile(r"Retry after ([\d.]+) seconds")
+
+
+def line_value(text: str, prefix: str) -> str:
+    """The rest of the first line of text that follows prefix."""
+    return text.split(prefix)[1].split("\n")[0]
+
+
+def session_id_from(result: Union[str, List[types.TextContent]]) -> str:
+    """Extract the session ID from an initiate_session response or its text."""
+    text = result if isinstance(result, str) else result[0].text
+    return line_value(text, "Session ID: ")
+
+
+async def call(name: str, arguments: dict) -> str:
+    """Call a tool the way a client would, honouring overload retry hints."""
+    while True:
+        text = (await server.handle_call_tool(name, arguments))[0].text
+        retry = _RETRY_AFTER.search(text)
+        if retry is None:
+            return text
+        await asyncio.sleep(float(retry.group(1)))
+
+
+async def start_session(question: str) -> str:
+    """Start a session for a question; return its session ID."""
+    return session_id_from(await call("initiate_session", {"question": question}))
+
+
+async def run_flow(question: str) -> Tuple[str, str]:
+    """Drive one session through command generation; return its session ID and command."""
+    session_id = await start_session(question)
+    text = await call("get_workflow", {"session_id": session_id})
+    workflow = line_value(text, "Workflow Selected: ")
+    text = await call("get_toolchain", {"session_id": session_id, "selected_workflow": workflow})
+    toolchain = line_value(text, "Toolchain Selected: ")
+    text = await call("get_tool", {"session_id": session_id, "selected_toolchain": toolchain})
+    tool = line_value(text, "Tool Selected: ")
+    text = await call("generate_command", {"session_id": session_id, "selected_tool": tool})
+    return session_id, line_value(text, "Generated Command: ")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for admission control under overload
+"""
+import asyncio
+import unittest
+from devtools_ai_mock_mcp.admission import AdmissionController, Overloaded
+
+
+class TestAdmissionController(unittest.IsolatedAsyncioTestCase):
+    """Concurrency limits, bounded queueing and session priority."""
+
+    async def test_rejects_when_queue_full(self):
+        """Callers beyond the concurrency and queue limits fail fast."""
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=1.0)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit(priority=True):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with self.assertRaises(Overloaded) as ctx:
+            async with controller.admit(priority=True):
+                pass
+        self.assertGreater(ctx.exception.retry_after, 0)
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+        self.assertEqual(controller.active, 0)
+
+    async def test_queue_deadline(self):
+        """Waiting longer than the queue timeout is rejected."""
+        controller = AdmissionController(max_concurrent=1, max_queued=4, queue_timeout=0.01)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit(priority=True):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with self.assertRaises(Overloaded):
+            async with controller.admit(priority=False):
+                pass
+        self.assertEqual(controller.queued, 0)
+        release.set()
+        await holder
+
+    async def test_in_progress_sessions_go_first(self):
+        """Priority waiters are admitted before, and evict, new-session waiters."""
+        controller = AdmissionController(max_concurrent=1, max_queued=2, queue_timeout=1.0)
+        release = asyncio.Event()
+        order = []
+
+        async def run(label, priority, gate=None):
+            async with controller.admit(priority=priority):
+                order.append(label)
+                if gate:
+                    await gate.wait()
+
+        holder = asyncio.create_task(run("holder", True, release))
+        await asyncio.sleep(0)
+        new_a = asyncio.create_task(run("new_a", False))
+        new_b = asyncio.create_task(run("new_b", False))
+        await asyncio.sleep(0)
+        existing = asyncio.create_task(run("existing", True))
+        await asyncio.sleep(0)
+
+        release.set()
+        results = await asyncio.gather(holder, new_a, new_b, existing, return_exceptions=True)
+        self.assertIsInstance(results[2], Overloaded)
+        self.assertEqual(order, ["holder", "existing", "new_a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
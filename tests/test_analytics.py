@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming session analytics
+"""
+import json
+import unittest
+from devtools_ai_mock_mcp.analytics import CountMinSketch
+from devtools_ai_mock_mcp.server import (
+    ANALYTICS_URI, analytics, handle_call_tool, handle_read_resource
+)
+from tests.helpers import session_id_from
+
+
+class TestCountMinSketch(unittest.TestCase):
+    """The sketch never undercounts and surfaces heavy hitters."""
+
+    def test_estimates_and_heavy_hitters(self):
+        sketch = CountMinSketch(width=64, depth=3, top_k=3)
+        for i in range(500):
+            sketch.add(f"rare_{i}")
+        for _ in range(50):
+            sketch.add("stable_build")
+        self.assertGreaterEqual(sketch.estimate("stable_build"), 50)
+        self.assertEqual(sketch.heavy_hitters()[0][0], "stable_build")
+        self.assertEqual(sketch.total, 550)
+
+
+class TestSessionAnalytics(unittest.IsolatedAsyncioTestCase):
+    """Handlers update the counters exposed through the analytics resource."""
+
+    async def test_pipeline_is_counted(self):
+        before = analytics.summary()
+        result = await handle_call_tool("initiate_session", {
+            "question": "create a sandbox from snapshot nightly_42"
+        })
+        session_id = session_id_from(result)
+        await handle_call_tool("get_workflow", {"session_id": session_id})
+        await handle_call_tool("generate_command", {
+            "session_id": session_id, "selected_tool": "mw_create_sandbox"
+        })
+        await handle_call_tool("confirm_command", {
+            "session_id": session_id, "user_response": "no, wrong toolchain"
+        })
+
+        summary = json.loads(await handle_read_resource(ANALYTICS_URI))
+        self.assertEqual(summary["sessions_started"], before["sessions_started"] + 1)
+        self.assertEqual(
+            summary["workflows"]["Development Environment Setup"],
+            before["workflows"].get("Development Environment Setup", 0) + 1
+        )
+        self.assertIn("nightly_42", summary["snapshot_names"]["top"])
+        self.assertGreaterEqual(summary["rewind_steps"]["toolchain"], 1)
+        self.assertIsNotNone(summary["rejection_rate"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for environment-aware tool filtering with bitsets
+"""
+import unittest
+from devtools_ai_mock_mcp.catalog import Catalog, get_catalog
+from devtools_ai_mock_mcp.server import get_tool, initiate_session, select_environment_tool, sessions
+from tests.helpers import session_id_from
+
+
+class TestToolBitsets(unittest.TestCase):
+    """Toolchains, environments and patterns are bitsets over one numbering."""
+
+    def setUp(self):
+        self.catalog = get_catalog()
+        self.bitsets = self.catalog.tool_bitsets
+
+    def test_numbering_is_dense(self):
+        self.assertEqual(sorted(self.bitsets.index.values()), list(range(len(self.bitsets.names))))
+        for toolchain, entry in self.catalog.toolchains.items():
+            self.assertEqual(set(self.bitsets.decode(self.bitsets.toolchains[toolchain])), set(entry["tools"]))
+
+    def test_available_is_the_intersection(self):
+        for toolchain, entry in self.catalog.toolchains.items():
+            for environment, env_entry in self.catalog.environments.items():
+                expected = set(entry["tools"]) & set(env_entry["tools"])
+                self.assertEqual(set(self.bitsets.decode(self.bitsets.available(toolchain, environment))), expected)
+        self.assertEqual(self.bitsets.available("Deployment Tools", "no-such-environment"), 0)
+
+    def test_pattern_mask_matches_names_and_descriptions(self):
+        tools = self.bitsets.decode(self.bitsets.pattern_mask("deploy this"))
+        self.assertIn("mw_deploy", tools)
+        self.assertNotIn("mw_unit_test", tools)
+
+
+class TestEnvironmentSelection(unittest.IsolatedAsyncioTestCase):
+    """get_tool restricts candidates to the requested environment."""
+
+    async def start(self, question):
+        result = await initiate_session({"question": question})
+        return session_id_from(result)
+
+    async def test_environment_restricts_selection(self):
+        session_id = await self.start("package the build for release")
+        await get_tool({"session_id": session_id, "selected_toolchain": "MATLAB Build Tools",
+                        "environment": "production"})
+        self.assertEqual(sessions[session_id]["selected_tool"], "mw_package")
+
+    def test_fallback_keeps_the_toolchains_order(self):
+        tools = {name: {"description": "Generic helper"} for name in ("tool_a", "tool_b")}
+        catalog = Catalog(
+            {}, {"First": {"tools": ["tool_a"]}, "Second": {"tools": ["tool_b", "tool_a"]}}, tools, {},
+            {"lab": {"tools": ["tool_a", "tool_b"]}}, {}
+        )
+        self.assertEqual(catalog.tool_bitsets.decode(catalog.tool_bitsets.toolchains["Second"]), ["tool_a", "tool_b"])
+        self.assertEqual(select_environment_tool(catalog, "Second", "lab", "something unrelated"), "tool_b")
+
+    async def test_empty_intersection_is_an_error(self):
+        session_id = await self.start("build my project")
+        result = await get_tool({"session_id": session_id, "selected_toolchain": "Source Control Tools",
+                                 "environment": "production"})
+        self.assertIn("Error: No tools in Source Control Tools are available in the production environment", result[0].text)
+        self.assertIsNone(sessions[session_id]["selected_tool"])
+
+    async def test_unknown_environment_is_rejected(self):
+        session_id = await self.start("build my project")
+        result = await get_tool({"session_id": session_id, "selected_toolchain": "MATLAB Build Tools",
+                                 "environment": "moon"})
+        self.assertIn("Error: Unknown environment 'moon'", result[0].text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for copy-on-write tenant catalog overlays
+"""
+import unittest
+from devtools_ai_mock_mcp.catalog import get_catalog, register_tenant, unregister_tenant
+from devtools_ai_mock_mcp.server import generate_command, get_tool, initiate_session, sessions
+from tests.helpers import session_id_from
+
+TEAM_DIFF = {
+    "toolchains": {
+        "Environment Setup Tools": {
+            "description": "Team sandbox tooling",
+            "tools": ["team_sandbox", "mw_create_sandbox"]
+        }
+    },
+    "tools": {
+        "team_sandbox": {
+            "description": "Create a team sandbox",
+            "usage": "team_sandbox [options]",
+            "doc_url": "https://example.com/help/team_sandbox",
+            "examples": ["team_sandbox"]
+        }
+    },
+    "commands": {
+        "team_sandbox": {"default": "team_sandbox --fast"},
+        "mw_build": {"nightly": "mw_build --target nightly"}
+    }
+}
+
+
+class TestTenantOverlays(unittest.IsolatedAsyncioTestCase):
+    """Tenant overlays change lookups for that tenant only."""
+
+    @classmethod
+    def setUpClass(cls):
+        register_tenant("team-a", TEAM_DIFF)
+
+    @classmethod
+    def tearDownClass(cls):
+        unregister_tenant("team-a")
+
+    def test_overlay_resolves_through_base(self):
+        base = get_catalog()
+        team = get_catalog("team-a")
+        self.assertIn("team_sandbox", team.tools)
+        self.assertNotIn("team_sandbox", base.tools)
+        # Added variants merge with the base templates for the same tool
+        self.assertEqual(team.commands["mw_build"]["nightly"], "mw_build --target nightly")
+        self.assertEqual(team.commands["mw_build"]["default"], "mw_build")
+        self.assertNotIn("nightly", base.commands["mw_build"])
+
+    def test_unchanged_fragments_are_shared(self):
+        base = get_catalog()
+        team = get_catalog("team-a")
+        self.assertIs(team.tool_fragment("mw_build"), base.tool_fragment("mw_build"))
+        self.assertIn("Team sandbox tooling", team.toolchain_fragment("Environment Setup Tools"))
+        self.assertNotIn("Team sandbox tooling", base.toolchain_fragment("Environment Setup Tools"))
+
+    async def test_session_uses_tenant_catalog(self):
+        result = await initiate_session({"question": "I want a sandbox", "tenant": "team-a"})
+        session_id = session_id_from(result)
+        await get_tool({"session_id": session_id, "selected_toolchain": "Environment Setup Tools"})
+        self.assertEqual(sessions[session_id]["selected_tool"], "team_sandbox")
+        command = await generate_command({"session_id": session_id, "selected_tool": "team_sandbox"})
+        self.assertIn("team_sandbox --fast", command[0].text)
+
+    async def test_unknown_tenant_is_rejected(self):
+        result = await initiate_session({"question": "build", "tenant": "nobody"})
+        self.assertIn("Error: Unknown tenant", result[0].text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for duplicate tool call coalescing and replay
+"""
+import asyncio
+import unittest
+from devtools_ai_mock_mcp.coalesce import CallCoalescer
+from devtools_ai_mock_mcp.server import handle_call_tool, initiate_session, sessions
+from tests.helpers import session_id_from
+
+
+class TestCallCoalescer(unittest.IsolatedAsyncioTestCase):
+    """Duplicate calls must not redo work or re-mutate sessions."""
+
+    async def test_concurrent_duplicates_share_one_call(self):
+        """Identical calls in flight together run the underlying call once."""
+        coalescer = CallCoalescer(ttl=30.0)
+        calls = []
+
+        async def slow_call(name, arguments):
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            return ["result"]
+
+        args = {"session_id": "s1", "selected_tool": "mw_build"}
+        results = await asyncio.gather(*[
+            coalescer.run("generate_command", dict(args), slow_call) for _ in range(5)
+        ])
+        self.assertEqual(calls, ["generate_command"])
+        self.assertEqual(results, [["result"]] * 5)
+        self.assertEqual(coalescer.coalesced, 4)
+
+    async def test_replay_only_for_latest_call(self):
+        """A retry replays, but an intervening different call invalidates it."""
+        coalescer = CallCoalescer(ttl=30.0)
+        calls = []
+
+        async def call(name, arguments):
+            calls.append(name)
+            return [name]
+
+        toolchain = {"session_id": "s1", "selected_workflow": "Testing and Validation"}
+        await coalescer.run("get_toolchain", toolchain, call)
+        await coalescer.run("get_toolchain", {"session_id": "s1", "selected_workflow": " Testing and Validation"}, call)
+        self.assertEqual(calls, ["get_toolchain"])
+
+        await coalescer.run("get_tool", {"session_id": "s1", "selected_toolchain": "Testing Framework"}, call)
+        await coalescer.run("get_toolchain", toolchain, call)
+        self.assertEqual(calls, ["get_toolchain", "get_tool", "get_toolchain"])
+
+    async def test_expired_replay_recomputes(self):
+        """Results are only replayed within the TTL."""
+        coalescer = CallCoalescer(ttl=0.0)
+        calls = []
+
+        async def call(name, arguments):
+            calls.append(name)
+            return [name]
+
+        await coalescer.run("get_workflow", {"session_id": "s1"}, call)
+        await coalescer.run("get_workflow", {"session_id": "s1"}, call)
+        self.assertEqual(len(calls), 2)
+
+    async def test_retried_step_does_not_bump_counters(self):
+        """Replaying a step through the server leaves the session untouched."""
+        result = await initiate_session({"question": "run unit tests"})
+        session_id = session_id_from(result)
+
+        first = await handle_call_tool("get_workflow", {"session_id": session_id})
+        sessions[session_id]["step"] = 99
+        retry = await handle_call_tool("get_workflow", {"session_id": session_id})
+        self.assertIs(first, retry)
+        self.assertEqual(sessions[session_id]["step"], 99)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for per-call deadlines and cooperative cancellation
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from devtools_ai_mock_mcp.admission import AdmissionController
+from devtools_ai_mock_mcp.deadline import (
+    Deadline, DeadlineExceeded, bounded, call_budget, checkpoint, deadline_scope
+)
+from devtools_ai_mock_mcp.server import faults, handle_call_tool, handle_list_tools, sessions
+from tests.helpers import call, start_session
+
+SLOW_PROFILES = {
+    "profiles": {
+        "slow": {"default": {"latency": {"type": "fixed", "seconds": 0.3}}}
+    }
+}
+
+QUESTION = "create a sandbox from snapshot nightly"
+
+
+class TestDeadline(unittest.IsolatedAsyncioTestCase):
+    """Deadlines expire on the monotonic clock and bound awaits."""
+
+    def test_call_budget(self):
+        self.assertEqual(call_budget(None, 30.0), 30.0)
+        self.assertIsNone(call_budget(None, 0.0))
+        self.assertEqual(call_budget(250, 30.0), 0.25)
+        self.assertEqual(call_budget("1500", 30.0), 1.5)
+        for invalid in (0, -5, "soon", True, float("inf"), float("nan")):
+            with self.assertRaises(ValueError):
+                call_budget(invalid, 30.0)
+
+    async def test_checkpoint_raises_after_expiry(self):
+        with deadline_scope(0.01):
+            checkpoint("start")
+            await asyncio.sleep(0.02)
+            with self.assertRaises(DeadlineExceeded) as caught:
+                checkpoint("commit")
+        self.assertEqual(caught.exception.stage, "commit")
+        # Outside a scope there is no deadline to enforce
+        checkpoint("anything")
+
+    async def test_bounded_abandons_slow_awaits(self):
+        started = time.monotonic()
+        with deadline_scope(0.05):
+            with self.assertRaises(DeadlineExceeded):
+                await bounded(asyncio.sleep(1.0), "backend")
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    async def test_admission_wait_is_capped_by_the_deadline(self):
+        admission = AdmissionController(max_concurrent=1, max_queued=10, queue_timeout=5.0)
+        async with admission.admit(priority=True):
+            with deadline_scope(0.05):
+                started = time.monotonic()
+                with self.assertRaises(DeadlineExceeded):
+                    async with admission.admit(priority=True):
+                        pass
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(admission.rejected, 0)
+        self.assertEqual(admission.active, 0)
+
+    def test_remaining_never_negative(self):
+        deadline = Deadline(0.0)
+        self.assertEqual(deadline.remaining(), 0.0)
+        self.assertTrue(deadline.expired)
+
+
+class TestCallDeadlines(unittest.IsolatedAsyncioTestCase):
+    """Calls that run out of time or are cancelled leave sessions untouched."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(SLOW_PROFILES, fh)
+        self.addCleanup(os.unlink, self.path)
+        # load() replaces all three, and a set path leaves faults.configured True
+        for attribute in ("path", "profiles", "active"):
+            self.addCleanup(setattr, faults, attribute, getattr(faults, attribute))
+
+    async def test_every_tool_declares_timeout_ms(self):
+        for tool in await handle_list_tools():
+            with self.subTest(tool=tool.name):
+                self.assertEqual(tool.inputSchema["properties"]["timeout_ms"]["type"], "integer")
+                self.assertNotIn("timeout_ms", tool.inputSchema["required"])
+
+    async def test_invalid_timeout_is_rejected(self):
+        text = await call("initiate_session", {"question": "build it", "timeout_ms": "never"})
+        self.assertEqual(text, "Error: timeout_ms must be a positive number")
+
+    async def test_expired_call_does_not_step_session(self):
+        session_id = await start_session(QUESTION)
+        faults.load(self.path, "slow")
+        started = time.monotonic()
+        text = await call("get_workflow", {"session_id": session_id, "timeout_ms": 50})
+        self.assertLess(time.monotonic() - started, 0.25)
+        self.assertIn("Deadline of 50 ms exceeded before backend", text)
+        self.assertEqual(sessions[session_id]["step"], 0)
+        self.assertIsNone(sessions[session_id]["selected_workflow"])
+        self.assertEqual(len(sessions[session_id]["history"]), 1)
+
+        # A retry with enough budget is not answered from the failed attempt
+        faults.active = None
+        text = await call("get_workflow", {"session_id": session_id, "timeout_ms": 5000})
+        self.assertIn("Workflow Selected:", text)
+        self.assertEqual(sessions[session_id]["step"], 1)
+
+    async def test_expired_initiate_creates_no_session(self):
+        faults.load(self.path, "slow")
+        before = len(sessions)
+        text = await call("initiate_session", {"question": "build it", "timeout_ms": 50})
+        self.assertIn("no session state was changed", text)
+        self.assertEqual(len(sessions), before)
+
+    async def test_cancelled_call_does_not_step_session(self):
+        session_id = await start_session(QUESTION)
+        faults.load(self.path, "slow")
+        task = asyncio.create_task(handle_call_tool("get_workflow", {"session_id": session_id}))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(sessions[session_id]["step"], 0)
+        self.assertIsNone(sessions[session_id]["selected_workflow"])
+
+    async def test_duplicate_outlives_a_timed_out_original(self):
+        session_id = await start_session(QUESTION)
+        faults.load(self.path, "slow")
+        short = asyncio.create_task(call("get_workflow", {"session_id": session_id, "timeout_ms": 50}))
+        await asyncio.sleep(0)
+        long = asyncio.create_task(call("get_workflow", {"session_id": session_id, "timeout_ms": 5000}))
+        self.assertIn("exceeded", await short)
+        self.assertIn("Workflow Selected:", await long)
+        self.assertEqual(sessions[session_id]["step"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the precomputed selection decision table
+"""
+import unittest
+from devtools_ai_mock_mcp.catalog import get_catalog
+from devtools_ai_mock_mcp.decision import DecisionTable, reachable_signatures, signature, verify
+from devtools_ai_mock_mcp.selection import select_tool, select_toolchain, select_workflow
+
+
+class TestDecisionTable(unittest.TestCase):
+    """The table agrees with the step-by-step rules for every signature."""
+
+    def test_verify_base_catalog(self):
+        catalog = get_catalog()
+        self.assertEqual(verify(catalog, catalog.decision_table), [])
+
+    def test_pipeline_matches_rules(self):
+        table = get_catalog().decision_table
+        catalog = get_catalog()
+        for question in [
+            "i need to create a new matlab sandbox from snapshot stable_build",
+            "help me run unit tests with git",
+            "how do i deploy to production?",
+            "something unrelated entirely",
+        ]:
+            workflow = select_workflow(question)
+            toolchain = select_toolchain(question, catalog.workflows[workflow]["toolchains"])
+            tool = select_tool(question, catalog.toolchains.get(toolchain, {}).get("tools", []))
+            self.assertEqual(table.pipeline(question), (workflow, toolchain, tool))
+
+    def test_substring_keywords_imply_groups(self):
+        self.assertEqual(signature("testing"), signature("test testing"))
+        self.assertIn(signature("run unit tests"), reachable_signatures())
+
+    def test_overlay_recomputes_only_changed_entries(self):
+        base = get_catalog()
+        overlay = base.overlay({
+            "toolchains": {"Testing Framework": {"description": "", "tools": ["team_runner"]}}
+        })
+        table = overlay.decision_table
+        self.assertEqual(verify(overlay, table), [])
+        self.assertEqual(table.tool("Testing Framework", signature("run tests")), "team_runner")
+        self.assertEqual(base.decision_table.tool("Testing Framework", signature("run tests")), "mw_test")
+
+    def test_unknown_selection_falls_back(self):
+        table = DecisionTable.build(get_catalog())
+        self.assertEqual(table.toolchain("No Such Workflow", signature("git")), "Source Control Tools")
+        self.assertEqual(table.tool("No Such Toolchain", 0), "mw_help")
+
+
+if __name__ == "__main__":
+    unittest.main()
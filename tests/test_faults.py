@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for latency and fault injection profiles
+"""
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import unittest
+from devtools_ai_mock_mcp.faults import FaultInjector, InjectedFault, LatencyDistribution
+
+PROFILES = {
+    "active": "slow",
+    "profiles": {
+        "slow": {
+            "default": {"latency": {"type": "fixed", "seconds": 0.05}}
+        },
+        "broken": {
+            "tools": {"get_workflow": {"error_rate": 1.0}}
+        }
+    }
+}
+
+
+class TestLatencyDistribution(unittest.TestCase):
+    """Each distribution type yields non-negative delays in range."""
+
+    def test_histogram_samples_within_buckets(self):
+        dist = LatencyDistribution({"type": "histogram", "buckets": [[0.1, 1], [0.5, 0]]})
+        rng = random.Random(1)
+        samples = [dist.sample(rng) for _ in range(200)]
+        self.assertTrue(all(0.0 <= sample <= 0.1 for sample in samples))
+
+    def test_normal_is_clipped(self):
+        dist = LatencyDistribution({"type": "normal", "mean": 0.0, "stddev": 1.0})
+        rng = random.Random(2)
+        self.assertTrue(all(dist.sample(rng) >= 0.0 for _ in range(200)))
+
+    def test_unknown_type_rejected(self):
+        with self.assertRaises(ValueError):
+            LatencyDistribution({"type": "pareto"})
+
+
+class TestFaultInjector(unittest.IsolatedAsyncioTestCase):
+    """Profiles load from a file, switch at runtime and never block the loop."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(PROFILES, fh)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    async def test_delays_run_concurrently(self):
+        injector = FaultInjector(self.path, seed=0)
+        started = time.perf_counter()
+        await asyncio.gather(*[injector.inject("get_tool") for _ in range(20)])
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+    async def test_switch_profiles(self):
+        injector = FaultInjector(self.path, seed=0)
+        injector.select("broken")
+        with self.assertRaises(InjectedFault):
+            await injector.inject("get_workflow")
+        await injector.inject("get_tool")
+        with self.assertRaises(KeyError):
+            injector.load(self.path, "missing")
+        self.assertEqual(injector.active.name, "broken")
+        injector.select("off")
+        await injector.inject("get_workflow")
+
+
+if __name__ == "__main__":
+    unittest.main()
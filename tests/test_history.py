@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for bounded, paginated session history
+"""
+import os
+import unittest
+from devtools_ai_mock_mcp.history import HistoryBuffer, HistorySpillStore
+from devtools_ai_mock_mcp.server import get_session_status, initiate_session, sessions
+from tests.helpers import session_id_from
+
+
+class TestHistoryBuffer(unittest.TestCase):
+    """Only recent entries stay in memory; pages span spilled entries too."""
+
+    def store(self):
+        store = HistorySpillStore()
+        self.addCleanup(store.close)
+        return store
+
+    def test_overflow_spills_and_pages(self):
+        buffer = HistoryBuffer("s1", self.store(), capacity=4)
+        for i in range(11):
+            buffer.append(f"entry {i}")
+        self.assertEqual(len(buffer), 11)
+        self.assertLessEqual(len(buffer._recent), 4)
+
+        entries, next_cursor = buffer.page(0, 6)
+        self.assertEqual(entries, [f"entry {i}" for i in range(6)])
+        self.assertEqual(next_cursor, 6)
+        entries, next_cursor = buffer.page(next_cursor, 6)
+        self.assertEqual(entries, [f"entry {i}" for i in range(6, 11)])
+        self.assertIsNone(next_cursor)
+
+    def test_drop_removes_spilled_entries(self):
+        store = self.store()
+        buffer = HistoryBuffer("s1", store, capacity=2)
+        for i in range(5):
+            buffer.append(str(i))
+        store.drop("s1")
+        self.assertEqual(store.load("s1", 0, 5), [])
+
+    def test_default_store_spills_to_a_temp_file(self):
+        store = HistorySpillStore()
+        buffer = HistoryBuffer("s1", store, capacity=2)
+        for i in range(5):
+            buffer.append(str(i))
+        path = store._temp_path
+        self.assertTrue(os.path.isfile(path))
+        self.assertEqual(store.load("s1", 0, 2), ["0", "1"])
+        store.close()
+        self.assertFalse(os.path.exists(path))
+
+
+class TestSessionStatusPaging(unittest.IsolatedAsyncioTestCase):
+    """get_session_status returns one page of history with a next cursor."""
+
+    async def test_status_pages(self):
+        result = await initiate_session({"question": "build my project"})
+        session_id = session_id_from(result)
+        for i in range(4):
+            sessions[session_id]["history"].append(f"note {i}")
+
+        first = (await get_session_status({"session_id": session_id, "limit": 2}))[0].text
+        self.assertIn("[0] Question: build my project", first)
+        self.assertIn("Next cursor: 2", first)
+        self.assertNotIn("note 1", first)
+
+        last = (await get_session_status({"session_id": session_id, "cursor": 4}))[0].text
+        self.assertIn("[4] note 3", last)
+        self.assertNotIn("Next cursor", last)
+
+    async def test_negative_cursor_starts_at_zero(self):
+        result = await initiate_session({"question": "build my project"})
+        session_id = session_id_from(result)
+        sessions[session_id]["history"].append("note 0")
+
+        full = (await get_session_status({"session_id": session_id, "cursor": -2}))[0].text
+        self.assertIn("History (entries 0-1 of 2):", full)
+        self.assertIn("[0] Question: build my project", full)
+        self.assertNotIn("[-", full)
+
+        compact = (await get_session_status({"session_id": session_id, "cursor": -2, "verbosity": "compact"}))[0].text
+        self.assertIn("history.0=Question: build my project", compact)
+        self.assertNotIn("history.-", compact)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared memory-mapped catalog image
+"""
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+import devtools_ai_mock_mcp
+from devtools_ai_mock_mcp.catalog import SECTIONS, Catalog, diff_sections, get_catalog
+from devtools_ai_mock_mcp.decision import verify
+from devtools_ai_mock_mcp.image import ALIGNMENT, FORMAT, CatalogImage, _Writer, open_image, source_digest
+
+QUESTIONS = (
+    "I need to create a new MATLAB sandbox from snapshot stable_build",
+    "build the project in release mode",
+    "run the unit tests with coverage",
+    "deploy a dry run to staging",
+)
+
+
+class TestCatalogImage(unittest.TestCase):
+    """A catalog read from the image behaves like the in-process one."""
+
+    def setUp(self):
+        self.base = get_catalog()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.source = os.path.join(self.tmpdir.name, "catalog.json")
+        self.write_source(self.base)
+        self.path = os.path.join(self.tmpdir.name, "catalog.img")
+        self.catalog = Catalog.from_image(open_image(self.path, self.source))
+
+    def write_source(self, catalog, **changes):
+        sections = {section: dict(getattr(catalog, section)) for section in SECTIONS}
+        for section, entries in changes.items():
+            sections[section].update(entries)
+        with open(self.source, "w", encoding="utf-8") as fh:
+            json.dump(sections, fh)
+
+    def test_sections_and_fragments_match(self):
+        for section in SECTIONS:
+            self.assertEqual(list(getattr(self.catalog, section)), list(getattr(self.base, section)))
+            self.assertEqual(dict(getattr(self.catalog, section)), getattr(self.base, section))
+        self.assertNotIn("no_such_tool", self.catalog.tools)
+        for tool in self.base.tools:
+            self.assertEqual(self.catalog.tool_fragment(tool), self.base.tool_fragment(tool))
+        for toolchain in self.base.toolchains:
+            self.assertEqual(self.catalog.toolchain_fragment(toolchain), self.base.toolchain_fragment(toolchain))
+
+    def test_mapped_decision_table_matches_rules(self):
+        self.assertEqual(verify(self.catalog, self.catalog.decision_table), [])
+
+    def test_variant_matches_agree(self):
+        for tool in self.base.tools:
+            for question in QUESTIONS:
+                mapped = self.catalog.variant_index.match(tool, question)
+                built = self.base.variant_index.match(tool, question)
+                self.assertEqual((mapped.label, mapped.command), (built.label, built.command))
+                self.assertAlmostEqual(mapped.score, built.score, places=5)
+
+    def test_arrays_are_read_only_views_of_the_mapping(self):
+        matrix = self.catalog.variant_index.matrix
+        self.assertFalse(matrix.flags.writeable)
+        self.assertFalse(matrix.flags.owndata)
+        with self.assertRaises(ValueError):
+            matrix[0, 0] = 1.0
+
+    def test_existing_image_is_reused(self):
+        mtime = os.stat(self.path).st_mtime_ns
+        image = open_image(self.path, self.source)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, mtime)
+        self.assertEqual(image.digest, self.catalog.image.digest)
+
+    def test_stale_image_is_recompiled(self):
+        tool = next(iter(self.base.tools))
+        changed = dict(self.base.tools[tool], description="Rewritten description")
+        self.write_source(self.base, tools={tool: changed})
+        catalog = Catalog.from_image(open_image(self.path, self.source))
+        self.assertNotEqual(catalog.image.digest, self.catalog.image.digest)
+        self.assertIn("Rewritten description", catalog.tool_fragment(tool))
+        # The earlier mapping stays valid for calls still holding it
+        self.assertEqual(self.catalog.tools[tool], self.base.tools[tool])
+
+    def test_catalogs_of_many_sizes_round_trip(self):
+        toolchain = next(iter(self.base.toolchains))
+        for size in (1, 40, 600):
+            with self.subTest(size=size):
+                workflows = {
+                    f"Generated workflow {i}": {"description": f"Workflow {i}", "toolchains": [toolchain]}
+                    for i in range(size)
+                }
+                tools = {f"gen_tool_{i}": {"description": f"Generated tool {i}"} for i in range(size // 40 + 1)}
+                self.write_source(self.base, workflows=workflows, tools=tools)
+                path = os.path.join(self.tmpdir.name, f"catalog-{size}.img")
+                open_image(path, self.source)
+                catalog = Catalog.from_image(CatalogImage(path))
+                for section in SECTIONS:
+                    self.assertEqual(list(getattr(catalog, section)), list(getattr(catalog, section).keys()))
+                self.assertEqual(len(catalog.workflows), len(self.base.workflows) + size)
+                self.assertEqual(catalog.workflows[f"Generated workflow {size - 1}"]["description"], f"Workflow {size - 1}")
+                self.assertIn(f"Generated tool {size // 40}", catalog.tool_fragment(f"gen_tool_{size // 40}"))
+                self.assertEqual(catalog.decision_table.tool(toolchain, 0), self.base.decision_table.tool(toolchain, 0))
+
+    def test_header_never_overruns_its_slot(self):
+        # Sweep header sizes across a whole alignment slot
+        for pad in range(ALIGNMENT):
+            with self.subTest(pad=pad):
+                writer = _Writer()
+                writer.string("first")
+                writer.array("values", np.arange(100000, dtype=np.int64))
+                path = os.path.join(self.tmpdir.name, "sweep.img")
+                writer.write(path, {"format": FORMAT, "digest": "d" * pad})
+                image = CatalogImage(path)
+                self.assertEqual(image.string(0), "first")
+                self.assertTrue((image.array("values") == np.arange(100000)).all())
+
+    def test_package_upgrade_invalidates_image(self):
+        digest = source_digest(self.source)
+        self.addCleanup(setattr, devtools_ai_mock_mcp, "__version__", devtools_ai_mock_mcp.__version__)
+        devtools_ai_mock_mcp.__version__ = "99.0.0"
+        self.assertNotEqual(source_digest(self.source), digest)
+        image = open_image(self.path, self.source)
+        self.assertNotEqual(image.digest, self.catalog.image.digest)
+
+    def test_corrupt_image_is_replaced(self):
+        with open(self.path, "wb") as fh:
+            fh.write(b"not an image")
+        with self.assertRaises(ValueError):
+            CatalogImage(self.path)
+        catalog = Catalog.from_image(open_image(self.path, self.source))
+        self.assertEqual(list(catalog.tools), list(self.base.tools))
+
+    def test_overlay_over_image(self):
+        overlay = self.catalog.overlay({
+            "tools": {"team_sandbox": {"description": "Create a team sandbox", "usage": "team_sandbox"}},
+            "commands": {"team_sandbox": {"default": "team_sandbox --create"}},
+        })
+        self.assertIn("team_sandbox", overlay.tools)
+        self.assertIn("team_sandbox", overlay.variant_index.spans)
+        self.assertEqual(verify(overlay, overlay.decision_table), [])
+
+    def test_reload_rebuilds_in_process(self):
+        self.catalog.decision_table
+        sections = {section: dict(getattr(self.base, section)) for section in SECTIONS}
+        workflow = next(iter(sections["workflows"]))
+        sections["workflows"][workflow] = dict(sections["workflows"][workflow], description="Changed")
+        rebuilt = self.catalog.rebuilt(sections, diff_sections(self.catalog, sections))
+        self.assertIsNone(rebuilt.image)
+        self.assertEqual(rebuilt.decision_table.chains, self.base.decision_table.chains)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for executor offload of CPU-bound handler stages
+"""
+import json
+import os
+import tempfile
+import unittest
+from devtools_ai_mock_mcp import config
+from devtools_ai_mock_mcp.catalog import SECTIONS, Catalog, get_catalog, match_variant, register_tenant, unregister_tenant
+from devtools_ai_mock_mcp.decision import classify_question
+from devtools_ai_mock_mcp.offload import StageExecutor
+
+LONG_QUESTION = "please deploy this build to production " * 100
+
+
+class TestStageExecutor(unittest.IsolatedAsyncioTestCase):
+    """Small inputs stay inline; large ones go to the pool with timings."""
+
+    async def test_small_inputs_run_inline(self):
+        executor = StageExecutor("thread", workers=2, min_size=1000)
+        result = await executor.run("classify", classify_question, "build my project", size=16)
+        self.assertEqual(result, classify_question("build my project"))
+        stats = executor.stages["classify"]
+        self.assertEqual((stats.calls, stats.offloaded, stats.wait_total), (1, 0, 0.0))
+        self.assertIsNone(executor._pool)
+
+    async def test_thread_offload_records_wait_and_execution(self):
+        executor = StageExecutor("thread", workers=2, min_size=1000)
+        try:
+            catalog = get_catalog()
+            match = await executor.run("match_variant", match_variant, "mw_deploy", LONG_QUESTION,
+                                       size=len(LONG_QUESTION), catalog=catalog)
+            self.assertEqual(match.label, match_variant(catalog, "mw_deploy", LONG_QUESTION).label)
+            summary = executor.summary()["stages"]["match_variant"]
+            self.assertEqual(summary["offloaded"], 1)
+            self.assertGreaterEqual(summary["queue_wait_ms"]["max"], 0.0)
+            self.assertGreater(summary["execution_ms"]["max"], 0.0)
+        finally:
+            executor.shutdown()
+
+    async def test_process_workers_resolve_catalog(self):
+        executor = StageExecutor("process", workers=1, min_size=1000)
+        try:
+            catalog = get_catalog()
+            match = await executor.run("match_variant", match_variant, "mw_deploy", LONG_QUESTION,
+                                       size=len(LONG_QUESTION), catalog=catalog)
+            self.assertEqual((match.label, match.command), ("production", "mw_deploy production --validate"))
+            result = await executor.run("classify", classify_question, LONG_QUESTION, size=len(LONG_QUESTION))
+            self.assertEqual(result, classify_question(LONG_QUESTION))
+            self.assertEqual(executor.stages["classify"].offloaded, 1)
+        finally:
+            executor.shutdown()
+
+    async def test_process_workers_see_registered_tenants(self):
+        executor = StageExecutor("process", workers=1, min_size=1000)
+        try:
+            # Start the worker before the tenant exists
+            await executor.run("classify", classify_question, LONG_QUESTION, size=len(LONG_QUESTION))
+            register_tenant("team-offload", {"commands": {"mw_deploy": {"canary": "mw_deploy production --canary"}}})
+            self.addCleanup(unregister_tenant, "team-offload")
+            catalog = get_catalog("team-offload")
+            question = "deploy a canary to production " * 50
+            match = await executor.run("match_variant", match_variant, "mw_deploy", question,
+                                       size=len(question), catalog=catalog, tenant="team-offload")
+            self.assertEqual((match.label, match.command), ("canary", "mw_deploy production --canary"))
+            self.assertEqual(executor.stages["match_variant"].offloaded, 1)
+        finally:
+            executor.shutdown()
+
+    async def test_invalid_catch_up_runs_inline(self):
+        base = get_catalog()
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as fh:
+            json.dump({"commands": {"no_such_tool": {"default": "no_such_tool"}}}, fh)
+        self.addCleanup(os.unlink, path)
+        self.addCleanup(setattr, config, "CATALOG_PATH", config.CATALOG_PATH)
+        config.CATALOG_PATH = path
+
+        newer = Catalog(*(getattr(base, section) for section in SECTIONS))
+        newer.version = base.version + 1
+        executor = StageExecutor("process", workers=1, min_size=1000)
+        try:
+            match = await executor.run("match_variant", match_variant, "mw_deploy", LONG_QUESTION,
+                                       size=len(LONG_QUESTION), catalog=newer)
+            self.assertEqual(match.command, "mw_deploy production --validate")
+            self.assertEqual(executor.stages["match_variant"].offloaded, 0)
+        finally:
+            executor.shutdown()
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            StageExecutor("gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the record/replay proxy against a local stand-in backend
+"""
+import asyncio
+import itertools
+import json
+import os
+import tempfile
+import unittest
+from devtools_ai_mock_mcp.proxy import ProxyError, RecordReplayProxy
+from devtools_ai_mock_mcp.server import route_tool
+from tests.helpers import line_value, session_id_from
+
+
+class StandInBackend:
+    """Minimal keep-alive HTTP backend serving the mock's own handlers."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode().strip()
+                    if not line:
+                        break
+                    key, value = line.split(":", 1)
+                    headers[key.lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                tool = request_line.decode().split()[1].rsplit("/", 1)[1]
+                self.requests.append(tool)
+                result = await route_tool(tool, json.loads(body))
+                payload = json.dumps({"content": [{"type": "text", "text": item.text} for item in result]}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+class TestRecordReplayProxy(unittest.IsolatedAsyncioTestCase):
+    """Recorded traffic replays offline with normalized question matching."""
+
+    async def asyncSetUp(self):
+        self.backend = StandInBackend()
+        self.upstream = await self.backend.start()
+        fd, self.store_path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        self.ids = itertools.count(1)
+
+    async def asyncTearDown(self):
+        await self.backend.stop()
+        os.unlink(self.store_path)
+
+    def make_proxy(self, upstream):
+        return RecordReplayProxy(
+            {}, lambda: f"local_{next(self.ids)}", upstream=upstream, store_path=self.store_path
+        )
+
+    async def run_flow(self, proxy, question):
+        text = (await proxy.call("initiate_session", {"question": question}))[0]
+        session_id = session_id_from(text)
+        workflow = (await proxy.call("get_workflow", {"session_id": session_id}))[0]
+        command = (await proxy.call("generate_command", {
+            "session_id": session_id, "selected_tool": "mw_create_sandbox"
+        }))[0]
+        return session_id, workflow, command
+
+    async def test_record_then_replay_offline(self):
+        recorder = self.make_proxy(self.upstream)
+        session_id, workflow, command = await self.run_flow(recorder, "Create a sandbox from snapshot nightly")
+        await recorder.aclose()
+        self.assertTrue(session_id.startswith("local_"))
+        self.assertIn("Development Environment Setup", workflow)
+        self.assertEqual(self.backend.requests, ["initiate_session", "get_workflow", "generate_command"])
+        # All forwarded calls shared one pooled keep-alive connection
+        self.assertEqual(self.backend.connections, 1)
+
+        replayer = self.make_proxy(None)
+        replay_id, replay_workflow, replay_command = await self.run_flow(
+            replayer, "create a sandbox from snapshot  nightly!"
+        )
+        self.assertNotEqual(replay_id, session_id)
+        self.assertEqual(replay_workflow, workflow)
+        self.assertEqual(replay_command, command)
+        self.assertEqual(replayer.hits, 3)
+        self.assertEqual(len(self.backend.requests), 3)
+
+    async def test_replayed_session_goes_upstream_on_miss(self):
+        recorder = self.make_proxy(self.upstream)
+        await recorder.call("initiate_session", {"question": "run unit tests"})
+        self.backend.requests.clear()
+
+        proxy = self.make_proxy(self.upstream)
+        text = (await proxy.call("initiate_session", {"question": "run unit tests"}))[0]
+        session_id = session_id_from(text)
+        result = (await proxy.call("get_workflow", {"session_id": session_id}))[0]
+        self.assertIn("Testing and Validation", result)
+        self.assertEqual(self.backend.requests, ["initiate_session", "get_workflow"])
+        await recorder.aclose()
+        await proxy.aclose()
+
+    async def test_replay_then_miss_syncs_backend_session(self):
+        recorder = self.make_proxy(self.upstream)
+        await self.run_flow(recorder, "create a sandbox from snapshot nightly")
+        await recorder.aclose()
+        self.backend.requests.clear()
+
+        proxy = self.make_proxy(self.upstream)
+        session_id, _, command = await self.run_flow(proxy, "create a sandbox from snapshot nightly")
+        self.assertEqual(proxy.hits, 3)
+        self.assertEqual(self.backend.requests, [])
+
+        result = (await proxy.call("confirm_command", {"session_id": session_id, "user_response": "yes"}))[0]
+        self.assertIn("Command approved", result)
+        self.assertIn(line_value(command, "Generated Command: "), result)
+        # The backend session replayed the earlier steps before the missed call
+        self.assertEqual(self.backend.requests,
+                         ["initiate_session", "get_workflow", "generate_command", "confirm_command"])
+        # An approved session is finished and released
+        self.assertNotIn(session_id, proxy.sessions)
+        await proxy.aclose()
+
+    async def test_concurrent_misses_sync_backend_once(self):
+        recorder = self.make_proxy(self.upstream)
+        await self.run_flow(recorder, "create a sandbox from snapshot nightly")
+        await recorder.aclose()
+        self.backend.requests.clear()
+
+        proxy = self.make_proxy(self.upstream)
+        session_id, _, _ = await self.run_flow(proxy, "create a sandbox from snapshot nightly")
+        first, second = await asyncio.gather(
+            proxy.call("get_session_status", {"session_id": session_id, "limit": 1}),
+            proxy.call("get_session_status", {"session_id": session_id, "limit": 2})
+        )
+        self.assertIn("Current Step: 4/4", first[0])
+        self.assertIn("Current Step: 4/4", second[0])
+        self.assertEqual(self.backend.requests, [
+            "initiate_session", "get_workflow", "generate_command", "get_session_status", "get_session_status"
+        ])
+        await proxy.aclose()
+
+    async def test_status_is_keyed_by_session_progress(self):
+        proxy = self.make_proxy(self.upstream)
+        text = (await proxy.call("initiate_session", {"question": "build my project"}))[0]
+        session_id = session_id_from(text)
+        before = (await proxy.call("get_session_status", {"session_id": session_id}))[0]
+        await proxy.call("get_workflow", {"session_id": session_id})
+        after = (await proxy.call("get_session_status", {"session_id": session_id}))[0]
+        self.assertIn("Current Step: 0/4", before)
+        self.assertIn("Current Step: 1/4", after)
+        await proxy.aclose()
+
+    async def test_error_replies_are_not_recorded(self):
+        proxy = self.make_proxy(self.upstream)
+        text = (await proxy.call("initiate_session", {"question": "build my project"}))[0]
+        session_id = session_id_from(text)
+        stored = len(proxy.store)
+        result = (await proxy.call("confirm_command", {"session_id": session_id, "user_response": "yes"}))[0]
+        self.assertEqual(result, "Error: No command generated yet")
+        self.assertEqual(len(proxy.store), stored)
+        with open(self.store_path, encoding="utf-8") as fh:
+            self.assertNotIn("Error:", fh.read())
+        await proxy.aclose()
+
+    async def test_offline_miss_raises(self):
+        proxy = self.make_proxy(None)
+        with self.assertRaises(ProxyError):
+            await proxy.call("initiate_session", {"question": "never recorded"})
+
+
+if __name__ == "__main__":
+    unittest.main()
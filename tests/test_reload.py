@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for hot catalog reload
+"""
+import copy
+import json
+import os
+import tempfile
+import unittest
+from devtools_ai_mock_mcp.catalog import SECTIONS, get_catalog, set_catalog
+from devtools_ai_mock_mcp.decision import verify
+from devtools_ai_mock_mcp.reload import CatalogWatcher, prepare_reload
+from devtools_ai_mock_mcp.server import (
+    confirm_command, generate_command, get_tool, get_workflow, initiate_session
+)
+from tests.helpers import session_id_from
+
+
+class TestCatalogReload(unittest.IsolatedAsyncioTestCase):
+    """Edits to the catalog source are diffed, rebuilt and swapped in."""
+
+    def setUp(self):
+        self.original = get_catalog()
+        self.sections = {section: copy.deepcopy(dict(getattr(self.original, section))) for section in SECTIONS}
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.write()
+        self.watcher = CatalogWatcher(self.path, interval=0.01)
+
+    def tearDown(self):
+        set_catalog(self.original)
+        os.unlink(self.path)
+
+    def write(self):
+        with open(self.path, "w", encoding="utf-8") as fh:
+            json.dump(self.sections, fh)
+        # Make sure the watcher sees a new stamp even within one mtime tick
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    async def test_unchanged_source_is_not_swapped(self):
+        self.assertIsNone(prepare_reload(self.original, self.path))
+        self.write()
+        self.assertFalse(await self.watcher.check())
+        self.assertIs(get_catalog(), self.original)
+
+    async def test_edit_swaps_catalog_and_keeps_untouched_fragments(self):
+        self.original.decision_table
+        self.original.variant_index
+        kept = self.original.tool_fragment("mw_build")
+        self.original.tool_fragment("mw_create_sandbox")
+        self.sections["tools"]["mw_create_sandbox"]["description"] = "Create a sandbox (reloaded)"
+        self.write()
+
+        self.assertTrue(await self.watcher.check())
+        catalog = get_catalog()
+        self.assertIsNot(catalog, self.original)
+        self.assertEqual(catalog.version, self.original.version + 1)
+        self.assertIs(catalog.tool_fragment("mw_build"), kept)
+        self.assertIn("(reloaded)", catalog.tool_fragment("mw_create_sandbox"))
+        # The old snapshot is untouched for calls still running on it
+        self.assertNotIn("(reloaded)", self.original.tool_fragment("mw_create_sandbox"))
+        self.assertEqual(catalog.variant_index.matrix.shape, self.original.variant_index.matrix.shape)
+
+    async def test_incremental_decision_table_matches_rules(self):
+        self.original.decision_table
+        self.sections["toolchains"]["Environment Setup Tools"]["tools"].reverse()
+        del self.sections["workflows"]["Debugging and Troubleshooting"]
+        self.write()
+
+        self.assertTrue(await self.watcher.check())
+        catalog = get_catalog()
+        self.assertEqual(verify(catalog, catalog.decision_table), [])
+
+    async def test_session_on_removed_tool_gets_error(self):
+        result = await initiate_session({"question": "build my project"})
+        session_id = session_id_from(result)
+        await get_workflow({"session_id": session_id})
+        await get_tool({"session_id": session_id, "selected_toolchain": "MATLAB Build Tools"})
+        await generate_command({"session_id": session_id, "selected_tool": "mw_build"})
+
+        del self.sections["tools"]["mw_build"]
+        del self.sections["commands"]["mw_build"]
+        for section in ("toolchains", "environments"):
+            for entry in self.sections[section].values():
+                entry["tools"] = [tool for tool in entry.get("tools", []) if tool != "mw_build"]
+        self.write()
+        self.assertTrue(await self.watcher.check())
+
+        result = await generate_command({"session_id": session_id, "selected_tool": "mw_build"})
+        self.assertIn("Error: Tool 'mw_build' was removed", result[0].text)
+        result = await confirm_command({"session_id": session_id, "user_response": "yes"})
+        self.assertIn("Error: Tool 'mw_build' was removed", result[0].text)
+
+    async def test_unknown_tool_reference_is_rejected(self):
+        self.sections["environments"]["production"]["tools"].append("mw_no_such_tool")
+        self.write()
+        with self.assertLogs("devtools-ai-mock-mcp", level="ERROR") as logs:
+            self.assertFalse(await self.watcher.check())
+        self.assertIn("unknown tool 'mw_no_such_tool'", logs.output[0])
+        self.assertIs(get_catalog(), self.original)
+
+    async def test_invalid_source_keeps_current_catalog(self):
+        self.sections["workflows"]["Broken"] = {"toolchains": ["No Such Toolchain"]}
+        self.write()
+        with self.assertLogs("devtools-ai-mock-mcp", level="ERROR"):
+            self.assertFalse(await self.watcher.check())
+        self.assertIs(get_catalog(), self.original)
+        self.assertEqual(self.watcher.failures, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,10 +6,12 @@ import asyncio
 import unittest
 from devtools_ai_mock_mcp.server import (
     initiate_session, get_workflow, get_toolchain, 
-    get_tool, generate_command, confirm_command, get_session_status
+    get_tool, generate_command, confirm_command, get_session_status,
+    handle_call_tool, sessions
 )
+from tests.helpers import session_id_from
 
-class TestDevToolsAIMockMCP(unittest.TestCase):
+class TestDevToolsAIMockMCP(unittest.IsolatedAsyncioTestCase):
     """Test cases for the MCP server functionality."""
     
     async def test_initiate_session(self):
@@ -19,18 +21,95 @@ class TestDevToolsAIMockMCP(unittest.TestCase):
         })
         self.assertEqual(len(result), 1)
         self.assertIn("Session initiated successfully", result[0].text)
+        self.assertIn(session_id_from(result), sessions)
     
     async def test_workflow_selection(self):
         """Test workflow selection."""
         # First initiate a session
-        await initiate_session({
+        session_id = session_id_from(await initiate_session({
             "question": "I need to create a new MATLAB sandbox"
-        })
+        }))
         
         # Then get workflow
-        result = await get_workflow({"session_id": "session_1"})
+        result = await get_workflow({"session_id": session_id})
         self.assertEqual(len(result), 1)
         self.assertIn("Workflow Selected", result[0].text)
+        self.assertEqual(sessions[session_id]["selected_workflow"], "Development Environment Setup")
+    
+    async def test_session_ids_are_unique(self):
+        """Test that every session gets a fresh ID."""
+        results = await asyncio.gather(*(
+            initiate_session({"question": f"build project {i}"}) for i in range(20)
+        ))
+        self.assertEqual(len({session_id_from(result) for result in results}), 20)
+    
+    async def test_full_flow(self):
+        """Test a session from question to approved command."""
+        session_id = session_id_from(await initiate_session({
+            "question": "I need to create a new MATLAB sandbox from snapshot stable_build"
+        }))
+        await get_workflow({"session_id": session_id})
+        await get_toolchain({"session_id": session_id, "selected_workflow": "Development Environment Setup"})
+        result = await get_tool({"session_id": session_id, "selected_toolchain": "Environment Setup Tools"})
+        self.assertIn("Tool Selected: mw_create_sandbox", result[0].text)
+        result = await generate_command({"session_id": session_id, "selected_tool": "mw_create_sandbox"})
+        self.assertIn("stable_build", result[0].text)
+        
+        status = await get_session_status({"session_id": session_id})
+        self.assertIn("Current Step: 4/4", status[0].text)
+        
+        result = await confirm_command({"session_id": session_id, "user_response": "yes, that looks correct"})
+        self.assertIn("Command approved", result[0].text)
+        # Finished sessions are released straight away
+        self.assertNotIn(session_id, sessions)
+    
+    async def test_rejection_rewinds_cursor(self):
+        """Test that rejecting a command rewinds to the named step."""
+        session_id = session_id_from(await initiate_session({"question": "run my unit tests"}))
+        await generate_command({"session_id": session_id, "selected_tool": "mw_test"})
+        result = await confirm_command({"session_id": session_id, "user_response": "no, wrong toolchain"})
+        self.assertIn("toolchain selection", result[0].text)
+        self.assertEqual(sessions[session_id]["cursor"], 1)
+    
+    async def test_invalid_session(self):
+        """Test that unknown session IDs are rejected."""
+        result = await get_workflow({"session_id": "session_does_not_exist"})
+        self.assertIn("Error: Invalid session ID", result[0].text)
+    
+    async def test_unknown_tool(self):
+        """Test that unknown tool names raise through the MCP handler."""
+        with self.assertRaises(ValueError):
+            await handle_call_tool("no_such_tool", {})
+
+class TestCompactVerbosity(unittest.IsolatedAsyncioTestCase):
+    """Compact mode returns minimal key=value payloads."""
+    
+    async def test_compact_session(self):
+        """Test a compact session end to end."""
+        session_id = session_id_from(await initiate_session({
+            "question": "deploy to production", "verbosity": "compact"
+        }))
+        result = await get_workflow({"session_id": session_id})
+        self.assertEqual(result[0].text, "workflow=Deployment and Release")
+        result = await generate_command({"session_id": session_id, "selected_tool": "mw_deploy"})
+        self.assertEqual(result[0].text, "command=mw_deploy production --validate\nvariant=production")
+        status = await get_session_status({"session_id": session_id})
+        keys = [line.split("=", 1)[0] for line in status[0].text.split("\n")]
+        self.assertEqual(keys[:5], ["session", "step", "cursor", "workflow", "command"])
+        self.assertEqual(keys[5:], ["history.0", "history.1", "history.2"])
+    
+    async def test_per_call_override(self):
+        """Test that one call can switch verbosity without changing the session."""
+        session_id = session_id_from(await initiate_session({"question": "build my project"}))
+        result = await get_workflow({"session_id": session_id, "verbosity": "compact"})
+        self.assertEqual(result[0].text, "workflow=Development Environment Setup")
+        result = await get_toolchain({"session_id": session_id, "selected_workflow": "Development Environment Setup"})
+        self.assertIn("Ready to proceed with tool selection", result[0].text)
+    
+    async def test_unknown_verbosity(self):
+        """Test that unknown verbosity values are rejected."""
+        result = await initiate_session({"question": "build", "verbosity": "terse"})
+        self.assertIn("Error: verbosity must be", result[0].text)
 
 if __name__ == "__main__":
     # Run async tests
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Cold-start tests for DevTools AI Mock MCP Server
+"""
+import json
+import subprocess
+import sys
+import unittest
+
+IMPORT_PROBE = """
+import json, logging, sys
+import devtools_ai_mock_mcp.server
+from devtools_ai_mock_mcp import catalog
+print(json.dumps({
+    "catalog_loaded": catalog._catalog is not None,
+    "mock_data_imported": "devtools_ai_mock_mcp.mock_data" in sys.modules,
+    "root_handlers": len(logging.getLogger().handlers),
+}))
+"""
+
+
+class TestStartup(unittest.TestCase):
+    """Importing the server must defer work until the first request."""
+
+    def test_import_defers_catalog_and_logging(self):
+        """Importing the server module does not load the catalog or configure logging."""
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE],
+            capture_output=True, text=True, check=True
+        )
+        probe = json.loads(result.stdout)
+        self.assertFalse(probe["catalog_loaded"])
+        self.assertFalse(probe["mock_data_imported"])
+        self.assertEqual(probe["root_handlers"], 0)
+
+    def test_catalog_fragments_are_cached(self):
+        """Rendered catalog fragments are built once and reused."""
+        from devtools_ai_mock_mcp.catalog import get_catalog
+        catalog = get_catalog()
+        first = catalog.tool_fragment("mw_build")
+        self.assertIn("Usage: mw_build [target] [options]", first)
+        self.assertIs(first, catalog.tool_fragment("mw_build"))
+
+
+if __name__ == "__main__":
+    unittest.main()
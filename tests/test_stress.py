@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Concurrency and stress tests for DevTools AI Mock MCP Server
+
+Runs many complete session flows at once through handle_call_tool and checks
+that session IDs never collide, no session sees another's state, and memory
+retained after the flows finish stays bounded. By default a small batch
+runs with the rest of the suite; set DEVTOOLS_AI_MOCK_STRESS_FLOWS (e.g.
+5000) for a full stress run, which also reports throughput.
+"""
+import asyncio
+import gc
+import os
+import time
+import tracemalloc
+import unittest
+from devtools_ai_mock_mcp.server import coalescer, sessions, sweeper
+from tests import helpers
+from tests.helpers import call
+
+STRESS_FLOWS = int(os.environ.get("DEVTOOLS_AI_MOCK_STRESS_FLOWS", "0"))
+FLOWS = STRESS_FLOWS or 200
+
+# Retained memory allowed once time-bounded state has lapsed: a fixed
+# allowance for container growth plus a little per completed flow
+RETAINED_BYTES_ALLOWANCE = 128 * 1024
+MAX_RETAINED_BYTES_PER_FLOW = 128
+
+async def run_flow(index: int) -> str:
+    """Drive one session from question to approval; return its session ID."""
+    marker = f"flow_{index}"
+    session_id, command = await helpers.run_flow(f"create a sandbox from snapshot {marker}")
+    if not command.endswith(f"--snapshot {marker}"):
+        raise AssertionError(f"{session_id} got another session's command: {command}")
+
+    status = await call("get_session_status", {"session_id": session_id})
+    if f"snapshot {marker}\n" not in status or f"Session Status for {session_id}:" not in status:
+        raise AssertionError(f"{session_id} status leaked another session's state")
+
+    text = await call("confirm_command", {"session_id": session_id, "user_response": "yes"})
+    if f"Final command: {command}" not in text:
+        raise AssertionError(f"{session_id} approved the wrong command: {text}")
+    return session_id
+
+
+class TestConcurrentFlows(unittest.IsolatedAsyncioTestCase):
+    """Many concurrent session flows stay isolated and release their state."""
+
+    async def asyncSetUp(self):
+        # Debug mode records a traceback per task and logs slow callbacks,
+        # which dominates both timing and retained memory at this scale
+        asyncio.get_running_loop().set_debug(False)
+
+    async def run_batch(self, count: int):
+        return await asyncio.gather(*(run_flow(i) for i in range(count)))
+
+    async def settle(self):
+        """Let time-bounded state lapse as it would after the idempotency TTL."""
+        # Step off the callback that still references the finished gather
+        await asyncio.sleep(0)
+        coalescer._prune(time.monotonic() + coalescer.ttl + 1)
+        sweeper.sweep()
+        gc.collect()
+
+    async def test_concurrent_flows_are_isolated(self):
+        started = time.perf_counter()
+        session_ids = await self.run_batch(FLOWS)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(set(session_ids)), FLOWS, "session IDs collided")
+        self.assertFalse(set(session_ids) & set(sessions), "approved sessions were not released")
+        if STRESS_FLOWS:
+            print(f"\n{FLOWS} flows ({FLOWS * 7} calls) in {elapsed:.2f}s: "
+                  f"{FLOWS / elapsed:.0f} flows/s, {FLOWS * 7 / elapsed:.0f} calls/s")
+
+    async def test_memory_is_bounded(self):
+        # Warm caches (catalog, decision table, variant index) before measuring
+        await self.run_batch(min(FLOWS, 50))
+        await self.settle()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            await self.run_batch(FLOWS)
+            await self.settle()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        stats = after.compare_to(before, "filename")
+        retained = sum(stat.size_diff for stat in stats)
+        if STRESS_FLOWS:
+            print(f"\nRetained after {FLOWS} flows: {retained} bytes ({retained / FLOWS:.1f} per flow)")
+        self.assertLess(retained, RETAINED_BYTES_ALLOWANCE + FLOWS * MAX_RETAINED_BYTES_PER_FLOW,
+                        f"{retained} bytes retained; top: {stats[:3]}")
+
+
+if __name__ == "__main__":
+    unittest.main()
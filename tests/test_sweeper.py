@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for background session expiry
+"""
+import unittest
+from devtools_ai_mock_mcp.sweeper import SessionSweeper
+
+
+class TestSessionSweeper(unittest.TestCase):
+    """Idle sessions expire incrementally; finished ones are released at once."""
+
+    def make_sweeper(self, count, batch_size=1000):
+        sessions = {f"s{i}": {} for i in range(count)}
+        sweeper = SessionSweeper(sessions, ttl=10.0, interval=1.0,
+                                 batch_size=batch_size, slice_seconds=60.0)
+        for session_id in sessions:
+            sweeper.touch(session_id, now=0.0)
+        return sessions, sweeper
+
+    def test_expires_only_idle_sessions(self):
+        """Touched sessions survive a sweep that expires the rest."""
+        sessions, sweeper = self.make_sweeper(3)
+        sweeper.touch("s1", now=5.0)
+        expired, more = sweeper.sweep(now=12.0)
+        self.assertEqual((expired, more), (2, False))
+        self.assertEqual(list(sessions), ["s1"])
+        self.assertEqual(sweeper.sweep(now=16.0), (1, False))
+        self.assertEqual(sessions, {})
+
+    def test_sweep_is_batched(self):
+        """A large expiry wave is split across several sweeps."""
+        sessions, sweeper = self.make_sweeper(25, batch_size=10)
+        self.assertEqual(sweeper.sweep(now=11.0), (10, True))
+        self.assertEqual(sweeper.sweep(now=11.0), (10, True))
+        self.assertEqual(sweeper.sweep(now=11.0), (5, False))
+        self.assertEqual(len(sessions), 0)
+
+    def test_release_is_immediate(self):
+        """Released sessions are gone without waiting for expiry."""
+        sessions, sweeper = self.make_sweeper(2)
+        sweeper.release("s0")
+        self.assertNotIn("s0", sessions)
+        self.assertEqual(sweeper.sweep(now=11.0), (1, False))
+
+    def test_released_entries_are_compacted(self):
+        """Stale heap entries from released sessions don't outlive a sweep."""
+        sessions, sweeper = self.make_sweeper(50, batch_size=5)
+        for i in range(40):
+            sweeper.release(f"s{i}")
+        self.assertEqual(sweeper.sweep(now=1.0), (0, False))
+        self.assertEqual(len(sweeper._heap), 10)
+        self.assertEqual(sweeper.sweep(now=11.0), (5, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
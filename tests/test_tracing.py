@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for per-call tracing spans and the trace file exporters
+"""
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from devtools_ai_mock_mcp import server
+from devtools_ai_mock_mcp.tracing import NOOP_SPAN, Tracer, current_span, span, trace_id
+from tests.helpers import run_flow
+
+
+class TestSpans(unittest.TestCase):
+    """Spans nest through the context variable and cost nothing when off."""
+
+    def test_no_span_outside_a_recorded_call(self):
+        self.assertIs(span("lookup"), NOOP_SPAN)
+        self.assertIs(current_span(), NOOP_SPAN)
+        self.assertIs(Tracer(None).call_span("get_workflow", "session_1"), NOOP_SPAN)
+
+    def test_children_attach_to_the_call(self):
+        tracer = Tracer("unused.json")
+        with tracer.call_span("get_tool", "session_1", tool="get_tool") as root:
+            with span("lookup", toolchain="MATLAB Build Tools") as lookup:
+                lookup.set_attribute("tool", "mw_build")
+                with span("render"):
+                    pass
+        self.assertIs(current_span(), NOOP_SPAN)
+        self.assertEqual([child.name for child in root.children], ["render", "lookup"])
+        self.assertIs(root.children[0].parent, lookup)
+        self.assertEqual(lookup.attributes, {"toolchain": "MATLAB Build Tools", "tool": "mw_build"})
+        self.assertEqual(tracer.summary()["buffered"], 1)
+
+    def test_errors_are_recorded(self):
+        tracer = Tracer("unused.json")
+        with self.assertRaises(KeyError):
+            with tracer.call_span("get_tool", "session_1") as root:
+                with span("lookup"):
+                    raise KeyError("missing")
+        self.assertEqual(root.error, "KeyError")
+        self.assertEqual(root.children[0].error, "KeyError")
+
+    def test_sampling_keeps_whole_sessions(self):
+        tracer = Tracer("unused.json", sample_rate=0.5)
+        decisions = {f"session_{i}": tracer.sampled(f"session_{i}") for i in range(1000)}
+        self.assertTrue(300 < sum(decisions.values()) < 700)
+        for session_id, sampled in decisions.items():
+            self.assertEqual(tracer.sampled(session_id), sampled)
+            self.assertEqual(tracer.call_span("get_tool", session_id) is NOOP_SPAN, not sampled)
+
+    def test_unsampled_new_session_is_dropped(self):
+        tracer = Tracer("unused.json", sample_rate=0.5)
+        unsampled = next(f"session_{i}" for i in range(100) if not tracer.sampled(f"session_{i}"))
+        with tracer.call_span("initiate_session") as root:
+            root.link_session(unsampled)
+        self.assertEqual(tracer.summary()["buffered"], 0)
+
+    def test_calls_without_a_session_are_sampled(self):
+        tracer = Tracer("unused.json", sample_rate=1e-9)
+        with tracer.call_span("initiate_session"):
+            pass
+        self.assertEqual(tracer.summary()["buffered"], 0)
+
+    def test_proxy_sessions_are_linked_to_the_call(self):
+        tracer = Tracer("unused.json")
+        with tracer.call_span("initiate_session") as root:
+            with span("upstream"):
+                server.proxy_session_created("session_proxy")
+        self.addCleanup(server.sweeper.release, "session_proxy")
+        self.assertEqual(root.session_id, "session_proxy")
+
+
+class TestTraceExport(unittest.IsolatedAsyncioTestCase):
+    """Tool calls are traced end to end and exported in both formats."""
+
+    def use_tracer(self, fmt: str) -> Tracer:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        tracer = Tracer(os.path.join(tmpdir.name, f"trace.{fmt}"), fmt=fmt)
+        previous, server.tracer = server.tracer, tracer
+        self.addCleanup(setattr, server, "tracer", previous)
+        return tracer
+
+    async def test_chrome_trace(self):
+        tracer = self.use_tracer("chrome")
+        session_id, _ = await run_flow("build the project in release mode")
+        tracer.flush()
+        await run_flow("run the unit tests with coverage")
+        tracer.flush()
+
+        with open(tracer.path, encoding="utf-8") as fh:
+            text = fh.read()
+        self.assertTrue(text.startswith("[\n"))
+        events = json.loads(text.rstrip().rstrip(",") + "]")
+        session_events = [event for event in events if event["args"]["session_id"] == session_id]
+        calls = [event["name"] for event in session_events if "mcp_tool" in event["args"]]
+        self.assertEqual(calls, ["initiate_session", "get_workflow", "get_toolchain", "get_tool", "generate_command"])
+        self.assertEqual(len({event["tid"] for event in session_events}), 1)
+
+        names = {event["name"] for event in session_events}
+        self.assertTrue({"classify", "lookup", "match_variant"} <= names)
+        classify = next(event for event in session_events if event["name"] == "initiate_session" and "keywords" in event["args"])
+        self.assertIn("release", classify["args"]["keywords"])
+        lookups = [event["args"] for event in session_events if event["name"] == "lookup"]
+        self.assertEqual(lookups[-1]["tool"], "mw_build")
+        for event in session_events:
+            self.assertGreaterEqual(event["dur"], 0)
+        self.assertEqual(tracer.summary()["exported"], 10)
+
+    async def test_concurrent_writes_do_not_interleave(self):
+        tracer = self.use_tracer("chrome")
+        batches = []
+        for i in range(8):
+            with tracer.call_span("get_tool", f"session_{i}"):
+                with span("lookup", padding="x" * 50000):
+                    pass
+            batches.append(tracer._take())
+        threads = [threading.Thread(target=tracer._write, args=(batch,)) for batch in batches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with open(tracer.path, encoding="utf-8") as fh:
+            text = fh.read()
+        self.assertEqual(text.count("[\n"), 1)
+        events = json.loads(text.rstrip().rstrip(",") + "]")
+        self.assertEqual(len(events), 16)
+        self.assertEqual(tracer.summary()["exported"], 8)
+
+    async def test_full_batch_is_exported_in_background(self):
+        tracer = self.use_tracer("otlp")
+        tracer.batch_size, tracer.interval = 5, 60.0
+        task = asyncio.create_task(tracer.run())
+        self.addCleanup(task.cancel)
+        await asyncio.sleep(0)
+        await run_flow("push my branch to git")
+        for _ in range(100):
+            if tracer.exported:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(tracer.summary()["exported"], 5)
+        self.assertEqual(tracer.summary()["buffered"], 0)
+
+    async def test_otlp_trace(self):
+        tracer = self.use_tracer("otlp")
+        session_id, _ = await run_flow("deploy a dry run to staging")
+        tracer.flush()
+
+        with open(tracer.path, encoding="utf-8") as fh:
+            requests = [json.loads(line) for line in fh]
+        self.assertEqual(len(requests), 1)
+        spans = requests[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual({item["traceId"] for item in spans}, {trace_id(session_id, "")})
+        by_id = {item["spanId"]: item for item in spans}
+        roots = [item for item in spans if not item["parentSpanId"]]
+        self.assertEqual(len(roots), 5)
+        self.assertTrue(all(item["kind"] == 2 for item in roots))
+        for item in spans:
+            if item["parentSpanId"]:
+                parent = by_id[item["parentSpanId"]]
+                self.assertGreaterEqual(int(item["startTimeUnixNano"]), int(parent["startTimeUnixNano"]))
+                self.assertLessEqual(int(item["endTimeUnixNano"]), int(parent["endTimeUnixNano"]))
+        attributes = {attr["key"]: attr["value"] for item in spans for attr in item["attributes"]}
+        self.assertEqual(attributes["session.id"], {"stringValue": session_id})
+        self.assertIn("variant", attributes)
+
+
+if __name__ == "__main__":
+    unittest.main()
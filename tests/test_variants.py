@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for hashed n-gram command variant matching
+"""
+import unittest
+from devtools_ai_mock_mcp.catalog import fill_placeholders, get_catalog
+from devtools_ai_mock_mcp.server import generate_command, initiate_session
+from tests.helpers import line_value, session_id_from
+
+
+class TestVariantIndex(unittest.TestCase):
+    """Candidates are scored by one product over the tool's row slice."""
+
+    def setUp(self):
+        self.index = get_catalog().variant_index
+
+    def test_matrix_is_contiguous_and_grouped_by_tool(self):
+        self.assertTrue(self.index.matrix.flags["C_CONTIGUOUS"])
+        start, stop = self.index.spans["mw_test"]
+        labels = [label for label, _ in self.index.candidates["mw_test"]]
+        self.assertEqual(stop - start, len(labels))
+        self.assertIn("coverage", labels)
+        self.assertNotIn("default", labels)
+
+    def test_best_variant_wins(self):
+        self.assertEqual(self.index.match("mw_build", "build in release mode").label, "release")
+        self.assertEqual(self.index.match("mw_deploy", "deploy a dry run to staging").label, "dry_run")
+        self.assertEqual(self.index.match("mw_test", "run tests with coverage").label, "coverage")
+
+    def test_examples_are_candidates(self):
+        match = self.index.match("mw_init_workspace", "init a workspace from the matlab-app template")
+        self.assertEqual((match.label, match.command), ("example", "mw_init_workspace --template matlab-app"))
+
+    def test_unrelated_question_falls_back_to_default(self):
+        match = self.index.match("mw_build", "build my project")
+        self.assertIsNone(match.command)
+        self.assertIsNone(self.index.match("no_such_tool", "anything").command)
+
+    def test_unfillable_candidates_are_skipped(self):
+        match = self.index.match("mw_git", "push my branch to git")
+        self.assertNotEqual(match.label, "push")
+        self.assertEqual(self.index.match("mw_git", "push my branch to git", ("branch",)).label, "push")
+
+    def test_overlay_reuses_untouched_rows(self):
+        base = get_catalog()
+        overlay = base.overlay({"commands": {"mw_build": {"nightly": "mw_build --target nightly"}}})
+        index = overlay.variant_index
+        self.assertEqual(index.match("mw_build", "nightly build").command, "mw_build --target nightly")
+        start, stop = index.spans["mw_test"]
+        base_start, base_stop = base.variant_index.spans["mw_test"]
+        self.assertTrue((index.matrix[start:stop] == base.variant_index.matrix[base_start:base_stop]).all())
+
+    def test_fill_placeholders_keeps_unknown(self):
+        self.assertEqual(
+            fill_placeholders("mw_profile --report --output {output_dir} {target}", {"target": "main.m"}),
+            "mw_profile --report --output {output_dir} main.m"
+        )
+
+
+class TestGenerateCommandVariants(unittest.IsolatedAsyncioTestCase):
+    """generate_command explains the variant it picked."""
+
+    async def test_variant_selected_with_justification(self):
+        result = await initiate_session({"question": "deploy to production"})
+        session_id = session_id_from(result)
+        result = await generate_command({"session_id": session_id, "selected_tool": "mw_deploy"})
+        self.assertIn("Generated Command: mw_deploy production --validate", result[0].text)
+        self.assertIn("'production' variant", result[0].text)
+
+    async def test_snapshot_template_is_filled(self):
+        result = await initiate_session({"question": "create a sandbox from snapshot nightly_7"})
+        session_id = session_id_from(result)
+        result = await generate_command({"session_id": session_id, "selected_tool": "mw_create_sandbox"})
+        self.assertIn("Generated Command: mw_create_sandbox --snapshot nightly_7", result[0].text)
+
+    async def test_placeholders_are_never_left_unfilled(self):
+        for question, tool in (
+            ("push my branch to git", "mw_git"),
+            ("help with a specific tool", "mw_help"),
+            ("create a sandbox with verbose options", "mw_create_sandbox"),
+            ("compile my code", "mw_compile"),
+            ("profile the app", "mw_profile"),
+        ):
+            with self.subTest(question=question):
+                result = await initiate_session({"question": question})
+                session_id = session_id_from(result)
+                result = await generate_command({"session_id": session_id, "selected_tool": tool})
+                command = line_value(result[0].text, "Generated Command: ")
+                self.assertTrue(command.startswith(tool))
+                self.assertNotIn("{", command)
+
+
+if __name__ == "__main__":
+    unittest.main()